@@ -0,0 +1,887 @@
+# Non-blocking asyncio versions of the checks in network_tests.py.
+# Requires the same packages as network_tests.py:
+# pip install dnspython
+# As there, each is imported inside the checks that use it, the first time one runs.
+import asyncio
+import functools
+import socket
+import ssl
+import time
+import weakref
+from socket import gaierror
+from typing import Tuple, Optional, Any, Dict, List
+from urllib.parse import urlsplit, urljoin
+
+from network_tests import (
+    DNS_TIMEOUT,
+    HTTP_DRAIN_LIMIT,
+    HTTP_MODES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    IcmpEngine,
+    IcmpProbe,
+    NTP_TIMEOUT,
+    NtpProbe,
+    TRACEROUTE_HEADER,
+    add_http_phase,
+    add_resolving_time,
+    expand_ntp_servers,
+    expand_sweep_targets,
+    finish_http_timing,
+    format_traceroute_hop,
+    get_dns_resolver,
+    get_host_cache,
+    get_icmp_engine,
+    get_ntp_engine,
+    new_http_timing,
+    resolving_time,
+    round_http_timing,
+    summarise_sweep,
+    summarise_traceroute,
+)
+
+# HTTP status codes that requests follows as redirects
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Idle keep-alive connections of the HTTP checks, per event loop, by (scheme, host, port)
+_http_connections: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, list]]"
+) = weakref.WeakKeyDictionary()
+
+
+def _set_done(future: asyncio.Future) -> None:
+    """Resolve a probe future unless it has already been resolved or cancelled"""
+    if not future.done():
+        future.set_result(None)
+
+
+async def _resolve_addresses(host: str, family: int = socket.AF_INET) -> List[str]:
+    """
+    The addresses of host through the monitor-wide host cache, timed as resolution. A name that isn't cached is
+    looked up on the loop's executor, so the event loop is never blocked; raises socket.gaierror.
+    """
+    start: float = time.perf_counter()
+    try:
+        cache = get_host_cache()
+        addresses: Optional[List[str]] = cache.cached(host, family)
+        if addresses is None:
+            addresses = await asyncio.get_running_loop().run_in_executor(
+                None, cache.resolve, host, family
+            )
+        return addresses
+    finally:
+        add_resolving_time(start)
+
+
+async def _resolve_ipv4(host: str) -> str:
+    """Resolve host to an IPv4 address without blocking the event loop"""
+    return (await _resolve_addresses(host))[0]
+
+
+async def _resolve_ipv4_all(hosts: List[str]) -> list:
+    """
+    Resolve several hosts to IPv4 addresses at once, returning each address or the exception its lookup raised.
+    The lookups overlap, so their wall time is counted as resolution once rather than each lookup's time.
+    """
+
+    async def resolve(host: str) -> str:
+        # Each task runs in a copy of the caller's context, so this only stops it counting its own lookup
+        resolving_time.set(None)
+        return await _resolve_ipv4(host)
+
+    start: float = time.perf_counter()
+    try:
+        return await asyncio.gather(
+            *(resolve(host) for host in hosts), return_exceptions=True
+        )
+    finally:
+        add_resolving_time(start)
+
+
+def _send_probe(
+    engine: IcmpEngine, host: str, ttl: int = 64
+) -> Tuple[IcmpProbe, asyncio.Future]:
+    """Send a probe through the ICMP engine and return it with a future resolved when its reply arrives"""
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+
+    # The engine calls back from its receiver thread, so hand the result over to the loop thread-safely
+    probe = engine.send(
+        host, ttl, callback=lambda _: loop.call_soon_threadsafe(_set_done, future)
+    )
+    return probe, future
+
+
+async def _await_probes(
+    engine: IcmpEngine,
+    probes: List[IcmpProbe],
+    futures: List[asyncio.Future],
+    timeout: float,
+) -> None:
+    """Wait until every probe is answered or timeout seconds pass, then stop waiting on the rest"""
+    if futures:
+        await asyncio.wait(futures, timeout=timeout)
+    for probe, future in zip(probes, futures):
+        engine.cancel(probe)
+        future.cancel()
+
+
+async def async_ping(
+    host: str, ttl: int = 64, timeout: int = 1, sequence_number: int = 1
+) -> Tuple[Any, float] | Tuple[Any, None]:
+    """
+    Asyncio version of ping().
+
+    The Echo Request is sent through the process-wide ICMP engine and the reply is awaited on the event loop.
+
+    Args:
+    host (str): The IP address or hostname of the target host.
+    ttl (int): Time-To-Live for the ICMP packet.
+    timeout (int): The time in seconds to wait for a reply before giving up.
+    sequence_number (int): Kept for compatibility with existing configs, as in ping().
+
+    Returns:
+    Tuple[Any, float] | Tuple[Any, None]: The address of the replier and the ping time in milliseconds,
+    or (None, None) if the request times out.
+    """
+    engine = get_icmp_engine()
+    probe, future = _send_probe(engine, await _resolve_ipv4(host), ttl)
+    await _await_probes(engine, [probe], [future], timeout)
+
+    if probe.rtt is None:
+        return None, None
+    return probe.addr, probe.rtt
+
+
+async def async_traceroute(
+    host: str,
+    max_hops: int = 30,
+    pings_per_hop: int = 1,
+    verbose: bool = False,
+    parallel: bool = False,
+    timeout: float = 1,
+) -> str:
+    """
+    Asyncio version of traceroute(), producing the same results table.
+
+    Args:
+    host (str): The IP address or hostname of the target host.
+    max_hops (int): Maximum number of hops to try before stopping.
+    pings_per_hop (int): Number of pings to perform at each hop.
+    verbose (bool): If True, print additional details during execution.
+    parallel (bool): If True, probe every hop at once as parallel_traceroute() does.
+    timeout (float): Seconds to wait for each reply, or for the whole burst in parallel mode.
+
+    Returns:
+    str: The results of the traceroute, including statistics for each hop.
+    """
+    engine = get_icmp_engine()
+    destination: str = await _resolve_ipv4(host)
+
+    if parallel:
+        # Send every probe for every hop in one burst and gather replies until one shared deadline
+        if verbose:
+            print(f"pinging {host} with ttl 1 to {max_hops}, {pings_per_hop} per hop")
+        sent = [
+            _send_probe(engine, destination, ttl)
+            for ttl in range(1, max_hops + 1)
+            for _ in range(pings_per_hop)
+        ]
+        probes = [probe for probe, _ in sent]
+        await _await_probes(engine, probes, [future for _, future in sent], timeout)
+        return summarise_traceroute(probes, max_hops, destination, verbose)
+
+    # Otherwise walk the TTLs one after another, as traceroute() does
+    results = [TRACEROUTE_HEADER]
+    for ttl in range(1, max_hops + 1):
+        if verbose:
+            print(f"pinging {host} with ttl: {ttl}")
+
+        ping_times = []
+        addr = None
+        for _ in range(pings_per_hop):
+            addr, response = await async_ping(destination, ttl, timeout)
+            if response is not None:
+                ping_times.append(response)
+
+        results.append(format_traceroute_hop(ttl, addr, ping_times))
+        if verbose:
+            print(f"\tResult: {results[-1]}")
+
+        if addr and addr[0] == destination:
+            break
+
+    return "\n".join(results)
+
+
+async def async_ping_sweep(
+    targets: str | List[str],
+    timeout: float = 1,
+    count: int = 1,
+    burst_size: int = 64,
+    burst_interval: float = 0.01,
+) -> Dict[str, dict]:
+    """
+    Asyncio version of ping_sweep(), with the same arguments and results.
+
+    Returns:
+    Dict[str, dict]: For each host, the probes "sent" and "received", the "loss" percentage and the "rtts".
+    """
+    engine = get_icmp_engine()
+    hosts: List[str] = expand_sweep_targets(targets)
+    results: Dict[str, dict] = {
+        host: {"sent": 0, "received": 0, "loss": 100.0, "rtts": []} for host in hosts
+    }
+
+    # Send every probe in paced bursts
+    probes: List[IcmpProbe] = []
+    futures: List[asyncio.Future] = []
+    sent_in_burst: int = 0
+    for _ in range(count):
+        for host in hosts:
+            results[host]["sent"] += 1
+            try:
+                # Labelled with the target as given, so its replies count towards that target's results
+                probe, future = _send_probe(engine, await _resolve_ipv4(host))
+                probe.host = host
+                probes.append(probe)
+                futures.append(future)
+            except OSError:
+                # Unresolvable or unroutable hosts count as lost probes
+                pass
+
+            sent_in_burst += 1
+            if sent_in_burst == burst_size:
+                sent_in_burst = 0
+                await asyncio.sleep(burst_interval)
+
+    # Gather replies until the shared deadline
+    await _await_probes(engine, probes, futures, timeout)
+    return summarise_sweep(results, probes)
+
+
+@functools.cache
+def https_context() -> ssl.SSLContext:
+    """TLS context verifying servers against certifi's CA bundle, as requests does; built once, on first use"""
+    import certifi
+
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+async def _http_connection(
+    origin: Tuple[str, str, int], timeout: float, timing: dict
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+    """
+    Take an idle pooled connection to origin, or open a new one; also returns whether it was pooled.
+    Opening one adds its name resolution, connect and TLS handshake times to timing.
+    """
+    loop = asyncio.get_running_loop()
+    idle: list = _http_connections.get(loop, {}).get(origin, [])
+    while idle:
+        reader, writer = idle.pop()
+        if not writer.is_closing() and not reader.at_eof():
+            return reader, writer, True
+        writer.close()
+
+    # Resolve the name through the host cache first so it is timed on its own, then connect to each address
+    # in turn
+    scheme, host, port = origin
+    start: float = time.monotonic()
+    try:
+        addresses: List[str] = await asyncio.wait_for(
+            _resolve_addresses(host, socket.AF_UNSPEC), timeout
+        )
+    finally:
+        resolved: float = add_http_phase(timing, "dns", start)
+
+    # The time spent trying is counted as connecting whether or not any address answers
+    try:
+        for i, address in enumerate(addresses):
+            family: int = socket.AF_INET6 if ":" in address else socket.AF_INET
+            sock: socket.socket = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(
+                    loop.sock_connect(sock, (address, port)), timeout
+                )
+                break
+            except OSError:
+                sock.close()
+                if i == len(addresses) - 1:
+                    raise
+    finally:
+        connected: float = add_http_phase(timing, "connect", resolved)
+
+    # The TLS handshake, for https, happens as the streams are opened over the socket
+    try:
+        if scheme == "https":
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        sock=sock, ssl=https_context(), server_hostname=host
+                    ),
+                    timeout,
+                )
+            finally:
+                add_http_phase(timing, "tls", connected)
+        else:
+            reader, writer = await asyncio.open_connection(sock=sock)
+    except BaseException:
+        sock.close()
+        raise
+    timing["connections"] += 1
+    return reader, writer, False
+
+
+def _release_http_connection(
+    origin: Tuple[str, str, int],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Keep a connection whose response has been read in full for the next check of the same origin"""
+    idle: list = _http_connections.setdefault(
+        asyncio.get_running_loop(), {}
+    ).setdefault(origin, [])
+    if len(idle) < HTTP_POOL_SIZE and not writer.is_closing():
+        idle.append((reader, writer))
+    else:
+        writer.close()
+
+
+async def _read_chunked(reader: asyncio.StreamReader, timeout: float) -> None:
+    """Read and discard a chunked body, trailers included"""
+    while True:
+        size_line: bytes = await asyncio.wait_for(reader.readline(), timeout)
+        try:
+            size: int = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError:
+            raise ValueError(f"Invalid chunk size line: {size_line!r}")
+        if size == 0:
+            break
+        await asyncio.wait_for(reader.readexactly(size + 2), timeout)
+    while (await asyncio.wait_for(reader.readline(), timeout)) not in (
+        b"\r\n",
+        b"\n",
+        b"",
+    ):
+        pass
+
+
+async def _async_http_status(
+    url: str,
+    headers: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    max_redirects: int = 30,
+    mode: str = "stream",
+    timing: Optional[dict] = None,
+) -> int:
+    """
+    Send an HTTP/1.1 request to url, following redirects as requests does, and return the final status code.
+
+    Connections are kept alive and pooled per origin on the running loop, so a check only connects (and
+    handshakes, for https) when no idle connection is left; a pooled connection the server has since closed
+    is replaced once. The mode works as for network_tests.fetch_http_status: "get" reads each whole body,
+    "head" sends HEAD requests, and "stream" stops after the headers, reading only bodies small enough to keep
+    the connection for. Raises OSError or ssl.SSLError for connection failures, TimeoutError if timeout
+    passes, asyncio.IncompleteReadError if the server closes the connection partway through a body,
+    and ValueError for unusable URLs or responses. The time spent in each phase is recorded in
+    timing, from network_tests.new_http_timing, if one is given.
+    """
+    if mode not in HTTP_MODES:
+        raise ValueError(f"Unknown HTTP check mode '{mode}'")
+    timeout = timeout or HTTP_TIMEOUT
+    timing = new_http_timing() if timing is None else timing
+    method: str = "HEAD" if mode == "head" else "GET"
+    start: float = time.monotonic()
+
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid URL '{url}'")
+        origin = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+        )
+
+        # Build the request
+        path: str = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host: str = (
+            parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        )
+        request_headers: dict = {
+            "Host": host,
+            "User-Agent": "python-requests",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+        }
+        request_headers.update(headers or {})
+        request: bytes = (
+            f"{method} {path} HTTP/1.1\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+            + "\r\n"
+        ).encode("latin-1")
+
+        # Send it over a pooled connection, retrying on a new one if the server has closed the pooled one
+        while True:
+            reader, writer, pooled = await _http_connection(origin, timeout, timing)
+            try:
+                writer.write(request)
+                await asyncio.wait_for(writer.drain(), timeout)
+
+                # Read the status line, e.g. "HTTP/1.1 200 OK"
+                status_line: str = (
+                    await asyncio.wait_for(reader.readline(), timeout)
+                ).decode("latin-1")
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if pooled:
+                    continue
+                raise
+            if not status_line and pooled:
+                writer.close()
+                continue
+            break
+
+        keep_alive: bool = False
+        try:
+            fields = status_line.split(" ", 2)
+            if len(fields) < 2 or not fields[1].isdigit():
+                raise ValueError(f"Invalid response status line: {status_line!r}")
+            status_code: int = int(fields[1])
+
+            # Read the headers, keeping the ones that say where to go next and how long the body is
+            response_headers: dict = {}
+            while (line := await asyncio.wait_for(reader.readline(), timeout)) not in (
+                b"\r\n",
+                b"\n",
+                b"",
+            ):
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+            headers_at: float = time.monotonic()
+
+            # Read the body if there is one and it is worth reading, so the connection can be reused
+            keep_alive = "close" not in response_headers.get("connection", "").lower()
+            length: str = response_headers.get("content-length", "")
+            if (
+                method == "HEAD"
+                or status_code in (204, 304)
+                or 100 <= status_code < 200
+            ):
+                pass
+            elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+                if mode == "get":
+                    await _read_chunked(reader, timeout)
+                else:
+                    keep_alive = False
+            elif length.isdigit():
+                if mode == "get" or int(length) <= HTTP_DRAIN_LIMIT:
+                    await asyncio.wait_for(reader.readexactly(int(length)), timeout)
+                else:
+                    keep_alive = False
+            else:
+                # The body runs until the server closes the connection
+                if mode == "get":
+                    await asyncio.wait_for(reader.read(), timeout)
+                keep_alive = False
+
+        finally:
+            if keep_alive:
+                _release_http_connection(origin, reader, writer)
+            else:
+                writer.close()
+
+        location: Optional[str] = response_headers.get("location")
+        if status_code in REDIRECT_CODES and location:
+            url = urljoin(url, location)
+            continue
+
+        finish_http_timing(timing, start, headers_at, time.monotonic())
+        return status_code
+
+    raise ValueError(f"Exceeded {max_redirects} redirects.")
+
+
+async def async_check_server_http(
+    url: str, timeout: Optional[float] = HTTP_TIMEOUT, mode: str = "stream"
+) -> Tuple[bool, Optional[int], dict]:
+    """
+    Asyncio version of check_server_http().
+
+    :param url: URL of the server (including http://)
+    :param timeout: Timeout for connecting and for each read in seconds. Default is HTTP_TIMEOUT.
+    :param mode: "get", "head" or "stream". Default is "stream".
+    :return: Tuple (True/False, status code, timing)
+             True if server is up (status code < 400), False otherwise
+    """
+    timing: dict = new_http_timing()
+    try:
+        status_code = await _async_http_status(
+            url, timeout=timeout, mode=mode, timing=timing
+        )
+        return status_code < 400, status_code, timing
+
+    except (OSError, ssl.SSLError, ValueError, asyncio.IncompleteReadError):
+        # IncompleteReadError, an EOFError, means the server closed the connection mid-body
+        return False, None, round_http_timing(timing)
+
+
+async def async_check_server_https(
+    url: str, timeout: Optional[float] = 5, mode: str = "stream"
+) -> Tuple[bool, Optional[int], str, dict]:
+    """
+    Asyncio version of check_server_https().
+
+    :param url: URL of the server (including https://)
+    :param timeout: Timeout for the request in seconds. Default is 5 seconds.
+    :param mode: "get", "head" or "stream". Default is "stream".
+    :return: Tuple (True/False for server status, status code, description, timing)
+    """
+    timing: dict = new_http_timing()
+    try:
+        headers: dict = {"User-Agent": "Mozilla/5.0"}
+        status_code = await _async_http_status(
+            url, headers=headers, timeout=timeout, mode=mode, timing=timing
+        )
+        return status_code < 400, status_code, "Server is up", timing
+
+    except TimeoutError:
+        # Checked before OSError, which TimeoutError is a subclass of
+        return False, None, "Timeout occurred", round_http_timing(timing)
+
+    except (OSError, ssl.SSLError, asyncio.IncompleteReadError):
+        # IncompleteReadError, an EOFError, means the server closed the connection mid-body
+        return False, None, "Connection error", round_http_timing(timing)
+
+    except ValueError as e:
+        return False, None, f"Error during request: {e}", round_http_timing(timing)
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    """Datagram protocol that resolves a future with the first datagram or error received"""
+
+    def __init__(self, future: asyncio.Future):
+        self._future: asyncio.Future = future
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        if not self._future.done():
+            self._future.set_result((data, addr))
+
+    def error_received(self, exc: Exception) -> None:
+        if not self._future.done():
+            self._future.set_exception(exc)
+
+
+async def _udp_exchange(
+    address: Tuple[str, int], data: bytes, timeout: float
+) -> Tuple[bytes, Any]:
+    """Send one datagram to address and return the first datagram received, or raise TimeoutError"""
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _DatagramReceiver(future), family=socket.AF_INET
+    )
+    try:
+        transport.sendto(data, address)
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        transport.close()
+
+
+async def async_check_ntp_servers(
+    servers: str | List[str], timeout: float = NTP_TIMEOUT
+) -> Dict[str, dict]:
+    """
+    Asyncio version of check_ntp_servers(), with the same arguments and results.
+
+    The requests are sent through the process-wide NTP engine and the replies are awaited on the event loop.
+    """
+    engine = get_ntp_engine()
+    servers = expand_ntp_servers(servers)
+    loop = asyncio.get_running_loop()
+
+    # Resolve every server at once, then send every request
+    addresses = await _resolve_ipv4_all(servers)
+    failed: Dict[str, str] = {}
+    probes: List[NtpProbe] = []
+    futures: List[asyncio.Future] = []
+    for server, address in zip(servers, addresses):
+        try:
+            if isinstance(address, BaseException):
+                raise address
+            # The engine calls back from its receiver thread, so hand the result over to the loop thread-safely
+            future: asyncio.Future = loop.create_future()
+            probes.append(
+                engine.send(
+                    server,
+                    address,
+                    callback=lambda _, future=future: loop.call_soon_threadsafe(
+                        _set_done, future
+                    ),
+                )
+            )
+            futures.append(future)
+        except OSError as e:
+            failed[server] = str(e)
+
+    # Gather replies until the shared deadline
+    if futures:
+        await asyncio.wait(futures, timeout=timeout)
+    for probe, future in zip(probes, futures):
+        engine.cancel(probe)
+        future.cancel()
+    return engine.summarise(servers, probes, failed)
+
+
+async def async_check_ntp_server(server: str) -> Tuple[bool, Optional[str]]:
+    """
+    Asyncio version of check_ntp_server().
+
+    Args:
+    server (str): The hostname or IP address of the NTP server to check.
+
+    Returns:
+    Tuple[bool, Optional[str]]: The server status and its current time as a string, or None if it's down.
+    """
+    result: dict = (await async_check_ntp_servers([server])).get(
+        server.strip(), {"up": False}
+    )
+    return result["up"], result.get("time")
+
+
+class _DatagramQueue(asyncio.DatagramProtocol):
+    """Datagram protocol that queues every datagram received, and any error, for a reader to take in turn"""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.queue.put_nowait(data)
+
+    def error_received(self, exc: Exception) -> None:
+        self.queue.put_nowait(exc)
+
+
+async def async_check_dns_server_records(
+    server: str, query: str, record_types: List[str], timeout: float = DNS_TIMEOUT
+) -> List[tuple]:
+    """
+    Asyncio version of check_dns_server_records(), sharing its resolver.
+
+    :param server: DNS server name or IP address
+    :param query: Domain name to query
+    :param record_types: Types of DNS record (e.g., ['A', 'AAAA', 'MX'])
+    :param timeout: Seconds to wait for the answers. Default is DNS_TIMEOUT.
+    :return: List of (record type, status, query results, latency in ms or None), one per record type
+    """
+    import dns.asyncquery
+    import dns.exception
+    import dns.flags
+
+    resolver = get_dns_resolver(server)
+    try:
+        address: str = await _resolve_ipv4(server)
+    except gaierror as e:
+        return [(record_type, False, str(e), None) for record_type in record_types]
+
+    # Every query stays failed with a timeout until its reply arrives
+    requests: list = resolver.make_queries(query, record_types)
+    results: List[tuple] = [
+        (record_type, False, str(dns.exception.Timeout(timeout=timeout)), None)
+        for record_type in record_types
+    ]
+    pending: Dict[int, int] = {request.id: i for i, request in enumerate(requests)}
+    sent: List[float] = []
+    truncated: List[int] = []
+    loop = asyncio.get_running_loop()
+    deadline: float = time.monotonic() + timeout
+
+    # All the queries go out of one socket, connected so only the nameserver's datagrams are received
+    transport, protocol = await loop.create_datagram_endpoint(
+        _DatagramQueue, remote_addr=(address, 53), family=socket.AF_INET
+    )
+    try:
+        for request in requests:
+            transport.sendto(request.to_wire())
+            sent.append(time.monotonic())
+
+        while pending and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                data = await asyncio.wait_for(protocol.queue.get(), remaining)
+            except TimeoutError:
+                break
+            if isinstance(data, Exception):
+                raise data
+            received: float = time.monotonic()
+            match = resolver.match_reply(requests, pending, data)
+            if match is None:
+                continue
+            index, reply = match
+            del pending[reply.id]
+            if reply.flags & dns.flags.TC:
+                truncated.append(index)
+                continue
+            results[index] = (
+                record_types[index],
+                *resolver.reply_results(reply),
+                (received - sent[index]) * 1000,
+            )
+    except OSError as e:
+        # Sending failed, or the nameserver's host refused the datagrams
+        for index in pending.values():
+            results[index] = (record_types[index], False, str(e), None)
+    finally:
+        transport.close()
+
+    # Replies too large for a datagram are fetched again over TCP
+    for index in truncated:
+        try:
+            reply = await dns.asyncquery.tcp(
+                requests[index], address, timeout=max(deadline - time.monotonic(), 0.1)
+            )
+            results[index] = (
+                record_types[index],
+                *resolver.reply_results(reply),
+                (time.monotonic() - sent[index]) * 1000,
+            )
+        except (dns.exception.DNSException, OSError) as e:
+            results[index] = (record_types[index], False, str(e), None)
+
+    return results
+
+
+async def async_check_dns_server_status(server, query, record_type) -> (bool, str):
+    """
+    Asyncio version of check_dns_server_status().
+
+    :param server: DNS server name or IP address
+    :param query: Domain name to query
+    :param record_type: Type of DNS record (e.g., 'A', 'AAAA', 'MX', 'CNAME')
+    :return: Tuple (status, query_results)
+    """
+    _, status, results, _ = (
+        await async_check_dns_server_records(server, query, [record_type])
+    )[0]
+    return status, results
+
+
+async def async_check_tcp_port(ip_address: str, port: int) -> (bool, str):
+    """
+    Asyncio version of check_tcp_port().
+
+    Args:
+    ip_address (str): The IP address of the target server.
+    port (int): The TCP port number to check.
+
+    Returns:
+    tuple: Whether the port is open, and a description of the port status.
+    """
+    try:
+        address: str = await _resolve_ipv4(ip_address)
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), 3)
+        writer.close()
+        return True, f"Port {port} on {ip_address} is open."
+
+    except TimeoutError:
+        return False, f"Port {port} on {ip_address} timed out."
+
+    except OSError:
+        return False, f"Port {port} on {ip_address} is closed or not reachable."
+
+    except Exception as e:
+        return (
+            False,
+            f"Failed to check port {port} on {ip_address} due to an error: {e}",
+        )
+
+
+async def async_check_udp_port(
+    ip_address: str, port: int, timeout: int = 3
+) -> (bool, str):
+    """
+    Asyncio version of check_udp_port().
+
+    Args:
+    ip_address (str): The IP address of the target server.
+    port (int): The UDP port number to check.
+    timeout (int): The timeout duration in seconds. Default is 3 seconds.
+
+    Returns:
+    tuple: Whether the port is open (or the status is uncertain), and a description of the port status.
+    """
+    try:
+        address: str = await _resolve_ipv4(ip_address)
+        try:
+            # Any datagram back is treated as a closed port, as in check_udp_port()
+            await _udp_exchange((address, port), b"", timeout)
+            return False, f"Port {port} on {ip_address} is closed."
+
+        except TimeoutError:
+            return (
+                True,
+                f"Port {port} on {ip_address} is open or no response received.",
+            )
+
+    except Exception as e:
+        return (
+            False,
+            f"Failed to check UDP port {port} on {ip_address} due to an error: {e}",
+        )
+
+
+async def async_local_tcp_echo(ip_address: str, port: int) -> (bool, str):
+    """
+    Asyncio version of local_tcp_echo().
+
+    Args:
+    ip_address (str): The IP address of the target server.
+    port (int): The TCP port number to check.
+
+    Returns:
+    tuple: Whether the echo exchange succeeded, and a description of each step.
+    """
+    import lorem
+
+    results = []
+
+    try:
+        address: str = await _resolve_ipv4(ip_address)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(address, port), 3
+        )
+        try:
+            results.append(f"Port {port} on {ip_address} is open.")
+
+            # Send a random lorem ipsum sentence
+            message = lorem.sentence()
+            results.append(f"Sending echo request message: {message}")
+            writer.write(message.encode())
+            await asyncio.wait_for(writer.drain(), 3)
+
+            # Receive the echo reply
+            reply = (await asyncio.wait_for(reader.read(1024), 3)).decode()
+            if reply == message:
+                results.append(f"Received echo reply message: {reply}")
+
+            # Send termination message
+            results.append(f"Sending termination message to {(ip_address, port)} ... ")
+            writer.write("Goodbye".encode())
+            await asyncio.wait_for(writer.drain(), 3)
+            results.append(f"Connection with {(ip_address, port)} is closed.")
+            return True, "\n".join(results)
+
+        finally:
+            writer.close()
+
+    except TimeoutError:
+        return False, f"Port {port} on {ip_address} timed out."
+
+    except OSError:
+        return False, f"Port {port} on {ip_address} is closed or not reachable."
+
+    except Exception as e:
+        return (
+            False,
+            f"Failed to check port {port} on {ip_address} due to an error: {e}",
+        )
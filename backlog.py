@@ -0,0 +1,211 @@
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+# Header in front of each spilled record: when it was added (epoch seconds) and its length
+RECORD_HEADER = struct.Struct("!dI")
+
+
+class BacklogSegment:
+    """An append-only segment file, memory-mapped, holding records spilled from the in-memory ring buffer"""
+
+    __slots__ = (
+        "path",
+        "file",
+        "map",
+        "size",
+        "write_offset",
+        "read_offset",
+        "records",
+    )
+
+    def __init__(self, path: str, size: int):
+        self.path: str = path
+        self.size: int = size
+
+        # Preallocate the file and map it so appends are plain memory writes
+        self.file = open(path, "w+b")
+        self.file.truncate(size)
+        self.map: mmap.mmap = mmap.mmap(self.file.fileno(), size)
+
+        self.write_offset: int = 0
+        self.read_offset: int = 0
+        self.records: int = 0
+
+    def has_room(self, length: int) -> bool:
+        """Whether a record of length bytes still fits in the segment"""
+        return self.write_offset + RECORD_HEADER.size + length <= self.size
+
+    def append(self, timestamp: float, data: bytes) -> None:
+        """Append a record at the end of the segment"""
+        RECORD_HEADER.pack_into(self.map, self.write_offset, timestamp, len(data))
+        start: int = self.write_offset + RECORD_HEADER.size
+        self.map[start : start + len(data)] = data
+        self.write_offset = start + len(data)
+        self.records += 1
+
+    def read(self, offset: int) -> Tuple[float, bytes, int]:
+        """Read the record at offset, returning its timestamp, data and the offset of the next record"""
+        timestamp, length = RECORD_HEADER.unpack_from(self.map, offset)
+        start: int = offset + RECORD_HEADER.size
+        return timestamp, self.map[start : start + length], start + length
+
+    def close(self) -> None:
+        """Unmap, close and delete the segment file"""
+        self.map.close()
+        self.file.close()
+        os.remove(self.path)
+
+
+class ResultBacklog:
+    """
+    Bounded backlog of packed results kept by a monitor while the manager is unreachable.
+
+    The newest memory_records results are held in an in-memory ring buffer. Older ones spill, oldest first, into
+    memory-mapped append-only segment files in directory, so the backlog stays in order: segments, then memory.
+    The retention policy caps the total size at max_bytes and, if max_age is set, drops results older than
+    max_age seconds; either way the oldest results are dropped first. The dropped and spilled counters record
+    how many results were lost to retention and how many were written to disk.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        memory_records: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        segment_size: int = 4 * 1024 * 1024,
+    ):
+        # Retention policy
+        self._memory_records: int = memory_records
+        self._max_bytes: int = max_bytes
+        self._max_age: Optional[float] = max_age
+
+        # Ring buffer of (timestamp, data), newest on the right
+        self._memory: deque = deque()
+
+        # Spilled segments, oldest on the left; only the last one is appended to
+        self._directory: str = directory
+        self._segment_size: int = segment_size
+        self._segments: deque = deque()
+        self._segment_index: int = 0
+
+        # Totals and counters
+        self._count: int = 0
+        self._bytes: int = 0
+        self.dropped: int = 0
+        self.spilled: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+
+        # Segments left over from a previous run are stale
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """Total bytes of results held"""
+        return self._bytes
+
+    def append(self, data: bytes) -> None:
+        """Add a result at the newest end, spilling and dropping the oldest results as the policy requires"""
+        now: float = time.time()
+        with self._lock:
+            self._memory.append((now, data))
+            self._count += 1
+            self._bytes += len(data)
+
+            # Spill the oldest in-memory results once the ring buffer is full
+            while len(self._memory) > self._memory_records:
+                self._spill(*self._memory.popleft())
+
+            self._enforce_retention(now)
+
+    def peek(self, limit: int) -> List[bytes]:
+        """Return up to limit of the oldest results without removing them"""
+        with self._lock:
+            self._enforce_retention(time.time())
+            results: List[bytes] = []
+
+            for segment in self._segments:
+                offset: int = segment.read_offset
+                while offset < segment.write_offset and len(results) < limit:
+                    _, data, offset = segment.read(offset)
+                    results.append(data)
+
+            for _, data in self._memory:
+                if len(results) >= limit:
+                    break
+                results.append(data)
+
+            return results
+
+    def consume(self, count: int) -> None:
+        """Remove the count oldest results, e.g. once they have been sent"""
+        with self._lock:
+            for _ in range(min(count, self._count)):
+                self._pop_oldest()
+
+    def close(self) -> None:
+        """Delete every spilled segment"""
+        with self._lock:
+            while self._segments:
+                self._segments.popleft().close()
+            self._memory.clear()
+            self._count = 0
+            self._bytes = 0
+
+    def _spill(self, timestamp: float, data: bytes) -> None:
+        """Append a result to the newest segment, starting a new one if it is full"""
+        if not self._segments or not self._segments[-1].has_room(len(data)):
+            path: str = os.path.join(self._directory, f"{self._segment_index:08d}.seg")
+            self._segment_index += 1
+            self._segments.append(
+                BacklogSegment(
+                    path, max(self._segment_size, RECORD_HEADER.size + len(data))
+                )
+            )
+        self._segments[-1].append(timestamp, data)
+        self.spilled += 1
+
+    def _oldest_timestamp(self) -> Optional[float]:
+        """Timestamp of the oldest result held, if any"""
+        if self._segments:
+            segment = self._segments[0]
+            return RECORD_HEADER.unpack_from(segment.map, segment.read_offset)[0]
+        if self._memory:
+            return self._memory[0][0]
+        return None
+
+    def _enforce_retention(self, now: float) -> None:
+        """Drop the oldest results until the backlog is within its size and age limits"""
+        while self._count and (
+            self._bytes > self._max_bytes
+            or (
+                self._max_age is not None
+                and self._oldest_timestamp() < now - self._max_age
+            )
+        ):
+            self._pop_oldest()
+            self.dropped += 1
+
+    def _pop_oldest(self) -> None:
+        """Remove the oldest result, deleting its segment once the segment is used up"""
+        if self._segments:
+            segment = self._segments[0]
+            _, data, segment.read_offset = segment.read(segment.read_offset)
+            segment.records -= 1
+            if not segment.records:
+                self._segments.popleft().close()
+        else:
+            _, data = self._memory.popleft()
+        self._count -= 1
+        self._bytes -= len(data)
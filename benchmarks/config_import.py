@@ -0,0 +1,110 @@
+"""
+Bulk config benchmark: importing and exporting a large inventory through config_io and the config store.
+
+Generates ROWS task records of six types spread over the given number of monitors, writes them in each
+format, then times importing each file into a fresh store and exporting it back. YAML is skipped unless
+PyYAML is installed. Peak memory only grows, so by default YAML, which is loaded and dumped whole, runs last.
+
+    python benchmarks/config_import.py --rows 100000 --monitors 20
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config_io
+from config_store import ConfigStore
+
+
+def generate_records(rows: int, monitors: int):
+    """Yield rows new task records, cycling through six task types and the monitors"""
+    for i in range(rows):
+        record = {"monitor_ip": "10.0.0.1", "monitor_port": 40000 + i % monitors}
+        kind = i % 6
+        if kind == 0:
+            record.update(type="Ping", host=f"host-{i}.example.com")
+        elif kind == 1:
+            record.update(
+                type="TCP",
+                server=f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                port=443,
+            )
+        elif kind == 2:
+            record.update(
+                type="HTTP", url=f"http://site-{i}.example.com/health", mode="head"
+            )
+        elif kind == 3:
+            record.update(
+                type="DNS",
+                server="192.0.2.53",
+                query=f"name-{i}.example.com",
+                record_types=["A", "AAAA"],
+            )
+        elif kind == 4:
+            record.update(type="NTP", server=f"ntp-{i}.example.com")
+        else:
+            record.update(type="UDP", server=f"udp-{i}.example.com", port=53, timeout=2)
+        record["frequency"] = 30 + i % 5 * 15
+        yield record
+
+
+def max_rss_mb() -> float:
+    """Peak resident memory of this process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--monitors", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=config_io.IMPORT_BATCH_SIZE)
+    parser.add_argument("--formats", nargs="+", default=["csv", "jsonl", "yaml"])
+    args = parser.parse_args()
+
+    formats = list(args.formats)
+    if "yaml" in formats:
+        try:
+            config_io.load_yaml()
+        except ValueError:
+            print("PyYAML isn't installed, skipping YAML")
+            formats.remove("yaml")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in formats:
+            source = os.path.join(directory, f"targets.{fmt}")
+            config_io.write_records(
+                source, fmt, generate_records(args.rows, args.monitors)
+            )
+
+            store = ConfigStore(os.path.join(directory, f"{fmt}.db"), legacy_path=None)
+            start = time.perf_counter()
+            imported, errors = config_io.import_records(
+                store, config_io.read_records(source, fmt), args.batch_size
+            )
+            imported_in = time.perf_counter() - start
+            if errors:
+                print(f"{fmt}: {len(errors)} records rejected, first: {errors[0]}")
+
+            start = time.perf_counter()
+            exported = config_io.write_records(
+                os.path.join(directory, f"export.{fmt}"),
+                fmt,
+                config_io.export_records(store),
+            )
+            exported_in = time.perf_counter() - start
+            store.close()
+
+            print(
+                f"{fmt}: import {imported} rows in {imported_in:.2f} s ({imported / imported_in:.0f} rows/s), "
+                f"export {exported} rows in {exported_in:.2f} s, max RSS so far {max_rss_mb():.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
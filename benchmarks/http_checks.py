@@ -0,0 +1,175 @@
+"""
+HTTP check benchmark: checks per second against a local stand-in web server, for each check mode.
+
+Serves a small and a large body over HTTP and, when openssl is available to make a throwaway self-signed
+certificate, HTTPS, from http.server on localhost with keep-alive. Then runs each check mode back to back
+through the threaded checks (network_tests) and the asyncio ones (async_network_tests), so pooled
+connections are reused as they are by a monitor running one task.
+
+    python benchmarks/http_checks.py --checks 200 --large 1048576
+"""
+
+import argparse
+import asyncio
+import http.server
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_network_tests import (
+    async_check_server_http,
+    async_check_server_https,
+    https_context,
+)
+from network_tests import (
+    HTTP_MODES,
+    check_server_http,
+    check_server_https,
+    close_http_session,
+)
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Answers GET and HEAD for /<size> with a body of that many bytes, keeping connections alive"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_body(int(self.path.strip("/")))
+
+    def do_HEAD(self):
+        self.send_body(int(self.path.strip("/")), head=True)
+
+    def send_body(self, size: int, head: bool = False):
+        self.send_response(200)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        if not head:
+            self.wfile.write(b"x" * size)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """Threaded stand-in server that ignores clients closing connections mid-response, as streamed checks of a
+    large body do"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            super().handle_error(request, client_address)
+
+
+def serve(context: ssl.SSLContext | None = None) -> int:
+    """Start a stand-in server on a free localhost port in a background thread, returning the port"""
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    if context:
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def self_signed_certificate(directory: str) -> tuple | None:
+    """Make a certificate and key for 127.0.0.1 with openssl, or return None if it isn't installed"""
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+            "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+    return cert, key
+
+
+def run_sync(check, url: str, mode: str, checks: int) -> float:
+    """Checks per second of one URL in one mode, after a first check that opens the pooled connection"""
+    check(url, 10, mode)
+    start = time.perf_counter()
+    for _ in range(checks):
+        up = check(url, 10, mode)[0]
+    assert up, f"{url} {mode} check failed"
+    return checks / (time.perf_counter() - start)
+
+
+def run_async(check, url: str, mode: str, checks: int) -> float:
+    """As run_sync, for the asyncio checks on a new event loop"""
+
+    async def measure():
+        await check(url, 10, mode)
+        start = time.perf_counter()
+        for _ in range(checks):
+            up = (await check(url, 10, mode))[0]
+        assert up, f"{url} {mode} check failed"
+        return checks / (time.perf_counter() - start)
+
+    return asyncio.run(measure())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--checks", type=int, default=200, help="checks per measurement"
+    )
+    parser.add_argument("--small", type=int, default=1024, help="small body in bytes")
+    parser.add_argument(
+        "--large", type=int, default=1024 * 1024, help="large body in bytes"
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=list(HTTP_MODES), choices=HTTP_MODES
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        origins = {
+            "http": (
+                f"http://127.0.0.1:{serve()}",
+                check_server_http,
+                async_check_server_http,
+            )
+        }
+        certificate = self_signed_certificate(directory)
+        if certificate:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate)
+            # Trust the throwaway certificate; requests takes its CA bundle from the environment over a session's
+            os.environ["REQUESTS_CA_BUNDLE"] = certificate[0]
+            https_context().load_verify_locations(certificate[0])
+            origins["https"] = (
+                f"https://127.0.0.1:{serve(context)}",
+                check_server_https,
+                async_check_server_https,
+            )
+        else:
+            print("openssl isn't installed, skipping HTTPS")
+
+        print(f"checks/s, {args.checks} checks each")
+        for engine, run in (("sync", run_sync), ("async", run_async)):
+            for scheme, (origin, *checks) in origins.items():
+                check = checks[0] if engine == "sync" else checks[1]
+                for size in (args.small, args.large):
+                    url = f"{origin}/{size}"
+                    rates = [
+                        f"{mode} {run(check, url, mode, args.checks):6.0f}"
+                        for mode in args.modes
+                    ]
+                    print(f"  {engine:5} {scheme:5} {size:>8} B  " + "  ".join(rates))
+        close_http_session()
+
+
+if __name__ == "__main__":
+    main()
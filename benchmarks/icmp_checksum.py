@@ -0,0 +1,79 @@
+"""
+ICMP packet benchmark: building Echo Requests with create_icmp_packet against IcmpPacketBuilder.build.
+
+create_icmp_packet packs the header twice and sums the whole packet in Python for every probe, while the
+builder patches the sequence number into a precomputed template and updates its checksum incrementally
+(RFC 1624). Also compares the checksum functions on their own: calculate_icmp_checksum's Python loop
+against fast_icmp_checksum, which uses NumPy for large payloads when it is installed.
+
+    python benchmarks/icmp_checksum.py --packets 20000 --sizes 56 192 1472
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network_tests import (
+    IcmpPacketBuilder,
+    calculate_icmp_checksum,
+    create_icmp_packet,
+    fast_icmp_checksum,
+    load_numpy,
+)
+
+
+def best_of(statement, number: int, repeat: int) -> float:
+    """Fastest of repeat runs of statement number times, in seconds"""
+    return min(timeit.repeat(statement, number=number, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--packets", type=int, default=20000, help="packets per measurement"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[56, 192, 1472], help="payload bytes"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{args.packets} packets, best of {args.repeat}; NumPy "
+        f"{'installed' if load_numpy() else 'not installed'}"
+    )
+    for size in args.sizes:
+        builder = IcmpPacketBuilder(0x1234, size)
+        sequence_numbers = iter(range(1 << 62))
+        create = best_of(
+            lambda: create_icmp_packet(
+                sequence_number=next(sequence_numbers) & 0xFFFF,
+                data_size=size,
+                icmp_id=0x1234,
+            ),
+            args.packets,
+            args.repeat,
+        )
+        build = best_of(
+            lambda: builder.build(next(sequence_numbers) & 0xFFFF),
+            args.packets,
+            args.repeat,
+        )
+
+        packet = builder.build(1)
+        reference = best_of(
+            lambda: calculate_icmp_checksum(packet), args.packets, args.repeat
+        )
+        fast = best_of(lambda: fast_icmp_checksum(packet), args.packets, args.repeat)
+
+        print(
+            f"  {size:>5} B payload: create_icmp_packet {create:.3f} s, build {build:.3f} s "
+            f"({create / build:.1f}x); checksum {reference:.3f} s, fast {fast:.3f} s ({reference / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Monitor import benchmark: time, peak memory and modules loaded by 'import monitor' in a fresh interpreter.
+
+Each run imports the monitor in a new process with -X importtime, and reports its wall time, peak RSS, how
+many modules it loaded and which of the check dependencies among them, then the slowest imports of the last
+run by cumulative time. A monitor whose tasks only ping or connect should load none of the dependencies.
+
+    python benchmarks/import_time.py --runs 5
+
+To compare with another revision, check it out alongside and point --tree at it:
+
+    git worktree add ../before <revision>
+    python benchmarks/import_time.py --tree ../before
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Third-party packages the checks depend on, imported by the checks that use them
+DEPENDENCIES = ("requests", "urllib3", "dns", "lorem", "certifi", "numpy")
+
+# Run in the child: import the monitor and report on itself as JSON
+CHILD = f"""
+import json, resource, sys, time
+start = time.perf_counter()
+import monitor
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "rss_mb": peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024,
+    "modules": len(sys.modules),
+    "dependencies": [name for name in {DEPENDENCIES!r} if name in sys.modules],
+}}))
+"""
+
+
+def slowest_imports(importtime: str, count: int) -> list:
+    """The (cumulative microseconds, module) of the slowest imports in -X importtime output"""
+    imports = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument(
+        "--tree",
+        default=ROOT,
+        help="checkout to import the monitor from (default: this one)",
+    )
+    args = parser.parse_args()
+
+    for run in range(1, args.runs + 1):
+        child = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD],
+            cwd=args.tree,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = json.loads(child.stdout.splitlines()[-1])
+        print(
+            f"run {run}: {report['ms']:.0f} ms, max RSS {report['rss_mb']:.1f} MB, "
+            f"{report['modules']} modules, dependencies loaded: {', '.join(report['dependencies']) or 'none'}"
+        )
+
+    print(f"\nslowest imports of run {args.runs} (cumulative):")
+    for cumulative, name in slowest_imports(child.stderr, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
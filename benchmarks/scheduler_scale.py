@@ -0,0 +1,70 @@
+"""
+Monitor scale benchmark: the CheckScheduler running N tasks at once.
+
+Every task is a no-op check at the same frequency. Reports the time to add the tasks, the memory held per
+task (tracemalloc), the threads running, and how late runs started relative to when they were due.
+
+    python benchmarks/scheduler_scale.py --tasks 10000 --frequency 5 --duration 15
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import CheckScheduler
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """The sample below which the given fraction of sorted samples fall"""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument(
+        "--frequency", type=float, default=5, help="seconds between runs of a task"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=15, help="seconds to run the tasks for"
+    )
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    # Lateness of each run in milliseconds; list.append is atomic, so the workers need no lock
+    lateness: list = []
+
+    def check(due: float):
+        lateness.append((time.monotonic() - due) * 1000)
+
+    tracemalloc.start()
+    scheduler = CheckScheduler(args.workers)
+    scheduler.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        scheduler.add(check, args.frequency)
+    added = time.perf_counter() - start
+    per_task = (tracemalloc.get_traced_memory()[0] - before) / args.tasks
+    tracemalloc.stop()
+
+    time.sleep(args.duration)
+    threads = threading.active_count()
+    scheduler.stop()
+
+    samples = sorted(lateness)
+    print(f"{args.tasks} tasks every {args.frequency:g} s for {args.duration:g} s")
+    print(f"  add: {added:.3f} s, ~{per_task:.0f} B/task, {threads} threads")
+    print(
+        f"  runs: {len(samples)}, lateness p50 {percentile(samples, 0.5):.1f} ms, "
+        f"p99 {percentile(samples, 0.99):.1f} ms, max {samples[-1]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
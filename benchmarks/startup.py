@@ -0,0 +1,115 @@
+"""
+Manager startup benchmark: how long a ClientFleet takes to bring N monitors from connecting to streaming.
+
+The monitors are asyncio stand-ins on localhost that acknowledge SET_ID, START, CONFIG and READY immediately,
+so the time measured is the fleet's own connect and handshake path under its concurrency cap.
+
+    python benchmarks/startup.py --monitors 200 --max-handshakes 64
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manager import ClientFleet
+from protocol import FrameReader, FrameType, encode_frame
+
+
+class StandInMonitor(asyncio.Protocol):
+    """Answers the manager's handshake the way a monitor does, without running any tasks"""
+
+    def connection_made(self, transport: asyncio.Transport):
+        self._transport = transport
+        self._reader = FrameReader()
+
+    def data_received(self, data: bytes):
+        for command, payload in self._reader.feed(data):
+            if command == FrameType.SET_ID:
+                self.ack(f"ID set to {payload}!")
+            elif command == FrameType.START:
+                self.ack("awaiting tasks ...")
+            elif command == FrameType.CONFIG:
+                self.ack(
+                    {
+                        "configured": {
+                            task: {
+                                "status": "ok",
+                                "type": params["type"],
+                                "params": params,
+                                "frequency": params["frequency"],
+                            }
+                            for task, params in payload.items()
+                        }
+                    }
+                )
+            elif command == FrameType.READY:
+                self.ack("tasks started!")
+            elif command == FrameType.QUIT:
+                self.ack("stopping tasks!")
+            elif command == FrameType.HEARTBEAT:
+                self._transport.write(encode_frame(FrameType.HEARTBEAT))
+
+    def ack(self, payload):
+        self._transport.write(encode_frame(FrameType.ACK, payload))
+
+
+async def run(monitors: int, max_handshakes: int, tasks: int) -> float:
+    """Start the stand-ins and a fleet for them, returning the seconds until every session is streaming"""
+    loop = asyncio.get_running_loop()
+    servers = [
+        await loop.create_server(StandInMonitor, "127.0.0.1", 0)
+        for _ in range(monitors)
+    ]
+    services = {
+        f"tcp-{i:012x}": {
+            "type": "TCP",
+            "server": "127.0.0.1",
+            "port": 80,
+            "frequency": 60,
+        }
+        for i in range(tasks)
+    }
+
+    fleet = ClientFleet(max_handshakes)
+    start = time.perf_counter()
+    for i, server in enumerate(servers):
+        fleet.add(
+            f"monitor-{i}", "127.0.0.1", server.sockets[0].getsockname()[1], services
+        )
+    while any(client._state != "stream" for client in fleet._clients.values()):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    await loop.run_in_executor(None, fleet.stop)
+    for server in servers:
+        server.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--monitors", type=int, default=200)
+    parser.add_argument("--max-handshakes", type=int, default=64)
+    parser.add_argument(
+        "--tasks", type=int, default=4, help="tasks configured per monitor"
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for run_number in range(1, args.runs + 1):
+        # The fleet logs every step of every handshake
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            elapsed = asyncio.run(run(args.monitors, args.max_handshakes, args.tasks))
+        print(
+            f"run {run_number}: {args.monitors} monitors streaming after {elapsed:.3f} s "
+            f"(max {args.max_handshakes} handshakes at once)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from config_store import ConfigStore, new_task_id
+from network_tests import HTTP_MODES, HTTP_TIMEOUT
+
+# Rows written to the store per transaction during an import
+IMPORT_BATCH_SIZE = 1000
+
+# File formats understood by import and export, by file extension
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+# Columns every record has, in front of the task's own params
+RECORD_COLUMNS = ("monitor_ip", "monitor_port", "task_id", "type", "frequency")
+
+# DNS record types a DNS task may query
+RECORD_TYPES = (
+    "A",
+    "MX",
+    "AAAA",
+    "CNAME",
+    "ANAME",
+    "NS",
+    "SOA",
+    "TXT",
+    "PTR",
+    "SRV",
+    "SPF",
+)
+
+# Marks a param that has no default and must be given
+REQUIRED = object()
+
+
+def to_text(value: Any) -> str:
+    """A non-empty string param"""
+    text = str(value).strip()
+    if not text:
+        raise ValueError("must not be empty")
+    return text
+
+
+def to_int(value: Any) -> int:
+    """A whole number param, given as a number or as text"""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(value)
+
+
+def to_positive_int(value: Any) -> int:
+    """A whole number param greater than zero"""
+    number = to_int(value)
+    if number <= 0:
+        raise ValueError(f"{number} is not greater than zero")
+    return number
+
+
+def to_port(value: Any) -> int:
+    """A TCP or UDP port number"""
+    port = to_int(value)
+    if not 0 < port < 65536:
+        raise ValueError(f"{port} is not a port number")
+    return port
+
+
+def to_bool(value: Any) -> bool:
+    """A yes/no param, given as a bool or as text such as true, yes, y or 1"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "yes", "y", "1")
+
+
+def to_url(scheme: str) -> Callable[[Any], str]:
+    """A URL param, with the scheme added if it was left out, as the prompts do"""
+
+    def convert(value: Any) -> str:
+        url = to_text(value)
+        return url if url.startswith(f"{scheme}://") else f"{scheme}://{url}"
+
+    return convert
+
+
+def to_choice(choices: Tuple[str, ...]) -> Callable[[Any], str]:
+    """A param that must be one of a few words, in any case"""
+
+    def convert(value: Any) -> str:
+        choice = str(value).strip().lower()
+        if choice not in choices:
+            raise ValueError(f"{value!r} is not one of {', '.join(choices)}")
+        return choice
+
+    return convert
+
+
+def to_record_types(value: Any) -> List[str]:
+    """A list of DNS record types, given as a list or as text separated by spaces, commas or semicolons"""
+    if isinstance(value, str):
+        value = value.replace(",", " ").replace(";", " ").split()
+    record_types = [str(record_type).upper() for record_type in value]
+    for record_type in record_types:
+        if record_type not in RECORD_TYPES:
+            raise ValueError(f"{record_type!r} is not a DNS record type")
+    return record_types
+
+
+# Params of each task type, in the order and with the defaults the manager's prompts use: (name, converter, default)
+TASK_SCHEMAS = {
+    "Ping": [
+        ("host", to_text, REQUIRED),
+        ("ttl", to_positive_int, 64),
+        ("timeout", to_positive_int, 1),
+        ("sequence_number", to_int, 1),
+    ],
+    "Tracert": [
+        ("host", to_text, REQUIRED),
+        ("max_hops", to_positive_int, 30),
+        ("pings_per_hop", to_positive_int, 1),
+        ("verbose", to_bool, False),
+        ("parallel", to_bool, False),
+    ],
+    "HTTP": [
+        ("url", to_url("http"), REQUIRED),
+        ("timeout", to_positive_int, HTTP_TIMEOUT),
+        ("mode", to_choice(HTTP_MODES), "stream"),
+    ],
+    "HTTPS": [
+        ("url", to_url("https"), REQUIRED),
+        ("timeout", to_positive_int, 5),
+        ("mode", to_choice(HTTP_MODES), "stream"),
+    ],
+    "NTP": [("server", to_text, REQUIRED)],
+    "DNS": [
+        ("server", to_text, REQUIRED),
+        ("query", to_text, REQUIRED),
+        ("record_types", to_record_types, []),
+    ],
+    "TCP": [("server", to_text, REQUIRED), ("port", to_port, REQUIRED)],
+    "UDP": [
+        ("server", to_text, REQUIRED),
+        ("port", to_port, REQUIRED),
+        ("timeout", to_positive_int, 3),
+    ],
+    "Echo": [("server", to_text, REQUIRED), ("port", to_port, REQUIRED)],
+    "Sweep": [
+        ("targets", to_text, REQUIRED),
+        ("timeout", to_positive_int, 1),
+        ("count", to_positive_int, 1),
+    ],
+}
+
+# Check interval in seconds every task has, after its own params
+FREQUENCY = ("frequency", to_positive_int, 60)
+
+
+def validate_params(params: dict) -> dict:
+    """
+    Check a task's params against its type's schema and return them converted, in schema order, with defaults
+    filled in for anything left out or empty. Raises ValueError naming the first param that is invalid.
+    """
+    task = params.get("type")
+    if task not in TASK_SCHEMAS:
+        raise ValueError(f"unknown task type {task!r}")
+
+    validated = {"type": task}
+    for name, convert, default in TASK_SCHEMAS[task] + [FREQUENCY]:
+        value = params.get(name)
+        if value is None or value == "":
+            if default is REQUIRED:
+                raise ValueError(f"{task} task needs {name}")
+            validated[name] = list(default) if isinstance(default, list) else default
+            continue
+        try:
+            validated[name] = convert(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{task} task has invalid {name}: {e}")
+    return validated
+
+
+def validate_record(record: dict) -> Tuple[str, str, int, str, dict]:
+    """Validate one imported record, returning its monitor id, monitor IP and port, task id and task params"""
+    if not isinstance(record, dict):
+        raise ValueError(f"not a record: {record!r}")
+    try:
+        monitor_ip = to_text(record.get("monitor_ip") or "")
+        monitor_port = to_port(record.get("monitor_port"))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid monitor address: {e}")
+    params = validate_params(record)
+    task_id = str(record.get("task_id") or "").strip() or new_task_id(params["type"])
+    return f"{monitor_ip}:{monitor_port}", monitor_ip, monitor_port, task_id, params
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """The format of a file, as given or from its extension"""
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in FORMATS.values():
+        raise ValueError(
+            f"Can't tell the format of {path}, use --format csv, jsonl or yaml"
+        )
+    return fmt
+
+
+def load_yaml():
+    """The optional PyYAML module, needed only for YAML files; its libyaml loader and dumper are used if built"""
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("YAML files need PyYAML: pip install pyyaml")
+    return yaml
+
+
+def read_records(path: str, fmt: str) -> Iterator[dict]:
+    """Yield each record of a CSV, JSON lines or YAML file, streaming all but YAML"""
+    if fmt == "yaml":
+        with open(path, "r") as file:
+            # A YAML file is a list of records, or several documents of records
+            yaml = load_yaml()
+            for document in yaml.load_all(
+                file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            ):
+                yield from document or []
+        return
+
+    with open(path, "r", newline="") as file:
+        if fmt == "csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    # A malformed line is passed on as is, to be rejected like any other invalid record
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield line.strip()
+
+
+def import_records(
+    store: ConfigStore, records: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE
+) -> Tuple[int, List[str]]:
+    """
+    Validate records and write the valid ones to the store in transactions of batch_size, returning how many
+    were imported and why each invalid one was rejected. A record with a task_id replaces that task; one without
+    becomes a new task.
+    """
+    imported: int = 0
+    errors: List[str] = []
+    batch: dict = {}
+    pending: int = 0
+
+    def flush():
+        with store.transaction() as cursor:
+            for monitor_id, (monitor_ip, monitor_port, services) in batch.items():
+                store.put_monitor(monitor_id, monitor_ip, monitor_port, cursor)
+                store.put_tasks(monitor_id, services, cursor)
+        batch.clear()
+
+    for number, record in enumerate(records, start=1):
+        try:
+            monitor_id, monitor_ip, monitor_port, task_id, params = validate_record(
+                record
+            )
+        except ValueError as e:
+            errors.append(f"Record {number}: {e}")
+            continue
+
+        batch.setdefault(monitor_id, (monitor_ip, monitor_port, {}))[2][
+            task_id
+        ] = params
+        imported += 1
+        pending += 1
+        if pending >= batch_size:
+            flush()
+            pending = 0
+
+    if batch:
+        flush()
+    return imported, errors
+
+
+def export_records(store: ConfigStore) -> Iterator[dict]:
+    """Yield one record per task in the store, in the form import_records reads"""
+    for monitor_id, config in store.configs():
+        for task_id, params in config["Services"].items():
+            yield {
+                "monitor_ip": config["IP"],
+                "monitor_port": config["Port"],
+                "task_id": task_id,
+                **params,
+            }
+
+
+def write_records(path: str, fmt: str, records: Iterable[dict]) -> int:
+    """Write records to a CSV, JSON lines or YAML file, returning how many were written"""
+    count: int = 0
+    if fmt == "yaml":
+        records = list(records)
+        with open(path, "w") as file:
+            yaml = load_yaml()
+            yaml.dump(
+                records,
+                file,
+                Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                sort_keys=False,
+            )
+        return len(records)
+
+    with open(path, "w", newline="") as file:
+        if fmt == "csv":
+            # One column per param of any task type, so every valid record fits; JSON lines keep anything else
+            columns = list(RECORD_COLUMNS)
+            for schema in TASK_SCHEMAS.values():
+                columns += [name for name, _, _ in schema if name not in columns]
+            writer = csv.DictWriter(file, columns, extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                if isinstance(record.get("record_types"), list):
+                    record["record_types"] = " ".join(record["record_types"])
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                count += 1
+    return count
+
+
+def main(argv: List[str]) -> int:
+    """Headless manager commands for bulk config import and export"""
+    parser = argparse.ArgumentParser(
+        prog="manager.py",
+        description="Import and export monitor task configs without the menu",
+    )
+    parser.add_argument(
+        "--store", default="configs.db", help="config store (default: configs.db)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser(
+        "import", help="add or replace tasks from a CSV, JSONL or YAML file"
+    )
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    importer.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    exporter = commands.add_parser(
+        "export", help="write every task to a CSV, JSONL or YAML file"
+    )
+    exporter.add_argument("path")
+    exporter.add_argument("--format", choices=sorted(set(FORMATS.values())))
+
+    args = parser.parse_args(argv)
+    try:
+        fmt = detect_format(args.path, args.format)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    store = ConfigStore(args.store)
+    try:
+        start = time.perf_counter()
+        if args.command == "import":
+            imported, errors = import_records(
+                store, read_records(args.path, fmt), args.batch_size
+            )
+            for error in errors:
+                print(error, file=sys.stderr)
+            print(
+                f"Imported {imported} tasks from {args.path} in {time.perf_counter() - start:.2f}s, "
+                f"{len(errors)} records rejected"
+            )
+            return 1 if errors else 0
+
+        count = write_records(args.path, fmt, export_records(store))
+        print(
+            f"Exported {count} tasks to {args.path} in {time.perf_counter() - start:.2f}s"
+        )
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"{args.command.capitalize()} failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
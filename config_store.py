@@ -0,0 +1,280 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# Version of the store's schema, kept in the database's user_version
+SCHEMA_VERSION = 1
+
+# Params naming what a task checks, in order of preference, indexed as the task's target
+TARGET_PARAMS = ("host", "url", "server", "targets")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS monitors (
+    monitor_id TEXT PRIMARY KEY,
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    monitor_id TEXT NOT NULL REFERENCES monitors (monitor_id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    target TEXT,
+    params TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_monitor ON tasks (monitor_id);
+CREATE INDEX IF NOT EXISTS tasks_by_type ON tasks (type);
+CREATE INDEX IF NOT EXISTS tasks_by_target ON tasks (target);
+"""
+
+
+def new_task_id(service: str) -> str:
+    """Generate a unique id for a task of the given service"""
+    return f"{service.lower()}-{uuid.uuid4().hex[:12]}"
+
+
+def migrate_configs(configs: dict) -> bool:
+    """Re-key services keyed by service name by generated task id, recording the service as the type; returns whether anything changed"""
+    migrated = False
+    for config in configs.values():
+        services = {}
+        for key, params in config["Services"].items():
+            if "type" in params:
+                services[key] = params
+            else:
+                services[new_task_id(key)] = {"type": key, **params}
+                migrated = True
+        config["Services"] = services
+    return migrated
+
+
+def task_target(params: dict) -> Optional[str]:
+    """The host, URL or server a task checks, if its params name one"""
+    for name in TARGET_PARAMS:
+        if params.get(name) not in (None, ""):
+            return str(params[name])
+    return None
+
+
+class ConfigStore:
+    """
+    Indexed store of monitor service configs, kept in an SQLite database in WAL mode.
+
+    Each monitor and each of its tasks is a row, so a config is created, replaced or deleted with a few row
+    writes in one transaction instead of rewriting every config, and a crash part way through leaves the
+    previous state intact. Tasks are indexed by monitor, type and target. Configs are returned in the same
+    shape configs.json used: {"IP": ..., "Port": ..., "Services": {task id: params}}. When the database is
+    first created, the configs in legacy_path (if it exists) are migrated into it in the same transaction.
+    """
+
+    def __init__(
+        self, path: str = "configs.db", legacy_path: Optional[str] = "configs.json"
+    ):
+        self._path: str = path
+
+        # One connection, shared by the menu, signal handlers and the client fleet, in autocommit mode so
+        # transactions are only those begun explicitly
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._lock: threading.RLock = threading.RLock()
+
+        with self.transaction() as cursor:
+            if cursor.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._create_schema(cursor)
+                if legacy_path and os.path.exists(legacy_path):
+                    self._migrate_json(cursor, legacy_path)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM monitors").fetchone()[
+                0
+            ]
+
+    def __contains__(self, monitor_id: str) -> bool:
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT 1 FROM monitors WHERE monitor_id = ?", (monitor_id,)
+                ).fetchone()
+                is not None
+            )
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run the statements of a with block in one write transaction, rolled back if the block raises"""
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def get(self, monitor_id: str) -> Optional[dict]:
+        """The config of a monitor, or None if it has none"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT ip, port FROM monitors WHERE monitor_id = ?", (monitor_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return {
+                "IP": row[0],
+                "Port": row[1],
+                "Services": self._services(monitor_id),
+            }
+
+    def monitors(self) -> List[Tuple[str, str, int]]:
+        """(monitor id, IP, port) of every monitor, without loading their tasks"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT monitor_id, ip, port FROM monitors ORDER BY monitor_id"
+            ).fetchall()
+
+    def configs(self) -> Iterator[Tuple[str, dict]]:
+        """Yield (monitor id, config) for every monitor"""
+        for monitor_id, _, _ in self.monitors():
+            config = self.get(monitor_id)
+            if config is not None:
+                yield monitor_id, config
+
+    def find_tasks(
+        self,
+        monitor_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        target: Optional[str] = None,
+    ) -> List[Tuple[str, str, dict]]:
+        """(monitor id, task id, params) of every task matching all the given filters"""
+        clauses, values = [], []
+        for column, value in (
+            ("monitor_id", monitor_id),
+            ("type", task_type),
+            ("target", target),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            return [
+                (row[0], row[1], json.loads(row[2]))
+                for row in self._connection.execute(
+                    f"SELECT monitor_id, task_id, params FROM tasks {where} ORDER BY monitor_id, task_id",
+                    values,
+                )
+            ]
+
+    def put(
+        self, monitor_id: str, config: dict, cursor: Optional[sqlite3.Cursor] = None
+    ) -> None:
+        """Create or replace a monitor's config, all its tasks included, atomically"""
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.put(monitor_id, config, cursor)
+
+        self.put_monitor(monitor_id, config["IP"], config["Port"], cursor)
+        cursor.execute("DELETE FROM tasks WHERE monitor_id = ?", (monitor_id,))
+        self.put_tasks(monitor_id, config["Services"], cursor)
+
+    def put_monitor(
+        self,
+        monitor_id: str,
+        ip: str,
+        port: int,
+        cursor: Optional[sqlite3.Cursor] = None,
+    ) -> None:
+        """Create a monitor or change its address, leaving its tasks as they are"""
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.put_monitor(monitor_id, ip, port, cursor)
+
+        cursor.execute(
+            "INSERT INTO monitors (monitor_id, ip, port) VALUES (?, ?, ?) "
+            "ON CONFLICT (monitor_id) DO UPDATE SET ip = excluded.ip, port = excluded.port",
+            (monitor_id, ip, port),
+        )
+
+    def put_tasks(
+        self, monitor_id: str, services: dict, cursor: Optional[sqlite3.Cursor] = None
+    ) -> None:
+        """Create or replace some of a monitor's tasks, leaving its others as they are"""
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.put_tasks(monitor_id, services, cursor)
+
+        cursor.executemany(
+            "INSERT INTO tasks (task_id, monitor_id, type, target, params) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (task_id) DO UPDATE SET monitor_id = excluded.monitor_id, type = excluded.type, "
+            "target = excluded.target, params = excluded.params",
+            [
+                (
+                    task_id,
+                    monitor_id,
+                    params["type"],
+                    task_target(params),
+                    json.dumps(params),
+                )
+                for task_id, params in services.items()
+            ],
+        )
+
+    def delete(self, monitor_id: str) -> bool:
+        """Delete a monitor's config and tasks, returning whether it existed"""
+        with self.transaction() as cursor:
+            return (
+                cursor.execute(
+                    "DELETE FROM monitors WHERE monitor_id = ?", (monitor_id,)
+                ).rowcount
+                > 0
+            )
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete one task, returning whether it existed"""
+        with self.transaction() as cursor:
+            return (
+                cursor.execute(
+                    "DELETE FROM tasks WHERE task_id = ?", (task_id,)
+                ).rowcount
+                > 0
+            )
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._connection.close()
+
+    def _services(self, monitor_id: str) -> dict:
+        """Params of a monitor's tasks, keyed by task id"""
+        return {
+            task_id: json.loads(params)
+            for task_id, params in self._connection.execute(
+                "SELECT task_id, params FROM tasks WHERE monitor_id = ? ORDER BY rowid",
+                (monitor_id,),
+            )
+        }
+
+    def _create_schema(self, cursor: sqlite3.Cursor) -> None:
+        """Create the tables and indexes, statement by statement so they stay in the open transaction"""
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                cursor.execute(statement)
+
+    def _migrate_json(self, cursor: sqlite3.Cursor, path: str) -> None:
+        """Import every config of a configs.json file, re-keying legacy services by task id"""
+        with open(path, "r") as file:
+            configs = json.loads(file.read())
+        migrate_configs(configs)
+        for monitor_id, config in configs.items():
+            self.put(monitor_id, config, cursor)
+        print(f"Migrated {len(configs)} monitor configs from {path} to {self._path}")
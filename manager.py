@@ -1,6 +1,8 @@
-import json
+import asyncio
+import concurrent.futures
+import copy
 import os
-import pickle
+import random
 import shutil
 import signal
 import socket
@@ -9,21 +11,42 @@ import threading
 import time
 from typing import Any
 
+import config_io
+from config_store import ConfigStore, new_task_id
 from prompts import *
+from protocol import (
+    HEARTBEAT_INTERVAL,
+    FrameReader,
+    FrameType,
+    ProtocolError,
+    decode_result,
+    encode_frame,
+)
+from results import render_text, unpack_result
 
-client_shutdown_flag = False
+# Results processed before the manager acknowledges them to a monitor with a CURSOR frame
+ACK_BATCH_SIZE = 64
+
+# Seconds after which processed results are acknowledged even if the batch isn't full
+ACK_INTERVAL = 5
+
+# Monitors whose connection and handshake may be in progress at once
+MAX_CONCURRENT_HANDSHAKES = 64
+
+# Reconnection backoff: the first retry waits up to BACKOFF_BASE seconds, doubling per failure up to BACKOFF_MAX
+BACKOFF_BASE = 1
+BACKOFF_MAX = 60
 
 
 class Manager:
     def __init__(self):
 
-        # Monitor service configurations
+        # Monitor service configurations, and configs being created until they are saved to the store
+        self._store: ConfigStore = ConfigStore()
         self._configs: dict = {}
-        self.read_config()
 
-        # Threading
-        self._clients: dict = {}
-        self._lock: threading.Lock = threading.Lock()
+        # Control client sessions, all on one event loop
+        self._fleet: ClientFleet = ClientFleet()
 
     def start_manager(self):
         while True:
@@ -59,49 +82,39 @@ class Manager:
                 break
 
     def client_shutdown_handler(self, signum: int, frame: Any) -> None:
-        """Kill threads and restart application"""
-        global client_shutdown_flag
-        client_shutdown_flag = True
+        """Stop client sessions and restart application"""
         print("\nInterrupt detected!")
 
-        # Close sockets and kill client threads
-        for monitor_id, client in self._clients.items():
-
-            # Kill threads
-            print(f"Killing {monitor_id} client thread ...")
-            client.join()
-
-            # Send command to quit
-            print(f"Telling monitor {monitor_id} to stop tasks ...")
-            client.send_command("QUIT")
-
-            # Close sockets
-            print(f"\nClosing {monitor_id} client socket ...")
-            client.close()
-
-        # Reset flag
-        client_shutdown_flag = False
+        # Tell monitors to stop tasks, close sockets and stop the event loop
+        print(f"Stopping {len(self._fleet)} client sessions ...")
+        self._fleet.stop()
+        self._fleet = ClientFleet()
 
         # Restart menu
         print("Returning to main menu ...\n")
         time.sleep(4)
         self.start_manager()
 
+    def reload_configs(self, signum: int = None, frame: Any = None) -> None:
+        """Re-read the configs of running monitors from the store and push any changes without restarting their tasks"""
+        print("\nReloading configs ...")
+        for monitor_id in self._fleet.monitor_ids():
+            config = self._store.get(monitor_id)
+            services = config["Services"] if config else {}
+            self._fleet.update(monitor_id, services)
+
     def load_monitor(self):
         """Starts control client for a chosen monitor service"""
         # Get user's choice
         monitor_id, host, port, services = monitor_choice_prompt(
-            "Which monitor service would you like to load? [TAB]: ", self._configs
+            "Which monitor service would you like to load? [TAB]: ", self._store
         )
 
         # Return message
         print("\nPRESS CTRL+C TO STOP AND RETURN TO MENU")
 
         # Start control client
-        self._clients[monitor_id] = ControlClient(
-            monitor_id, host, port, services, self._lock
-        )
-        self._clients[monitor_id].start()
+        self._fleet.add(monitor_id, host, port, services)
 
     def load_all_monitors(self):
         """Starts control client for all monitor services"""
@@ -109,24 +122,9 @@ class Manager:
         print("\nPRESS CTRL+C TO STOP AND RETURN TO MENU")
 
         # Loop through and start up clients
-        for monitor_id, config in self._configs.items():
+        for monitor_id, config in self._store.configs():
             host, port, services = config["IP"], config["Port"], config["Services"]
-            self._clients[monitor_id] = ControlClient(
-                monitor_id, host, port, services, self._lock
-            )
-            self._clients[monitor_id].start()
-
-    def read_config(self):
-        """Updates self._configs with current config file"""
-        # Get configs from json file
-        with open("configs.json", "r") as file:
-            self._configs = json.loads(file.read())
-
-    def write_config(self):
-        """Updates config file to reflect current state of self._configs"""
-        # Persist server dict to JSON file
-        with open("configs.json", "w") as file:
-            file.write(json.dumps(self._configs))
+            self._fleet.add(monitor_id, host, port, services)
 
     def create_config(self):
         """Creates new monitor service config based on user input and saves it"""
@@ -137,31 +135,29 @@ class Manager:
             return
         print("")
 
-        # Get set of services from user
+        # Get list of services from user, any number of each
         services = self.set_services(monitor_id)
         print("")
 
-        # Get params
-        for service in services.keys():
-            self.set_service_params(service, monitor_id)
+        # Get params of each, as a task with its own id
+        for service in services:
+            self.set_service_params(service, monitor_id, new_task_id(service))
             print("")
 
-        # Persist to configs.json
-        self.write_config()
+        # Save to the store in one transaction
+        config = self._configs.pop(monitor_id)
+        self._store.put(monitor_id, config)
         print("Successfully added config: ")
-        print(self._configs[monitor_id])
+        print(config)
         print("")
 
     def delete_config(self):
         """Deletes monitor service config based on user input and updates config file"""
         # Ask user which one to delete and delete it
         monitor_id = monitor_choice_prompt(
-            "Which monitor would you like to delete? [TAB]: ", self._configs
+            "Which monitor would you like to delete? [TAB]: ", self._store
         )[0]
-        del self._configs[monitor_id]
-
-        # Persist to configs.json
-        self.write_config()
+        self._store.delete(monitor_id)
         print(f"Config for monitor at {monitor_id} deleted!\n")
 
     def set_monitor_service(self):
@@ -172,7 +168,7 @@ class Manager:
         monitor_id = f"{monitor_ip}:{monitor_port}"
 
         # Ensure user wants to overwrite existing monitor
-        if monitor_id in self._configs:
+        if monitor_id in self._store:
             choice = input(
                 "Monitor already exists. Are you sure you want to overwrite it? [Y/N]: "
             )
@@ -188,37 +184,48 @@ class Manager:
         return monitor_id
 
     def set_services(self, monitor_id):
-        """Gets services to set up for a given monitor service"""
+        """Gets services to set up for a given monitor service, which may repeat"""
+        services = []
         while (
             service := service_prompt(
                 "Enter a service or press enter when finished [TAB]: "
             )
         ) != "":
-            self._configs[monitor_id]["Services"][service] = {}
-        return self._configs[monitor_id]["Services"]
+            services.append(service)
+        return services
 
-    def set_service_params(self, service, monitor_id):
-        """Calls method for given service to get parameters for given monitor service"""
+    def set_service_params(self, service, monitor_id, task_id):
+        """Calls method for given service to get parameters for a task of given monitor service"""
         if service == "Ping":
-            self.set_ping_params(monitor_id)
+            self.set_ping_params(monitor_id, task_id)
         elif service == "Tracert":
-            self.set_tracert_params(monitor_id)
+            self.set_tracert_params(monitor_id, task_id)
         elif service == "HTTP":
-            self.set_http_params(monitor_id)
+            self.set_http_params(monitor_id, task_id)
         elif service == "HTTPS":
-            self.set_https_params(monitor_id)
+            self.set_https_params(monitor_id, task_id)
         elif service == "NTP":
-            self.set_ntp_params(monitor_id)
+            self.set_ntp_params(monitor_id, task_id)
         elif service == "DNS":
-            self.set_dns_params(monitor_id)
+            self.set_dns_params(monitor_id, task_id)
         elif service == "TCP":
-            self.set_tcp_params(monitor_id)
+            self.set_tcp_params(monitor_id, task_id)
         elif service == "UDP":
-            self.set_udp_params(monitor_id)
+            self.set_udp_params(monitor_id, task_id)
         elif service == "Echo":
-            self.set_echo_params(monitor_id)
+            self.set_echo_params(monitor_id, task_id)
+        elif service == "Sweep":
+            self.set_sweep_params(monitor_id, task_id)
+
+        # Hold the entered params to the same rules as imported ones
+        services = self._configs[monitor_id]["Services"]
+        try:
+            services[task_id] = config_io.validate_params(services[task_id])
+        except ValueError as e:
+            del services[task_id]
+            print(f"Invalid {service} task not added: {e}")
 
-    def set_ping_params(self, monitor_id):
+    def set_ping_params(self, monitor_id, task_id):
         """Gets service params from a user for a ping task and sets the results to self._configs"""
         # Get params
         print("Enter ping params (press enter for defaults): ")
@@ -231,7 +238,8 @@ class Manager:
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["Ping"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "Ping",
             "host": host,
             "ttl": ttl,
             "timeout": timeout,
@@ -239,7 +247,7 @@ class Manager:
             "frequency": frequency,
         }
 
-    def set_tracert_params(self, monitor_id):
+    def set_tracert_params(self, monitor_id, task_id):
         """Gets service params from a user for a tracert task and sets the results to self._configs"""
         # Get params
         print("Enter tracert params (press enter for defaults): ")
@@ -251,61 +259,86 @@ class Manager:
         verbose = (
             input("\tEnter verbosity preference (Default = False): ").strip() or False
         )
+        parallel = (
+            input("\tProbe all hops in parallel? [Y/N] (Default = N): ").strip().lower()
+            == "y"
+        )
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["Tracert"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "Tracert",
             "host": host,
             "max_hops": max_hops,
             "pings_per_hop": pings_per_hop,
             "verbose": verbose,
+            "parallel": parallel,
             "frequency": frequency,
         }
 
-    def set_http_params(self, monitor_id):
+    def set_http_params(self, monitor_id, task_id):
         """Gets service params from a user for an http task and sets the results to self._configs"""
         # Get params
         print("Enter http params (press enter for defaults): ")
         url = input("\tEnter url: http://")
         url = f"http://{url}"
+        timeout = int(input("\tEnter timeout (Default = 10): ").strip() or "10")
+        mode = (
+            input("\tEnter check mode [get/head/stream] (Default = stream): ")
+            .strip()
+            .lower()
+            or "stream"
+        )
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["HTTP"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "HTTP",
             "url": url,
+            "timeout": timeout,
+            "mode": mode,
             "frequency": frequency,
         }
 
-    def set_https_params(self, monitor_id):
+    def set_https_params(self, monitor_id, task_id):
         """Gets service params from a user for an https task and sets the results to self._configs"""
         # Get params
         print("Enter https params (press enter for defaults): ")
         url = input("\tEnter url: https://")
         url = f"https://{url}"
-        timeout = int(input("\tEnter timeout (Default = 5): "))
+        timeout = int(input("\tEnter timeout (Default = 5): ").strip() or "5")
+        mode = (
+            input("\tEnter check mode [get/head/stream] (Default = stream): ")
+            .strip()
+            .lower()
+            or "stream"
+        )
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["HTTPS"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "HTTPS",
             "url": url,
             "timeout": timeout,
+            "mode": mode,
             "frequency": frequency,
         }
 
-    def set_ntp_params(self, monitor_id):
+    def set_ntp_params(self, monitor_id, task_id):
         """Gets service params from a user for an ntp task and sets the results to self._configs"""
         # Get params
         print("Enter ntp params (press enter for defaults): ")
-        server = input("\tEnter ntp server: ")
+        server = input("\tEnter ntp server (several may be separated by commas): ")
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["NTP"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "NTP",
             "server": server,
             "frequency": frequency,
         }
 
-    def set_dns_params(self, monitor_id):
+    def set_dns_params(self, monitor_id, task_id):
         """Gets service params from a user for a dns task and sets the results to self._configs"""
         # Get params
         print("Enter dns params (press enter for defaults): ")
@@ -316,20 +349,20 @@ class Manager:
             record_type := record_type_prompt(
                 "Enter a record type or press enter when finished [TAB]: "
             )
-            != ""
-        ):
+        ) != "":
             record_types.append(record_type)
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["DNS"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "DNS",
             "server": server,
             "query": query,
             "record_types": record_types,
             "frequency": frequency,
         }
 
-    def set_tcp_params(self, monitor_id):
+    def set_tcp_params(self, monitor_id, task_id):
         """Gets service params from a user for a tcp task and sets the results to self._configs"""
         # Get params
         print("Enter tcp params (press enter for defaults): ")
@@ -338,13 +371,14 @@ class Manager:
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["TCP"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "TCP",
             "server": server,
             "port": port,
             "frequency": frequency,
         }
 
-    def set_udp_params(self, monitor_id):
+    def set_udp_params(self, monitor_id, task_id):
         """Gets service params from a user for a udp task and sets the results to self._configs"""
         # Get params
         print("Enter udp params (press enter for defaults): ")
@@ -354,14 +388,15 @@ class Manager:
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["UDP"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "UDP",
             "server": server,
             "port": port,
             "timeout": timeout,
             "frequency": frequency,
         }
 
-    def set_echo_params(self, monitor_id):
+    def set_echo_params(self, monitor_id, task_id):
         """Gets service params from a user for an echo task and sets the results to self._configs"""
         # Get params
         print("Enter echo params (press enter for defaults): ")
@@ -370,212 +405,584 @@ class Manager:
         frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
 
         # Set in config
-        self._configs[monitor_id]["Services"]["Echo"] = {
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "Echo",
             "server": server,
             "port": port,
             "frequency": frequency,
         }
 
+    def set_sweep_params(self, monitor_id, task_id):
+        """Gets service params from a user for a ping sweep task and sets the results to self._configs"""
+        # Get params
+        print("Enter ping sweep params (press enter for defaults): ")
+        targets = input("\tEnter CIDR block or comma-separated hosts: ")
+        timeout = int(input("\tEnter timeout (Default = 1): ").strip() or "1")
+        count = int(input("\tEnter pings per host (Default = 1): ").strip() or "1")
+        frequency = int(input("\tEnter frequency (Default = 60): ").strip() or "60")
+
+        # Set in config
+        self._configs[monitor_id]["Services"][task_id] = {
+            "type": "Sweep",
+            "targets": targets,
+            "timeout": timeout,
+            "count": count,
+            "frequency": frequency,
+        }
+
     def display_configs(self):
         """Displays current task configurations"""
-        for monitor_id, config in self._configs.items():
+        for monitor_id, config in self._store.configs():
             print(f"\nMonitor {monitor_id}:")
             columns, lines = shutil.get_terminal_size()
             print("=" * columns)
             print(f"IP: {config['IP']}")
             print(f"Port: {config['Port']}")
             print("Services: ")
-            for service, params in config["Services"].items():
-                print(f"  {service}: {params}")
+            for task_id, params in config["Services"].items():
+                print(f"  {task_id} ({params['type']}): {params}")
         print("")
 
     def get_config(self):
-        """Returns self._configs"""
-        return self._configs
+        """Returns the config store"""
+        return self._store
+
+
+def diff_services(old: dict, new: dict) -> dict:
+    """Returns the tasks to add, remove and update to go from one task config to another"""
+    diff = {
+        "add": {task: params for task, params in new.items() if task not in old},
+        "remove": [task for task in old if task not in new],
+        "update": {
+            task: params
+            for task, params in new.items()
+            if task in old and old[task] != params
+        },
+    }
+    return {change: tasks for change, tasks in diff.items() if tasks}
+
+
+class ClientFleet:
+    """
+    Runs the control client sessions of every monitor service on one asyncio event loop in a background thread.
+
+    Each session is a small state machine driven by the frames its monitor sends, so the manager needs no thread
+    per monitor and the per-connection footprint is the session object, its frame reader's partial frame and
+    the transport's buffers. Handshakes run concurrently across monitors, at most max_handshakes at a time.
+    """
+
+    def __init__(self, max_handshakes: int = MAX_CONCURRENT_HANDSHAKES):
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._loop.run_forever, name="client-fleet"
+        )
+        self._clients: dict = {}
 
+        # Slots for connections and handshakes in progress
+        self._handshakes: asyncio.Semaphore = asyncio.Semaphore(max_handshakes)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def add(
+        self, monitor_id: str, monitor_host: str, monitor_port: int, services: dict
+    ):
+        """Start a control client session for a monitor service, starting the loop thread on first use"""
+        client = ControlClient(
+            monitor_id, monitor_host, monitor_port, services, self._handshakes
+        )
+        self._clients[monitor_id] = client
+        if not self._thread.is_alive():
+            self._thread.start()
+        self._loop.call_soon_threadsafe(client.start, self._loop)
+
+    def stop(self, timeout: float = 10):
+        """Tell every monitor service to stop its tasks, close every session, then stop the loop"""
+        if self._thread.is_alive():
+            try:
+                asyncio.run_coroutine_threadsafe(self._quit_all(), self._loop).result(
+                    timeout
+                )
+            except concurrent.futures.TimeoutError:
+                print("Timed out waiting for monitor services to stop their tasks!")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+        self._clients = {}
+
+    def monitor_ids(self) -> list:
+        """IDs of the monitors with a session"""
+        return list(self._clients)
+
+    def update(self, monitor_id: str, services: dict):
+        """Give a monitor's session a new task config, which it sends as a diff once streaming"""
+        client = self._clients.get(monitor_id)
+        if client is not None:
+            self._loop.call_soon_threadsafe(
+                client.update_services, copy.deepcopy(services)
+            )
+
+    async def _quit_all(self):
+        """Quit every session concurrently"""
+        await asyncio.gather(*(client.quit() for client in self._clients.values()))
+
+
+class ControlClient(asyncio.Protocol):
+    """
+    Control client session with one monitor service, run on the fleet's event loop.
+
+    The session moves through the states connect -> SET_ID -> START (-> CONFIG -> READY) -> stream, advancing as each
+    command is acknowledged, and goes back to connecting whenever the connection is lost. Results and drain
+    progress are handled in any state, since they can arrive ahead of an acknowledgement. A handshake slot from
+    the fleet is held from connecting until streaming starts, and failed attempts are retried with exponential
+    backoff and full jitter so monitors coming back together don't all reconnect at once.
+    """
+
+    __slots__ = (
+        "_monitor_id",
+        "_monitor_host",
+        "_monitor_port",
+        "_services",
+        "_applied",
+        "_pending_update",
+        "_loop",
+        "_transport",
+        "_reader",
+        "_handshakes",
+        "_handshake_slot",
+        "_attempts",
+        "_state",
+        "_timer",
+        "_heartbeat",
+        "_awaiting_heartbeat",
+        "_received",
+        "_stopping",
+        "_quit_ack",
+        "_last_seq",
+        "_acked_seq",
+        "_last_ack",
+        "_duplicates",
+        "_drain_until",
+        "_live_seq",
+    )
 
-class ControlClient(threading.Thread):
     def __init__(
         self,
         monitor_id: str,
         monitor_host: str,
         monitor_port: int,
         services: dict,
-        lock: threading.Lock,
+        handshakes: asyncio.Semaphore,
     ):
-        super().__init__()
-
         # Set params
         self._monitor_id: str = monitor_id
         self._monitor_host: str = monitor_host
         self._monitor_port: int = monitor_port
         self._services: dict = services
 
-        # Socket
-        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Task config the monitor is known to be running, and an update awaiting acknowledgement
+        self._applied: dict | None = None
+        self._pending_update: dict | None = None
+
+        # Connection
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._transport: asyncio.Transport | None = None
+        self._reader: FrameReader = FrameReader()
+
+        # Handshake concurrency and reconnection backoff
+        self._handshakes: asyncio.Semaphore = handshakes
+        self._handshake_slot: bool = False
+        self._attempts: int = 0
+
+        # State machine
+        self._state: str = "idle"
+        self._timer: asyncio.TimerHandle | None = None
+        self._stopping: bool = False
+        self._quit_ack: asyncio.Future | None = None
+
+        # Liveness: heartbeat timer and whether anything arrived since it last fired
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._awaiting_heartbeat: bool = False
+        self._received: bool = False
+
+        # Delivery: highest result sequence number processed and acknowledged, kept across reconnections
+        self._last_seq: int = 0
+        self._acked_seq: int = 0
+        self._last_ack: float = time.monotonic()
+        self._duplicates: int = 0
+
+        # Drain of the monitor's backlog: live results from drain_until on arrive alongside it
+        self._drain_until: int | None = None
+        self._live_seq: int = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start the session on the event loop"""
+        self._loop = loop
+        self.connect()
 
-        # Threading
-        self._lock: threading.Lock = lock
+    def connect(self):
+        """Connect to monitor service, retrying until it succeeds"""
+        if self._stopping:
+            return
+        self._state = "connecting"
+        print(
+            f"\nAttempting to connect to monitor service at {self._monitor_host}:{self._monitor_port} ..."
+        )
+        self._loop.create_task(self._connect())
+
+    async def _connect(self):
+        """Wait for a handshake slot, then open the connection, with this session as its protocol"""
+        await self._handshakes.acquire()
+        self._handshake_slot = True
+        if self._stopping:
+            self._release_handshake()
+            return
+        try:
+            await self._loop.create_connection(
+                lambda: self, self._monitor_host, self._monitor_port
+            )
+        except OSError:
+            self._release_handshake()
+            delay = self._backoff()
+            print(
+                f"Connection to monitor service at {self._monitor_host}:{self._monitor_port} failed! Trying again in {delay:.1f}s!"
+            )
+            self._later(delay, self.connect)
 
-    def run(self):
-        """Start up socket and handle client behavior"""
-        global client_shutdown_flag
-        while not client_shutdown_flag:
-            try:
-                # Connect to monitor service
-                self.connect()
-                time.sleep(2)
+    def connection_made(self, transport: asyncio.Transport):
+        """Connected: enable keepalive and move on to setting the monitor's id"""
+        if self._stopping:
+            transport.close()
+            return
+        self._transport = transport
+        self._reader = FrameReader()
+        self._awaiting_heartbeat = False
 
-                # Send id to monitor service to set
-                self.set_id()
-                time.sleep(2)
+        # Enable keepalive behavior to receive messages for detecting dead connections
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
 
-                # Distribute tasks to monitor service
-                self.distribute_tasks()
-                time.sleep(2)
+        print(
+            f"Successfully connected to monitor service at {self._monitor_host}:{self._monitor_port}"
+        )
+        self._heartbeat = self._loop.call_later(
+            HEARTBEAT_INTERVAL, self.check_heartbeat
+        )
+        self.set_id()
+
+    def connection_lost(self, exc: Exception | None):
+        """Connection closed or broken: reconnect unless the session is stopping"""
+        self._transport = None
+        self._cancel_timers()
+        self._release_handshake()
+        if self._quit_ack is not None and not self._quit_ack.done():
+            self._quit_ack.set_result(None)
+        if self._stopping:
+            return
 
-                # Monitor status until keyboard interrupt
-                self.monitor_status()
+        delay = self._backoff()
+        print(
+            f"Error with connection to monitor service at {self._monitor_host}:{self._monitor_port} ... trying to reconnect in {delay:.1f}s!"
+        )
+        self._later(delay, self.connect)
 
-            except socket.error:
-                print(
-                    f"Error with connection to monitor service at {self._monitor_host}:{self._monitor_port} ... trying to reconnect!"
-                )
-                self._socket.close()
-                time.sleep(10)
+    def data_received(self, data: bytes):
+        """Parse received frames and advance the state machine"""
+        self._received = True
+        self._awaiting_heartbeat = False
+        try:
+            for frame_type, payload in self._reader.feed(data):
+                if frame_type == FrameType.ACK:
+                    self.handle_ack(payload)
+                elif frame_type != FrameType.HEARTBEAT:
+                    text = self.handle_frame(frame_type, payload)
+                    if text is not None:
+                        print(text)
+        except ProtocolError as e:
+            print(f"Protocol error from monitor service {self._monitor_id}: {e}")
+            self._transport.abort()
+            return
 
-    def connect(self):
-        """Connect to monitor service"""
+        # Acknowledge processed results in batches
+        self.acknowledge()
 
-        # Create new socket
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    def send_command(self, command: FrameType, payload: Any = None):
+        """Send a command frame to the monitor service"""
+        print(f"\nSending {command.name} command to monitor service {self._monitor_id}")
+        self.send(command, payload)
 
-        # Enable keepalive behavior to receive messages for detecting dead connections
-        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    def send(self, frame_type: FrameType, payload: Any = None):
+        """Queue a frame on the transport, if connected"""
+        if self._transport is not None and not self._transport.is_closing():
+            self._transport.write(encode_frame(frame_type, payload))
 
-        global client_shutdown_flag
-        while not client_shutdown_flag:
-            self._lock.acquire()
-            try:
-                print(
-                    f"\nAttempting to connect to monitor service at {self._monitor_host}:{self._monitor_port} ..."
+    def set_id(self):
+        """Send monitor service an ID"""
+        self._state = "set_id"
+        print(f"Sending ID to monitor service {self._monitor_id}")
+        self.send_command(FrameType.SET_ID, self._monitor_id)
+
+    def distribute_tasks(self):
+        """Send the start command to prepare monitor for config"""
+        self._state = "start"
+        self.send_command(FrameType.START)
+
+    def handle_ack(self, response: Any):
+        """Advance the state machine on an acknowledgement"""
+        if self._state == "set_id":
+            print(f"ID acknowledged by monitor {self._monitor_id}: {response}")
+            self.distribute_tasks()
+
+        elif self._state == "start":
+            print(
+                f"Command to monitor service {self._monitor_id} acknowledged: {response}"
+            )
+
+            # If response is awaiting tasks, send config; otherwise the monitor is already running them
+            if response == "awaiting tasks ...":
+                print(f"Sending task configs to monitor service {self._monitor_id}")
+                self.send(FrameType.CONFIG, self._services)
+                self._state = "config"
+            else:
+                # The monitor lists the tasks it runs, which may predate this manager, so changes are diffed
+                # against them
+                if not isinstance(response, dict) or "reconnecting" not in response:
+                    raise ProtocolError(
+                        f"Expected the monitor's running tasks, got {response!r}"
+                    )
+                self._applied = response["reconnecting"]
+                self.stream()
+
+        elif self._state == "config":
+            # The whole config is confirmed in one reply with the status of each task
+            if not isinstance(response, dict) or "configured" not in response:
+                raise ProtocolError(
+                    f"Expected the task config to be acknowledged, got {response!r}"
                 )
-                self._socket.connect((self._monitor_host, self._monitor_port))
+            for i, (task, status) in enumerate(response["configured"].items(), start=1):
                 print(
-                    f"Successfully connected to monitor service at {self._monitor_host}:{self._monitor_port}"
+                    f"\nTask {i} received by monitor {self._monitor_id}: {task} - {status['status']}"
                 )
-                self._lock.release()
-                break
+                if status["status"] == "ok":
+                    print(
+                        f"Type: {status['type']}, params: {status['params']}, frequency: {status['frequency']}"
+                    )
+                else:
+                    print(f"Error: {status['error']}")
 
-            except socket.error:
-                print(
-                    f"Connection to monitor service at {self._monitor_host}:{self._monitor_port} failed! Trying again!"
-                )
-                self._lock.release()
-                time.sleep(15)
+            # Signal readiness so the monitor starts its tasks
+            self._applied = copy.deepcopy(self._services)
+            self._state = "ready"
+            self.send_command(FrameType.READY)
 
-    def set_id(self):
-        """Send monitor service an ID"""
-        # Assign ID to monitor service
-        global client_shutdown_flag
-        if not client_shutdown_flag:
-            with self._lock:
-                try:
-                    # Send SET_ID command to start ID setting process
-                    response = self.send_command("SET_ID")
-                    if response == "awaiting ID ...":
-
-                        # Send ID to monitor service
-                        print(f"Sending ID to monitor service {self._monitor_id}")
-                        self._socket.send(self._monitor_id.encode("utf-8"))
-
-                        # Wait for acknowledgement of ID being set
-                        response = self._socket.recv(1024).decode("utf-8")
-                        print(
-                            f"ID acknowledged by monitor {self._monitor_id}: {response}"
-                        )
-
-                except socket.error as e:
-                    print(f"Socket error: {e}")
-
-    def close(self):
-        """Close connection with given monitor service"""
-        # Close socket connection with given id
-        self._socket.close()
-
-    def send_command(self, command):
-        """Send command over given monitor service"""
-        try:
-            # Send command
-            print(f"\nSending {command} command to monitor service {self._monitor_id}")
-            self._socket.sendall(command.encode())
+        elif self._state == "ready":
+            print(
+                f"\nTask start up at monitor service {self._monitor_id} acknowledged: {response}"
+            )
+            self.stream()
+
+        elif (
+            self._state == "stream"
+            and isinstance(response, dict)
+            and "updated" in response
+        ):
+            # Confirmation of each change in a config update
+            pending, self._pending_update = self._pending_update, None
+            if pending is None:
+                return
 
-            # Await acknowledgment
-            response = self._socket.recv(1024).decode("utf-8")
+            # Record only the changes the monitor confirmed, so failed ones stay in the next diff
+            applied: dict = dict(self._applied)
+            for task, status in response["updated"].items():
+                print(f"Task {task} at monitor {self._monitor_id}: {status['status']}")
+                if status["status"] == "error":
+                    print(f"Error: {status['error']}")
+                if task not in pending:
+                    # A remove only fails when the monitor has no such task, so either way it's gone
+                    applied.pop(task, None)
+                elif status["status"] != "error":
+                    applied[task] = copy.deepcopy(pending[task])
+            self._applied = applied
+
+            # Catch up with any change made while the update was in flight. Failed changes are resent with
+            # the next change or reconnection rather than straight away, which would repeat the same error
+            if self._services != pending:
+                self.sync_tasks()
+
+        elif self._state == "quit":
             print(
                 f"Command to monitor service {self._monitor_id} acknowledged: {response}"
             )
-            return response
-        except socket.error:
-            print(f"No connection to monitor {self._monitor_id}!")
+            if self._quit_ack is not None and not self._quit_ack.done():
+                self._quit_ack.set_result(response)
 
-    def distribute_tasks(self):
-        """Distribute defined tasks to monitors"""
-        global client_shutdown_flag
-        if not client_shutdown_flag:
-            with self._lock:
-                try:
-                    # Send the start command to prepare monitor for config
-                    response = self.send_command("START")
-
-                    # If response is awaiting tasks, send config
-                    if response == "awaiting tasks ...":
-
-                        # Create task config data and send
-                        task_configs = pickle.dumps(self._services)
-                        print(
-                            f"Sending task configs to monitor service {self._monitor_id}"
-                        )
-                        self._socket.sendall(task_configs)
-
-                        # Get confirmation each task was received
-                        for i, task in enumerate(self._services.keys(), start=1):
-                            received_task = self._socket.recv(1024).decode("utf-8")
-                            print(f"\nTask {i} received by monitor {self._monitor_id}:")
-                            print(f"{received_task}")
-                            print(f"Expected task:")
-                            print(f"{task}: {self._services[task]}")
-
-                        # Await confirmation of tasks
-                        response = self._socket.recv(1024).decode("utf-8")
-                        print(
-                            f"\nTask start up at monitor service {self._monitor_id} acknowledged: {response}"
-                        )
-
-                except socket.error as e:
-                    print(f"Socket error: {e}")
-
-    def monitor_status(self):
+    def stream(self):
         """Await results and status updates for given monitor service"""
-        # Await responses until error or condition
-        global client_shutdown_flag
-        try:
-            while not client_shutdown_flag:
-                response = self._socket.recv(1024).decode("utf-8")
-                if response:
-                    with self._lock:
-                        print(response)
-                else:
-                    break
+        self._state = "stream"
 
-        except socket.error:
-            print(
-                f"Connection to monitor service ${self._monitor_host, self._monitor_port} lost!"
+        # Handshake complete: free the slot for another monitor and reset the backoff
+        self._release_handshake()
+        self._attempts = 0
+
+        # Send any config change made while the session was away
+        self._pending_update = None
+        self.sync_tasks()
+
+    def update_services(self, services: dict):
+        """Take a new task config, sending it as a diff if the monitor is running tasks"""
+        self._services = services
+        if self._state == "stream":
+            self.sync_tasks()
+
+    def sync_tasks(self):
+        """Send the monitor an UPDATE with the difference between the config it runs and the current one"""
+        if self._applied is None or self._pending_update is not None:
+            return
+        diff = diff_services(self._applied, self._services)
+        if diff:
+            self._pending_update = copy.deepcopy(self._services)
+            self.send_command(FrameType.UPDATE, diff)
+
+    def check_heartbeat(self):
+        """Send a heartbeat after a silent interval; a second silent interval means the monitor is gone"""
+        if self._transport is None:
+            return
+        if not self._received:
+            if self._awaiting_heartbeat:
+                print(
+                    f"Connection to monitor service ${self._monitor_host, self._monitor_port} lost!"
+                )
+                self._transport.abort()
+                return
+            self.acknowledge(force=True)
+            self.send(FrameType.HEARTBEAT)
+            self._awaiting_heartbeat = True
+        self._received = False
+        self._heartbeat = self._loop.call_later(
+            HEARTBEAT_INTERVAL, self.check_heartbeat
+        )
+
+    async def quit(self, timeout: float = 5):
+        """Acknowledge everything processed, tell the monitor service to stop its tasks and close the session"""
+        self._stopping = True
+        self._cancel_timers()
+        if self._transport is None:
+            return
+
+        self.acknowledge(force=True)
+        print(f"Telling monitor {self._monitor_id} to stop tasks ...")
+        self._state = "quit"
+        self._quit_ack = self._loop.create_future()
+        self.send_command(FrameType.QUIT)
+        try:
+            await asyncio.wait_for(self._quit_ack, timeout)
+        except asyncio.TimeoutError:
+            print(f"No acknowledgement of QUIT from monitor {self._monitor_id}!")
+
+        # Close socket
+        print(f"\nClosing {self._monitor_id} client socket ...")
+        if self._transport is not None:
+            self._transport.close()
+
+    def handle_frame(self, frame_type: FrameType, payload: Any) -> str | None:
+        """Process a RESULT or DRAIN frame, returning the text to show for it, if any"""
+        if frame_type == FrameType.RESULT:
+            return self.handle_result(payload)
+        elif frame_type == FrameType.DRAIN:
+            return self.handle_drain(payload)
+
+    def handle_result(self, payload: bytes) -> str | None:
+        """Process a RESULT payload, returning its rendered text, or None if it is a duplicate"""
+        seq, result = decode_result(payload)
+
+        # Drained and live results each arrive in sequence order, so anything at or below the last one of its
+        # stream was replayed and already seen
+        if self._drain_until is not None and seq >= self._drain_until:
+            if seq <= self._live_seq:
+                self._duplicates += 1
+                return None
+            self._live_seq = seq
+        else:
+            if seq <= self._last_seq:
+                self._duplicates += 1
+                return None
+            self._last_seq = seq
+        return render_text(unpack_result(result))
+
+    def handle_drain(self, progress: dict) -> str | None:
+        """Track the monitor's backlog drain, returning a progress message"""
+        state = progress["state"]
+        if state == "start":
+            # A log that restarted below what was processed means the monitor lost its log
+            if progress["until"] - 1 < self._last_seq:
+                self._last_seq = progress["cursor"]
+                self._acked_seq = min(self._acked_seq, self._last_seq)
+            self._last_seq = max(self._last_seq, progress["cursor"])
+            self._drain_until = progress["until"]
+            self._live_seq = progress["until"] - 1
+            if progress["pending"]:
+                return f"[Monitor: {self._monitor_id}] Draining {progress['pending']} unacknowledged and saved results ..."
+
+        elif state == "progress":
+            return f"[Monitor: {self._monitor_id}] Draining results - sent: {progress['sent']}, pending: {progress['pending']}, {progress['behind']:.0f}s behind"
+
+        elif state == "done":
+            # Everything before the live results has now been processed
+            if self._drain_until is not None:
+                self._last_seq = max(self._last_seq, self._live_seq)
+                self._drain_until = None
+            if progress["sent"]:
+                return f"[Monitor: {self._monitor_id}] Drain complete - {progress['sent']} results sent, {self._duplicates} duplicates dropped"
+
+    def acknowledge(self, force: bool = False):
+        """Send the monitor a CURSOR frame for processed results once a batch is full, it is overdue, or forced"""
+        pending = self._last_seq - self._acked_seq
+        if (
+            self._transport is not None
+            and pending
+            and (
+                force
+                or pending >= ACK_BATCH_SIZE
+                or time.monotonic() - self._last_ack >= ACK_INTERVAL
             )
-            self._socket.close()
+        ):
+            self.send(FrameType.CURSOR, self._last_seq)
+            self._acked_seq = self._last_seq
+            self._last_ack = time.monotonic()
+
+    def _backoff(self) -> float:
+        """Delay before the next reconnection attempt: exponential in the failed attempts, with full jitter"""
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**self._attempts))
+        self._attempts += 1
+        return delay
+
+    def _release_handshake(self):
+        """Give back the handshake slot, if held"""
+        if self._handshake_slot:
+            self._handshake_slot = False
+            self._handshakes.release()
+
+    def _later(self, delay: float, callback):
+        """Run a step of the state machine after a delay"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_later(delay, callback)
+
+    def _cancel_timers(self):
+        """Cancel the pending step and heartbeat"""
+        for timer in (self._timer, self._heartbeat):
+            if timer is not None:
+                timer.cancel()
+        self._timer = None
+        self._heartbeat = None
 
 
 if __name__ == "__main__":
+    # Headless commands, such as bulk import and export, skip the menu
+    if len(sys.argv) > 1:
+        sys.exit(config_io.main(sys.argv[1:]))
+
     # Get terminal size
     columns, lines = shutil.get_terminal_size()
     print("")
@@ -609,4 +1016,6 @@ if __name__ == "__main__":
         os.system("cls") if sys.platform.startswith("win") else os.system("clear")
         manager = Manager()
         signal.signal(signal.SIGINT, manager.client_shutdown_handler)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, manager.reload_configs)
         manager.start_manager()
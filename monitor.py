@@ -1,5 +1,6 @@
+import asyncio
+import concurrent.futures
 import os
-import pickle
 import shutil
 import signal
 import socket
@@ -7,16 +8,53 @@ import sys
 import threading
 import time
 from datetime import datetime
-from typing import NoReturn, Any
-
-from service_checks import run_service_check
+from typing import Any
+
+from backlog import ResultBacklog
+from network_tests import (
+    close_http_session,
+    close_icmp_engine,
+    close_ntp_engine,
+    get_host_cache,
+)
+from protocol import (
+    FrameType,
+    FrameWriter,
+    ProtocolError,
+    decode_result,
+    encode_frame,
+    encode_result,
+    recv_frame,
+)
+from results import RESULT_HEADER, CheckResult, pack_result
+from scheduler import CheckScheduler, ScheduledCheck
+from service_checks import SERVICE_TASKS, run_service_check, run_service_check_async
+from wal import WriteAheadLog
 
 shutdown_flag = False
 
+# Number of saved results read from the backlog at a time when it is drained after a reconnect
+BACKLOG_BATCH_SIZE = 256
+
+# Bytes of replayed and saved results handed to the connection's writer per drain chunk
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+# Seconds between drain progress reports to the manager
+DRAIN_PROGRESS_INTERVAL = 1
+
 
 class Monitor:
 
-    def __init__(self, monitor_host: str = "127.0.0.1", monitor_port: int = 65432):
+    def __init__(
+        self,
+        monitor_host: str = "127.0.0.1",
+        monitor_port: int = 65432,
+        engine: str = "threaded",
+        max_workers: int = 16,
+        max_backlog_bytes: int = 64 * 1024 * 1024,
+        max_backlog_age: float | None = None,
+        max_log_bytes: int = 256 * 1024 * 1024,
+    ):
         # Identification
         self._id = ""  # Generate a random id or something
         self._monitor_host: str = monitor_host  # Server host address
@@ -25,9 +63,40 @@ class Monitor:
         # Tasks
         self._tasks: dict = {}
 
-        # Connection
+        # Check engine: a bounded pool of worker threads, or every task on one asyncio event loop
+        self._check_loop: AsyncCheckEngine | None = (
+            AsyncCheckEngine() if engine == "asyncio" else None
+        )
+
+        # Scheduler dispatching due checks into the check engine
+        self._scheduler: CheckScheduler = CheckScheduler(
+            max_workers,
+            (
+                (lambda check, due: self._check_loop.submit(check(due)))
+                if self._check_loop
+                else None
+            ),
+        )
+        self._scheduler.start()
+
+        # Delivery of results: logged until acknowledged, saved while the manager is unreachable
+        self._delivery: ResultDelivery = ResultDelivery(
+            WriteAheadLog(
+                os.path.join("wal", f"{monitor_host}_{monitor_port}"),
+                max_bytes=max_log_bytes,
+                max_age=max_backlog_age,
+            ),
+            ResultBacklog(
+                os.path.join("backlog", f"{monitor_host}_{monitor_port}"),
+                max_bytes=max_backlog_bytes,
+                max_age=max_backlog_age,
+            ),
+        )
+
+        # Connection, and the single writer everything sent over it goes through
         self._socket = None
         self._conn = None
+        self._writer: FrameWriter | None = None
 
     def start(self):
         """Set up connection for management_service to send commands"""
@@ -42,109 +111,214 @@ class Monitor:
                 self._conn, addr = self._socket.accept()
                 with self._conn:
                     print(f"Connected by: {addr}")
+                    self._writer = FrameWriter(self._conn)
 
                     try:
                         while True:
-                            # Receive command
-                            command = self._conn.recv(1024).decode("utf-8")
+                            # Receive command frame
+                            frame = recv_frame(self._conn)
 
                             # Break out to accept new connections if no command
-                            if not command:
+                            if frame is None:
                                 break
-                            else:
-                                print(f"\nCommand received: {command}")
+                            command, payload = frame
+                            if command != FrameType.HEARTBEAT:
+                                print(f"\nCommand received: {command.name}")
 
                             # Start up and bulk operation commands
-                            if command == "SET_ID":
-                                print("Awaiting ID ...")
-                                self._conn.send("awaiting ID ...".encode("utf-8"))
-                                self._id = self._conn.recv(1024).decode("utf-8")
+                            if command == FrameType.SET_ID:
+                                self._id = payload
                                 print(f"ID received and set: {self._id}")
-                                self._conn.send(
-                                    f"ID set to {self._id}!".encode("utf-8")
+                                self._writer.send(
+                                    FrameType.ACK, f"ID set to {self._id}!"
                                 )
 
-                            elif command == "START":
+                            elif command == FrameType.START:
                                 # Skip config and reconnect existing threads if active tasks
                                 if self._tasks:
                                     print(
-                                        "Tasks already started! Reconnecting task threads to send data ..."
+                                        "Tasks already configured! Reconnecting task threads to send data ..."
                                     )
-                                    self._conn.send(
-                                        "reconnecting tasks ...".encode("utf-8")
+                                    # List the running tasks, so the manager diffs config changes against them
+                                    self._writer.send(
+                                        FrameType.ACK,
+                                        {"reconnecting": self.running_config()},
                                     )
                                     self.reconnect_tasks()
                                 else:
                                     # Let manager know awaiting tasks
                                     print("Awaiting tasks ...")
-                                    self._conn.send(
-                                        "awaiting tasks ...".encode("utf-8")
+                                    self._writer.send(
+                                        FrameType.ACK, "awaiting tasks ..."
                                     )
 
                                     # Receive and load tasks
-                                    config = self._conn.recv(1024)
-                                    config = pickle.loads(config)
+                                    frame = recv_frame(self._conn)
+                                    if frame is None or frame[0] != FrameType.CONFIG:
+                                        raise ProtocolError("Expected a CONFIG frame")
+                                    config = frame[1]
                                     print(f"Tasks received: {config}\n")
 
-                                    # Send confirmation of each individual task
-                                    for task, params in config.items():
-                                        self._conn.send(
-                                            f"{task}: {params}".encode("utf-8")
-                                        )
-                                        time.sleep(3)
+                                    # Confirm the whole config in one reply with the status of each task;
+                                    # tasks start once the manager signals it is ready for results
+                                    self._writer.send(
+                                        FrameType.ACK,
+                                        {"configured": self.configure_tasks(config)},
+                                    )
 
-                                    # Start tasks and confirm they've started to manager
-                                    self.configure_tasks(config)
-                                    self.start_tasks()
-                                    self._conn.send("tasks started!".encode("utf-8"))
+                            elif command == FrameType.READY:
+                                # Replay results the manager never acknowledged, e.g. from before a restart,
+                                # then start tasks and confirm they've started to manager
+                                self._delivery.connect(self._writer)
+                                self.start_tasks()
+                                self._writer.send(FrameType.ACK, "tasks started!")
+
+                            elif command == FrameType.UPDATE:
+                                # Apply the config diff to the running tasks and report each change
+                                self._writer.send(
+                                    FrameType.ACK,
+                                    {"updated": self.update_tasks(payload)},
+                                )
 
-                            elif command == "QUIT":
+                            elif command == FrameType.QUIT:
                                 # Alert client and shut down
-                                self._conn.send("stopping tasks!".encode("utf-8"))
+                                self._writer.send(FrameType.ACK, "stopping tasks!")
                                 self.stop_tasks()
                                 break
 
+                            elif command == FrameType.HEARTBEAT:
+                                # Answer so the manager knows the connection is alive
+                                self._writer.send(FrameType.HEARTBEAT)
+
+                            elif command == FrameType.CURSOR:
+                                # Manager has processed every result up to the cursor
+                                self._delivery.acknowledge(payload)
+
                     except socket.error as e:
                         print(f"Socket error: {e}")
 
                     finally:
+                        # Flush what is queued before closing
+                        self._delivery.disconnect()
+                        self._writer.close(timeout=5)
+                        print(f"Connection write metrics: {self._writer.metrics()}")
                         self._conn.close()
 
-    def configure_tasks(self, config: dict):
-        """Starts task instances based on config"""
-        # Create the task objects/threads
-        for task, params in config.items():
-            frequency = params["frequency"]
-            del params["frequency"]
-            self._tasks[task] = NetworkTask(
-                self._id,
-                task,
-                params,
-                frequency,
-                self._conn,
+    def configure_tasks(self, config: dict) -> dict:
+        """Creates task instances based on config and returns the status of each task"""
+        statuses = {}
+
+        # Create the task objects, keyed by task id, skipping any that are invalid
+        for task_id, params in config.items():
+            frequency = params.pop("frequency", None)
+            task = params.pop("type", None)
+            if error := validate_task(task, frequency):
+                statuses[task_id] = {"status": "error", "error": error}
+            else:
+                self._tasks[task_id] = NetworkTask(
+                    self._id,
+                    task_id,
+                    task,
+                    params,
+                    frequency,
+                    self._delivery,
+                )
+                statuses[task_id] = {
+                    "status": "ok",
+                    "type": task,
+                    "params": params,
+                    "frequency": frequency,
+                }
+
+        return statuses
+
+    def running_config(self) -> dict:
+        """The config of every task, in the form the manager sends it"""
+        return {task_id: task.config() for task_id, task in self._tasks.items()}
+
+    def update_tasks(self, diff: dict) -> dict:
+        """
+        Applies a config diff to the running tasks and returns the status of each change.
+
+        Removed tasks are unscheduled without waiting for a check in flight, added ones are configured and
+        scheduled, and updated ones get their new params in place, keeping their schedule phase. Tasks the diff
+        doesn't mention are left untouched.
+        """
+        print(f"Config update received: {diff}\n")
+        statuses = {}
+
+        for task in diff.get("remove", []):
+            if task in self._tasks:
+                print(f"Removing task {self._tasks[task]}")
+                self._tasks.pop(task).unschedule(self._scheduler, wait=False)
+                statuses[task] = {"status": "removed"}
+            else:
+                statuses[task] = {"status": "error", "error": "no such task"}
+
+        for task_id, params in diff.get("update", {}).items():
+            frequency = params.pop("frequency", None)
+            task = params.pop("type", None)
+            if task_id not in self._tasks:
+                statuses[task_id] = {"status": "error", "error": "no such task"}
+            elif task != self._tasks[task_id].task:
+                statuses[task_id] = {
+                    "status": "error",
+                    "error": "a task's type can't change",
+                }
+            elif error := validate_task(task, frequency):
+                statuses[task_id] = {"status": "error", "error": error}
+            else:
+                self._tasks[task_id].reconfigure(params, frequency, self._scheduler)
+                print(f"Updated task {self._tasks[task_id]}")
+                statuses[task_id] = {
+                    "status": "updated",
+                    "type": task,
+                    "params": params,
+                    "frequency": frequency,
+                }
+
+        # New tasks start straight away, like the rest
+        added = {
+            task: params
+            for task, params in diff.get("add", {}).items()
+            if task not in self._tasks
+        }
+        for task in diff.get("add", {}):
+            if task not in added:
+                statuses[task] = {"status": "error", "error": "task already exists"}
+        for task, status in self.configure_tasks(added).items():
+            statuses[task] = (
+                {**status, "status": "added"} if status["status"] == "ok" else status
             )
+        self.start_tasks()
+
+        return statuses
 
     def start_tasks(self):
-        """Start all tasks in task list"""
+        """Schedule all tasks in task list that aren't already scheduled"""
         for task in self._tasks.values():
-            print("Starting task {}".format(task))
-            task.start()
+            if task.schedule(
+                self._scheduler, asynchronous=self._check_loop is not None
+            ):
+                print("Starting task {}".format(task))
         print("")
 
     def reconnect_tasks(self):
-        """Re-establishes conn in task threads after reconnection"""
-        for task in self._tasks.values():
-            task.set_connection(self._conn)
+        """Re-establishes the connection tasks send over, replaying unacknowledged and saved results first"""
+        self._delivery.connect(self._writer)
+
+        # Tasks configured by a manager that disconnected before signalling it was ready
+        self.start_tasks()
 
     def stop_tasks(self):
         """Stops all tasks in task threads"""
         global shutdown_flag
         shutdown_flag = True
 
-        # Wait for threads to quit
+        # Unschedule tasks and wait for checks in flight to finish
         print("\nStopping tasks ...")
         for task in self._tasks.values():
-            task.join()
+            task.unschedule(self._scheduler)
 
         self._tasks = {}
 
@@ -155,93 +329,298 @@ class Monitor:
         # Kill running tasks
         self.stop_tasks()
 
+        # Stop the scheduler and the check event loop
+        print("Stopping scheduler ...")
+        self._scheduler.stop()
+        if self._check_loop:
+            print("Stopping check event loop ...")
+            self._check_loop.stop()
+
         # Close sockets
+        print("Closing ICMP engine ...")
+        close_icmp_engine()
+        print("Closing NTP engine ...")
+        close_ntp_engine()
+        print("Closing pooled HTTP connections ...")
+        close_http_session()
+        print(f"Host name cache: {get_host_cache().stats()}")
         print("Closing connection ...")
         if self._conn:
             self._conn.close()
         print("Closing server socket ...")
+        self._delivery.close()
         self._socket.close()
 
         print("Shutting down server ... goodbye!")
         exit()
 
 
-class NetworkTask(threading.Thread):
+def validate_task(task: str, frequency: Any) -> str | None:
+    """Returns why a task can't be run at the given frequency, or None if it can"""
+    if task not in SERVICE_TASKS:
+        return "unknown task type"
+    if not isinstance(frequency, (int, float)) or frequency <= 0:
+        return "frequency must be a positive number"
+    return None
+
+
+class AsyncCheckEngine:
+    """Runs the asyncio service checks of every task on one event loop in a background thread"""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._loop.run_forever, name="check-loop", daemon=True
+        )
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the event loop, starting the loop thread on first use"""
+        if not self._thread.is_alive():
+            self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self):
+        """Stop the event loop and wait for its thread to finish"""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+
+
+class ResultDelivery:
+    """
+    Monitor-wide, at-least-once delivery of packed results to the manager.
+
+    Every result is first appended to the write-ahead log, which gives it a sequence number, and then sent in a
+    RESULT frame carrying that number. The manager acknowledges results in batches with CURSOR frames, after
+    which the log deletes them. Results that can't be sent are also kept in the bounded backlog. When the
+    manager reconnects, results it was sent but never acknowledged are replayed from the log, followed by the
+    backlog, so nothing is lost to a dropped connection or a monitor restart; the manager drops any duplicates
+    by sequence number. The replay is a low priority drain: live results go out ahead of it, it moves at the
+    pace the manager reads, and DRAIN frames tell the manager how far behind it is. Sequencing and queueing on
+    the connection's writer share one lock so results always go out in sequence order.
+    """
+
+    def __init__(self, wal: WriteAheadLog, backlog: ResultBacklog):
+        self._wal: WriteAheadLog = wal
+        self._backlog: ResultBacklog = backlog
+        self._writer: FrameWriter | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def submit(self, result: bytes) -> bool:
+        """Log a packed result and queue it for sending, returning False if it had to be saved for later instead"""
+        with self._lock:
+            payload: bytes = encode_result(self._wal.append(result), result)
+            if self._writer is not None and self._writer.send(
+                FrameType.RESULT, payload
+            ):
+                return True
+
+            # Anything queued when the connection failed is still in the log and is replayed on reconnection
+            self._writer = None
+            self._backlog.append(payload)
+            return False
+
+    def connect(self, writer: FrameWriter):
+        """Send through a new connection's writer, draining unacknowledged and saved results behind live ones"""
+        with self._lock:
+            # Results sent over the old connection, or logged before a restart, but never acknowledged, come
+            # before the saved ones; everything from until on is live
+            saved = self._backlog.peek(1)
+            cursor: int = self._wal.cursor
+            before: int = decode_result(saved[0])[0] if saved else self._wal.next_seq
+            until: int = self._wal.next_seq
+            pending: int = before - cursor - 1 + len(self._backlog)
+            print(f"Draining results from cursor {cursor} - {self.summary()}")
+
+            # Tell the manager which sequence numbers the drain covers before anything else is sent
+            writer.send(
+                FrameType.DRAIN,
+                {
+                    "state": "start",
+                    "cursor": cursor,
+                    "until": until,
+                    "pending": pending,
+                },
+            )
+            if pending:
+                writer.set_drain(self._drain(cursor, before, pending))
+            else:
+                writer.send(FrameType.DRAIN, {"state": "done", "sent": 0})
+            self._writer = writer
+
+    def _drain(self, cursor: int, before: int, pending: int):
+        """Yield chunks of replayed then saved result frames, with progress reports, for the connection's writer"""
+        sent: int = 0
+        last_report: float = time.monotonic()
+        chunk: list = []
+        size: int = 0
+        timestamp: float = time.time()
+
+        def results():
+            # Logged results sent before but never acknowledged
+            nonlocal timestamp
+            for seq, result in self._wal.replay(cursor, before):
+                timestamp = RESULT_HEADER.unpack_from(result)[0]
+                yield encode_frame(FrameType.RESULT, encode_result(seq, result))
+
+            # Saved results, consumed as they are handed over
+            while batch := self._backlog.peek(BACKLOG_BATCH_SIZE):
+                self._backlog.consume(len(batch))
+                for payload in batch:
+                    timestamp = RESULT_HEADER.unpack_from(decode_result(payload)[1])[0]
+                    yield encode_frame(FrameType.RESULT, payload)
+
+        for frame in results():
+            chunk.append(frame)
+            size += len(frame)
+            sent += 1
+            if size < DRAIN_CHUNK_SIZE:
+                continue
+
+            # Report how far behind the drain is at most once per interval
+            if time.monotonic() - last_report >= DRAIN_PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                chunk.append(
+                    encode_frame(
+                        FrameType.DRAIN,
+                        {
+                            "state": "progress",
+                            "sent": sent,
+                            "pending": max(pending - sent, len(self._backlog)),
+                            "behind": time.time() - timestamp,
+                        },
+                    )
+                )
+            yield b"".join(chunk)
+            chunk, size = [], 0
+
+        chunk.append(encode_frame(FrameType.DRAIN, {"state": "done", "sent": sent}))
+        yield b"".join(chunk)
+
+    def disconnect(self):
+        """Stop sending, saving results to the backlog until the next connection"""
+        with self._lock:
+            self._writer = None
+
+    def acknowledge(self, cursor: int):
+        """Let the log delete every result up to the manager's cursor"""
+        self._wal.ack(cursor)
+
+    def summary(self) -> str:
+        """Describe how many results are saved, dropped and awaiting acknowledgement"""
+        return f"results saved: {len(self._backlog)}, spilled to disk: {self._backlog.spilled}, dropped: {self._backlog.dropped + self._wal.dropped}, unacknowledged: {self._wal.next_seq - 1 - self._wal.cursor}"
+
+    def close(self):
+        """Flush the log and delete the backlog"""
+        self._wal.close()
+        self._backlog.close()
+
+
+class NetworkTask:
     def __init__(
         self,
         monitor_id: str,
+        task_id: str,
         task: str,
         params: dict,
         frequency: int,
-        conn: socket.socket = None,
+        delivery: ResultDelivery,
     ):
-        super().__init__()
-
         # Monitor information
         self._monitor_id: str = monitor_id
 
-        # Network test information
+        # Network test information; a monitor may run any number of tasks of one type, told apart by id
+        self._task_id: str = task_id
         self._task: str = task
         self._params: dict = params
 
-        # Thread control
-        self._event: threading.Event = threading.Event()
+        # Scheduling
         self._frequency: int = frequency
-
-        # Connection to send data over
-        self._conn: socket.socket = conn
-
-        # Messages to send
-        self._msgs: list = []
-
-    def run(self) -> NoReturn:
-
-        # Loop until shutdown event is set
-        time.sleep(20)
-        while not shutdown_flag:
-
-            # Init msg
-            msg = ""
-
-            # Header
-            columns, lines = shutil.get_terminal_size()
-            msg += f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] {self._task} Service Check \n"
-            msg += "=" * columns + "\n"
-
-            # Get results
-            print(
-                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - performing {self._task} test ..."
-            )
-            msg += run_service_check(self._task, self._params.values())
-
-            # Send message
-            self._msgs.append(msg)
-            self.send_msgs()
-
-            # Sleep the loop for the given interval
-            self._event.wait(self._frequency)
-
-    def send_msgs(self):
-        """Send messages currently stored in self._msgs"""
-        try:
-
-            self._conn.sendall("\n".join(self._msgs).encode())
+        self._scheduled: ScheduledCheck | None = None
+
+        # Monitor-wide delivery of results to the manager
+        self._delivery: ResultDelivery = delivery
+
+    def __str__(self) -> str:
+        return f"{self._task_id} - {self._task} (every {self._frequency}s)"
+
+    @property
+    def task(self) -> str:
+        """Type of check the task performs"""
+        return self._task
+
+    def config(self) -> dict:
+        """The task's type, params and frequency, in the form the manager sends them"""
+        return {"type": self._task, **self._params, "frequency": self._frequency}
+
+    def schedule(self, scheduler: CheckScheduler, asynchronous: bool = False) -> bool:
+        """Register the task's checks with the scheduler, first running within one interval, unless already registered"""
+        if self._scheduled:
+            return False
+        self._scheduled = scheduler.add(
+            self.run_async if asynchronous else self.run, self._frequency
+        )
+        return True
+
+    def unschedule(self, scheduler: CheckScheduler, wait: bool = True):
+        """Remove the task from the scheduler, optionally waiting for a check in flight to finish"""
+        if self._scheduled:
+            scheduler.remove(self._scheduled, wait)
+            self._scheduled = None
+
+    def reconfigure(self, params: dict, frequency: int, scheduler: CheckScheduler):
+        """Swap in new params, used from the next check on, and change the frequency without losing the phase"""
+        self._params = params
+        if frequency != self._frequency:
+            self._frequency = frequency
+            if self._scheduled:
+                scheduler.set_frequency(self._scheduled, frequency)
+
+    def run(self, due: float):
+        """Perform one check and send its results, for the scheduler's worker threads"""
+        lateness = self.start_check(due)
+        self.finish_check(
+            lateness, run_service_check(self._task, self._params.values())
+        )
+
+    async def run_async(self, due: float):
+        """Perform one check on the event loop and send its results without blocking the loop"""
+        lateness = self.start_check(due)
+        result = await run_service_check_async(self._task, self._params.values())
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.finish_check, lateness, result
+        )
+
+    def start_check(self, due: float) -> float:
+        """Log the start of a check and return how many milliseconds after its due time it started"""
+        lateness = (time.monotonic() - due) * 1000
+        print(
+            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - performing {self._task} test {self._task_id} (started {lateness:.0f} ms late) ..."
+        )
+        return lateness
+
+    def finish_check(self, lateness: float, result: CheckResult):
+        """Tag a check's result with this monitor and its lateness, then send it"""
+        result.monitor_id = self._monitor_id
+        result.lateness = lateness
+
+        # Send packed result
+        self.send_result(pack_result(result))
+
+    def send_result(self, result: bytes):
+        """Send a packed result, which is saved for reconnection if the manager can't be reached"""
+        if self._delivery.submit(result):
             print(
-                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - successfully sent {self._task} test results!"
+                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - queued {self._task} test {self._task_id} results for sending!"
             )
-            self._msgs = []  # Clear msgs in case of successful send
-        except socket.error:
+        else:
             print(
                 f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - connection to management service down!"
             )
             print(
-                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - saving {self._task} task results for reconnection - results saved: {len(self._msgs)}"
+                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {self._monitor_id}] - saving {self._task} task {self._task_id} results for reconnection - {self._delivery.summary()}"
             )
-            self._conn.close()
-
-    def set_connection(self, conn: socket.socket) -> NoReturn:
-        """Set the connection data is being sent over"""
-        self._conn = conn
 
 
 if __name__ == "__main__":
@@ -280,6 +659,12 @@ if __name__ == "__main__":
         # Get configuration and start up
         ip = input("Enter IP for monitor: ")
         port = int(input("Enter port for monitor: "))
-        monitor = Monitor(ip, port)
+        engine = (
+            input("Enter check engine [threaded/asyncio] (Default = threaded): ")
+            .strip()
+            .lower()
+            or "threaded"
+        )
+        monitor = Monitor(ip, port, engine)
         signal.signal(signal.SIGINT, monitor.shutdown_handler)
         monitor.start()
@@ -1,24 +1,25 @@
 # Requires the following packages:
 # pip install requests
-# pip install ntplib
 # pip install dnspython
+# Each is imported inside the checks that use it, the first time one runs, so a monitor only loads what its
+# tasks need.
+import errno
+import functools
+import ipaddress
 import os
 import random
 import socket
 import string
 import struct
+import sys
 import threading
 import time
 import zlib
-from socket import gaierror
+from array import array
+from collections import OrderedDict, deque
+from contextvars import ContextVar
 from time import ctime
-from typing import Tuple, Optional, Any
-
-import dns.exception
-import dns.resolver
-import lorem
-import ntplib
-import requests
+from typing import Tuple, Optional, Any, Dict, List, Callable
 
 
 def calculate_icmp_checksum(data: bytes) -> int:
@@ -66,6 +67,7 @@ def create_icmp_packet(
     icmp_code: int = 0,
     sequence_number: int = 1,
     data_size: int = 192,
+    icmp_id: Optional[int] = None,
 ) -> bytes:
     """
     Creates an ICMP (Internet Control Message Protocol) packet with specified parameters.
@@ -75,6 +77,7 @@ def create_icmp_packet(
     icmp_code (int): The code of the ICMP packet. Default is 0.
     sequence_number (int): The sequence number of the ICMP packet. Default is 1.
     data_size (int): The size of the data payload in the ICMP packet. Default is 192 bytes.
+    icmp_id (Optional[int]): The ICMP identifier to use. Default derives one from the thread and process ids.
 
     Returns:
     bytes: A bytes object representing the complete ICMP packet.
@@ -85,24 +88,25 @@ def create_icmp_packet(
     is in the correct format for network transmission.
     """
 
-    # Get the current thread identifier and process identifier.
-    # These are used to create a unique ICMP identifier.
-    thread_id = threading.get_ident()
-    process_id = os.getpid()
+    if icmp_id is None:
+        # Get the current thread identifier and process identifier.
+        # These are used to create a unique ICMP identifier.
+        thread_id = threading.get_ident()
+        process_id = os.getpid()
 
-    # Generate a unique ICMP identifier using CRC32 over the concatenation of thread_id and process_id.
-    # The & 0xffff ensures the result is within the range of an unsigned 16-bit integer (0-65535).
-    icmp_id = zlib.crc32(f"{thread_id}{process_id}".encode()) & 0xFFFF
+        # Generate a unique ICMP identifier using CRC32 over the concatenation of thread_id and process_id.
+        # The & 0xffff ensures the result is within the range of an unsigned 16-bit integer (0-65535).
+        icmp_id = zlib.crc32(f"{thread_id}{process_id}".encode()) & 0xFFFF
 
     # Pack the ICMP header fields into a bytes object.
-    # 'bbHHh' is the format string for struct.pack, which means:
+    # 'bbHHH' is the format string for struct.pack, which means:
     # b - signed char (1 byte) for ICMP type
     # b - signed char (1 byte) for ICMP code
     # H - unsigned short (2 bytes) for checksum, initially set to 0
     # H - unsigned short (2 bytes) for ICMP identifier
-    # h - short (2 bytes) for sequence number
+    # H - unsigned short (2 bytes) for sequence number
     header: bytes = struct.pack(
-        "bbHHh", icmp_type, icmp_code, 0, icmp_id, sequence_number
+        "bbHHH", icmp_type, icmp_code, 0, icmp_id, sequence_number
     )
 
     # Create the data payload for the ICMP packet.
@@ -117,80 +121,760 @@ def create_icmp_packet(
     # Repack the header with the correct checksum.
     # socket.htons ensures the checksum is in network byte order.
     header = struct.pack(
-        "bbHHh", icmp_type, icmp_code, socket.htons(chksum), icmp_id, sequence_number
+        "bbHHH", icmp_type, icmp_code, socket.htons(chksum), icmp_id, sequence_number
     )
 
     # Return the complete ICMP packet by concatenating the header and data.
     return header + data
 
 
+# Payloads at least this large are summed with NumPy when it is installed
+NUMPY_CHECKSUM_THRESHOLD = 1024
+
+
+@functools.cache
+def load_numpy():
+    """NumPy if it is installed, otherwise None; imported on first use, as it is slow to load"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def fast_icmp_checksum(data: bytes) -> int:
+    """
+    Calculate the same Internet checksum as calculate_icmp_checksum, without a Python-level loop.
+
+    The data is viewed as an array of 16-bit words and summed in C, by NumPy for large payloads when it is
+    installed and by the built-in array module otherwise. Odd-length data is padded with a zero byte, and the
+    carries are folded back in until the sum fits in 16 bits.
+
+    Args:
+    data (bytes): The data for which the checksum is to be calculated.
+
+    Returns:
+    int: The calculated checksum.
+    """
+    if len(data) % 2:
+        data = bytes(data) + b"\x00"
+
+    numpy = load_numpy() if len(data) >= NUMPY_CHECKSUM_THRESHOLD else None
+    if numpy is not None:
+        # '>u2' reads big-endian 16-bit words; uint64 keeps the sum from overflowing
+        s: int = int(numpy.frombuffer(data, dtype=">u2").sum(dtype=numpy.uint64))
+    else:
+        words = array("H", data)
+        if sys.byteorder == "little":
+            # The checksum is defined over big-endian words
+            words.byteswap()
+        s = sum(words)
+
+    # Fold the carries back in until the sum fits in 16 bits, then complement it
+    while s >> 16:
+        s = (s >> 16) + (s & 0xFFFF)
+    return ~s & 0xFFFF
+
+
+class IcmpPacketBuilder:
+    """
+    Builds ICMP Echo Requests for one (icmp_id, data_size) pair from a precomputed template.
+
+    The payload and the checksum of the packet with a zero sequence number are computed once. Each packet then
+    only patches in its sequence number and updates the checksum incrementally as described in RFC 1624
+    (HC' = ~(~HC + ~m + m')), so building a probe costs a single struct.pack.
+    """
+
+    _header: struct.Struct = struct.Struct("bbHHH")
+
+    def __init__(
+        self, icmp_id: int, data_size: int = 192, icmp_type: int = 8, icmp_code: int = 0
+    ):
+        self._icmp_id: int = icmp_id
+        self._icmp_type: int = icmp_type
+        self._icmp_code: int = icmp_code
+
+        # Payload of one random alphanumeric character repeated, as in create_icmp_packet
+        random_char: str = random.choice(string.ascii_letters + string.digits)
+        self._payload: bytes = (random_char * data_size).encode()
+
+        # Checksum of the template packet, whose sequence number is zero
+        self._checksum: int = fast_icmp_checksum(
+            self._header.pack(icmp_type, icmp_code, 0, icmp_id, 0) + self._payload
+        )
+
+    def build(self, sequence_number: int) -> bytes:
+        """Return the packet for sequence_number"""
+        # The sequence number is packed in native byte order, so read it back the way the checksum sees it
+        new_word: int = int.from_bytes(struct.pack("H", sequence_number), "big")
+
+        # RFC 1624 eqn. 3, with the template's old sequence word m = 0 so that ~m = 0xFFFF
+        s: int = (~self._checksum & 0xFFFF) + 0xFFFF + new_word
+        while s >> 16:
+            s = (s >> 16) + (s & 0xFFFF)
+        checksum: int = ~s & 0xFFFF
+
+        return (
+            self._header.pack(
+                self._icmp_type,
+                self._icmp_code,
+                socket.htons(checksum),
+                self._icmp_id,
+                sequence_number,
+            )
+            + self._payload
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_icmp_packet_builder(icmp_id: int, data_size: int = 192) -> IcmpPacketBuilder:
+    """Return the cached Echo Request builder for an (icmp_id, data_size) pair"""
+    return IcmpPacketBuilder(icmp_id, data_size)
+
+
+class IcmpProbe:
+    """A single in-flight ICMP Echo Request waiting on the shared engine for its reply."""
+
+    __slots__ = (
+        "host",
+        "ttl",
+        "sequence_number",
+        "sent",
+        "event",
+        "callback",
+        "addr",
+        "rtt",
+        "icmp_type",
+    )
+
+    def __init__(
+        self,
+        host: str,
+        ttl: int,
+        sequence_number: int,
+        callback: Optional[Callable] = None,
+    ):
+        self.host: str = host
+        self.ttl: int = ttl
+        self.sequence_number: int = sequence_number
+        self.sent: float = 0.0
+        self.event: threading.Event = threading.Event()
+        self.callback: Optional[Callable] = callback
+        self.addr: Any = None
+        self.rtt: Optional[float] = None
+        self.icmp_type: Optional[int] = None
+
+
+class IcmpEngine:
+    """
+    Monitor-wide ICMP engine built around one long-lived raw socket.
+
+    Every probe is sent through the same socket with the engine's ICMP identifier and a sequence number
+    allocated by the engine, so concurrent pings and traceroutes never share an (icmp_id, seq) pair. A single
+    receiver thread reads every ICMP packet delivered to the socket and hands it to the waiting probe whose
+    key matches, either directly (Echo Reply) or through the quoted header inside an ICMP error message
+    (Time Exceeded, Destination Unreachable).
+    """
+
+    ECHO_REPLY = 0
+    DEST_UNREACHABLE = 3
+    ECHO_REQUEST = 8
+    TIME_EXCEEDED = 11
+
+    def __init__(self, data_size: int = 192):
+        # Probe identification
+        self._icmp_id: int = zlib.crc32(f"{os.getpid()}".encode()) & 0xFFFF
+        self._sequence_number: int = 0
+        self._builder: IcmpPacketBuilder = get_icmp_packet_builder(
+            self._icmp_id, data_size
+        )
+
+        # Probes awaiting a reply, keyed by (icmp_id, sequence_number)
+        self._pending: dict = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        # Socket and receiver thread
+        self._socket: Optional[socket.socket] = None
+        self._ttl: Optional[int] = None
+        self._send_lock: threading.Lock = threading.Lock()
+        self._receiver: Optional[threading.Thread] = None
+        self._closed: threading.Event = threading.Event()
+
+    def start(self) -> None:
+        """Open the raw socket and start the receiver thread"""
+        self._socket = socket.socket(
+            socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP
+        )
+        self._socket.settimeout(0.5)
+        self._receiver = threading.Thread(
+            target=self._receive, name="icmp-receiver", daemon=True
+        )
+        self._receiver.start()
+
+    def close(self) -> None:
+        """Stop the receiver thread, close the socket and release any waiting probes"""
+        self._closed.set()
+        if self._receiver:
+            self._receiver.join()
+        if self._socket:
+            self._socket.close()
+        with self._lock:
+            for probe in self._pending.values():
+                probe.event.set()
+                if probe.callback:
+                    probe.callback(probe)
+            self._pending = {}
+
+    def send(
+        self, host: str, ttl: int = 64, callback: Optional[Callable] = None
+    ) -> IcmpProbe:
+        """
+        Send an Echo Request to host and return the probe that will receive its reply.
+
+        If a callback is given, it is called with the probe from the receiver thread once the reply arrives
+        (or the engine closes), which lets an event loop wait on the probe without blocking.
+        """
+        with self._lock:
+            # Allocate the next sequence number that is not already in flight
+            for _ in range(0x10000):
+                self._sequence_number = (self._sequence_number + 1) & 0xFFFF
+                if (self._icmp_id, self._sequence_number) not in self._pending:
+                    break
+            probe = IcmpProbe(host, ttl, self._sequence_number, callback)
+            self._pending[(self._icmp_id, probe.sequence_number)] = probe
+
+        packet: bytes = self._builder.build(probe.sequence_number)
+
+        try:
+            # The TTL is a socket option, so setting it and sending must not interleave with other probes
+            with self._send_lock:
+                if ttl != self._ttl:
+                    self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                    self._ttl = ttl
+                probe.sent = time.perf_counter()
+                self._socket.sendto(packet, (host, 1))
+        except OSError:
+            self.cancel(probe)
+            raise
+
+        return probe
+
+    def cancel(self, probe: IcmpProbe) -> None:
+        """Stop waiting for a reply to probe"""
+        with self._lock:
+            self._pending.pop((self._icmp_id, probe.sequence_number), None)
+
+    def ping(
+        self, host: str, ttl: int = 64, timeout: float = 1
+    ) -> Tuple[Any, float] | Tuple[Any, None]:
+        """Send one probe and block until its reply arrives or timeout seconds pass"""
+        probe = self.send(host, ttl)
+        probe.event.wait(timeout)
+        self.cancel(probe)
+        if probe.rtt is None:
+            return None, None
+        return probe.addr, probe.rtt
+
+    def _receive(self) -> None:
+        """Read ICMP packets from the shared socket and complete the probes they answer"""
+        while not self._closed.is_set():
+            try:
+                data, addr = self._socket.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            received: float = time.perf_counter()
+
+            key = self._parse_key(data)
+            if key is None:
+                continue
+
+            with self._lock:
+                probe = self._pending.pop(key, None)
+            if probe is None:
+                continue
+
+            probe.addr = addr
+            probe.icmp_type = data[(data[0] & 0x0F) * 4]
+            probe.rtt = (received - probe.sent) * 1000
+            probe.event.set()
+            if probe.callback:
+                probe.callback(probe)
+
+    def _parse_key(self, data: bytes) -> Optional[Tuple[int, int]]:
+        """Return the (icmp_id, sequence_number) of the probe a received packet answers, if any"""
+        # The raw socket delivers the IP header, whose length is the low nibble of the first byte in 32-bit words
+        ip_header_length: int = (data[0] & 0x0F) * 4
+        if len(data) < ip_header_length + 8:
+            return None
+        icmp_type: int = data[ip_header_length]
+
+        if icmp_type == self.ECHO_REPLY:
+            # Echo Replies carry our identifier and sequence number in their own header
+            icmp_header: bytes = data[ip_header_length : ip_header_length + 8]
+        elif icmp_type in (self.TIME_EXCEEDED, self.DEST_UNREACHABLE):
+            # ICMP errors quote the original IP header plus the first 8 bytes of our Echo Request
+            inner: int = ip_header_length + 8
+            if len(data) < inner + 1:
+                return None
+            inner_icmp: int = inner + (data[inner] & 0x0F) * 4
+            icmp_header = data[inner_icmp : inner_icmp + 8]
+            if len(icmp_header) < 8 or icmp_header[0] != self.ECHO_REQUEST:
+                return None
+        else:
+            return None
+
+        # Identifier and sequence number are echoed back in the byte order create_icmp_packet packed them in
+        icmp_id, sequence_number = struct.unpack("HH", icmp_header[4:8])
+        if icmp_id != self._icmp_id:
+            return None
+        return icmp_id, sequence_number
+
+
+_icmp_engine: Optional[IcmpEngine] = None
+_icmp_engine_lock: threading.Lock = threading.Lock()
+
+
+def get_icmp_engine() -> IcmpEngine:
+    """Return the process-wide ICMP engine, starting it on first use"""
+    global _icmp_engine
+    with _icmp_engine_lock:
+        if _icmp_engine is None:
+            engine = IcmpEngine()
+            engine.start()
+            _icmp_engine = engine
+        return _icmp_engine
+
+
+def close_icmp_engine() -> None:
+    """Close the process-wide ICMP engine if it has been started"""
+    global _icmp_engine
+    with _icmp_engine_lock:
+        if _icmp_engine is not None:
+            _icmp_engine.close()
+            _icmp_engine = None
+
+
+# Seconds a host name's addresses are kept, and a name that failed to resolve is remembered as failed
+HOST_CACHE_TTL = 60
+HOST_CACHE_NEGATIVE_TTL = 10
+
+# Share of its TTL after which an entry that is used is refreshed in the background, so it never expires in use
+HOST_CACHE_PREFETCH = 0.75
+
+# Entries kept before expired ones are dropped, then the least recently used
+HOST_CACHE_SIZE = 4096
+
+# Seconds spent resolving host names during the check running in each thread or task, for its latency to leave out
+resolving_time: ContextVar[Optional[List[float]]] = ContextVar(
+    "resolving_time", default=None
+)
+
+
+class HostEntry:
+    """Addresses of a host name, or why it failed to resolve, and until when they are kept"""
+
+    __slots__ = (
+        "addresses",
+        "error",
+        "expires",
+        "refresh_at",
+        "refreshing",
+        "resolved",
+    )
+
+    def __init__(self):
+        self.addresses: List[str] = []
+        self.error: Optional[socket.gaierror] = None
+        self.expires: float = 0.0
+        self.refresh_at: float = 0.0
+        self.refreshing: bool = False
+        self.resolved: threading.Event = threading.Event()
+
+
+class HostCache:
+    """
+    Monitor-wide cache of host name resolutions, shared by every check.
+
+    libc's getaddrinfo doesn't report record TTLs, so names are kept for a fixed ttl after they resolve and
+    failures for a shorter negative_ttl. Only one lookup of a name runs at a time: checks that need it while it
+    is being looked up wait for that lookup rather than starting their own. An entry used after
+    HOST_CACHE_PREFETCH of its TTL is refreshed on a background thread while it keeps being served, so names
+    that are checked regularly are never looked up while a check waits. IP addresses are returned as they are.
+    Beyond HOST_CACHE_SIZE entries, expired ones are dropped and then the least recently used.
+    """
+
+    def __init__(
+        self, ttl: float = HOST_CACHE_TTL, negative_ttl: float = HOST_CACHE_NEGATIVE_TTL
+    ):
+        self._ttl: float = ttl
+        self._negative_ttl: float = negative_ttl
+
+        # Entries keyed by (lower case host name, address family), least recently used first
+        self._entries: OrderedDict[Tuple[str, int], HostEntry] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        # Counters, as returned by stats()
+        self._counters: Dict[str, int] = dict.fromkeys(
+            ("hits", "negative_hits", "misses", "waits", "prefetches"), 0
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Lookups answered from the cache (negative_hits for remembered failures), lookups that missed, lookups
+        that waited for another's, background refreshes and entries held"""
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Forget every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, host: str, family: int = socket.AF_INET) -> Optional[List[str]]:
+        """
+        The addresses of host if they are cached and fresh, or None if it must be looked up; raises
+        socket.gaierror if it recently failed to resolve. Never blocks on a lookup.
+        """
+        if is_ip_address(host):
+            return [host]
+        with self._lock:
+            entry: Optional[HostEntry] = self._entries.get((host.lower(), family))
+            if (
+                entry is None
+                or not entry.resolved.is_set()
+                or time.monotonic() >= entry.expires
+            ):
+                return None
+            return self._hit(host, family, entry)
+
+    def resolve(self, host: str, family: int = socket.AF_INET) -> List[str]:
+        """The addresses of host, from the cache or looked up; raises socket.gaierror if it doesn't resolve"""
+        if is_ip_address(host):
+            return [host]
+        key: Tuple[str, int] = (host.lower(), family)
+        with self._lock:
+            entry: Optional[HostEntry] = self._entries.get(key)
+            if (
+                entry is not None
+                and entry.resolved.is_set()
+                and time.monotonic() < entry.expires
+            ):
+                return self._hit(host, family, entry)
+
+            # Join a lookup of the name already running, or start one
+            lookup: bool = entry is None or entry.resolved.is_set()
+            if lookup:
+                self._counters["misses"] += 1
+                entry = HostEntry()
+                self._entries[key] = entry
+                if len(self._entries) > HOST_CACHE_SIZE:
+                    self._evict()
+            else:
+                self._counters["waits"] += 1
+
+        if lookup:
+            self._lookup(host, family, entry)
+        else:
+            entry.resolved.wait()
+        return self._result(entry)
+
+    def _hit(self, host: str, family: int, entry: HostEntry) -> List[str]:
+        """Count a fresh entry being used, start its refresh if it is due, and return it; called holding the lock"""
+        self._entries.move_to_end((host.lower(), family))
+        if entry.error is not None:
+            self._counters["negative_hits"] += 1
+            return self._result(entry)
+
+        self._counters["hits"] += 1
+        if not entry.refreshing and time.monotonic() >= entry.refresh_at:
+            entry.refreshing = True
+            self._counters["prefetches"] += 1
+            threading.Thread(
+                target=self._refresh,
+                args=(host, family),
+                name="host-prefetch",
+                daemon=True,
+            ).start()
+        return list(entry.addresses)
+
+    def _refresh(self, host: str, family: int) -> None:
+        """Look a name up again and replace its entry, keeping the old one if the lookup fails"""
+        entry = HostEntry()
+        self._lookup(host, family, entry)
+        with self._lock:
+            key: Tuple[str, int] = (host.lower(), family)
+            # An entry evicted while it was being refreshed stays evicted
+            if key not in self._entries:
+                return
+            if entry.error is None:
+                self._entries[key] = entry
+            else:
+                # Keep serving the old addresses, and wait before trying again rather than on the next hit
+                current: HostEntry = self._entries[key]
+                current.refresh_at = time.monotonic() + self._negative_ttl
+                current.refreshing = False
+
+    def _lookup(self, host: str, family: int, entry: HostEntry) -> None:
+        """Resolve a name with getaddrinfo into entry and release anything waiting on it"""
+        try:
+            infos = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+            entry.addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            ttl: float = self._ttl
+        except socket.gaierror as e:
+            entry.error = e
+            ttl = self._negative_ttl
+        now: float = time.monotonic()
+        entry.expires = now + ttl
+        entry.refresh_at = now + ttl * HOST_CACHE_PREFETCH
+        entry.resolved.set()
+
+    def _result(self, entry: HostEntry) -> List[str]:
+        """The addresses of a resolved entry, or a fresh copy of the error it failed with"""
+        if entry.error is not None:
+            raise socket.gaierror(*entry.error.args)
+        return list(entry.addresses)
+
+    def _evict(self) -> None:
+        """
+        Remove every expired entry, then the least recently used until the cache is back to HOST_CACHE_SIZE;
+        called holding the lock. Lookups still running are kept for the checks waiting on them.
+        """
+        now: float = time.monotonic()
+        resolved: List[Tuple[str, int]] = [
+            key for key, entry in self._entries.items() if entry.resolved.is_set()
+        ]
+        for key in resolved:
+            if self._entries[key].expires <= now:
+                del self._entries[key]
+        for key in resolved:
+            if len(self._entries) <= HOST_CACHE_SIZE:
+                break
+            self._entries.pop(key, None)
+
+
+def is_ip_address(host: str) -> bool:
+    """Whether host is an IPv4 or IPv6 address rather than a name"""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+_host_cache: Optional[HostCache] = None
+_host_cache_lock: threading.Lock = threading.Lock()
+
+
+def get_host_cache() -> HostCache:
+    """Return the process-wide host name cache, creating it on first use"""
+    global _host_cache
+    with _host_cache_lock:
+        if _host_cache is None:
+            _host_cache = HostCache()
+        return _host_cache
+
+
+def add_resolving_time(start: float) -> None:
+    """Count the time since start (from time.perf_counter) as spent resolving names for the running check"""
+    spent: Optional[List[float]] = resolving_time.get()
+    if spent is not None:
+        spent[0] += time.perf_counter() - start
+
+
+def resolve_addresses(host: str, family: int = socket.AF_INET) -> List[str]:
+    """The addresses of host through the host cache, timed as resolution; raises socket.gaierror"""
+    start: float = time.perf_counter()
+    try:
+        return get_host_cache().resolve(host, family)
+    finally:
+        add_resolving_time(start)
+
+
+def resolve_host(host: str) -> str:
+    """The first IPv4 address of host through the host cache, as socket.gethostbyname would give it"""
+    return resolve_addresses(host)[0]
+
+
 def ping(
     host: str, ttl: int = 64, timeout: int = 1, sequence_number: int = 1
 ) -> Tuple[Any, float] | Tuple[Any, None]:
     """
     Send an ICMP Echo Request to a specified host and measure the round-trip time.
 
-    This function creates a raw socket to send an ICMP Echo Request packet to the given host.
-    It then waits for an Echo Reply, measuring the time taken for the round trip. If the
+    This function sends an ICMP Echo Request packet to the given host through the process-wide ICMP engine
+    and waits for the reply matching that request, measuring the time taken for the round trip. If the
     specified timeout is exceeded before receiving a reply, the function returns None for the ping time.
 
     Args:
     host (str): The IP address or hostname of the target host.
     ttl (int): Time-To-Live for the ICMP packet. Determines how many hops (routers) the packet can pass through.
     timeout (int): The time in seconds that the function will wait for a reply before giving up.
-    sequence_number (int): The sequence number for the ICMP packet. Useful for matching requests with replies.
+    sequence_number (int): Kept for compatibility with existing configs. The engine assigns the sequence number
+    sent on the wire so that concurrent probes can always be told apart.
 
     Returns:
     Tuple[Any, float] | Tuple[Any, None]: A tuple containing the address of the replier and the total ping time in milliseconds.
     If the request times out, the function returns None for the ping time. The address part of the tuple is also None if no reply is received.
     """
+    # Resolved before the probe is timed, so the ping time is only the round trip
+    return get_icmp_engine().ping(resolve_host(host), ttl, timeout)
 
-    # Create a raw socket with the Internet Protocol (IPv4) and ICMP.
-    # socket.AF_INET specifies the IPv4 address family.
-    # socket.SOCK_RAW allows sending raw packets (including ICMP).
-    # socket.IPPROTO_ICMP specifies the ICMP protocol.
-    with socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP) as sock:
-        # Set the Time-To-Live (TTL) for the ICMP packet.
-        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
 
-        # Set the timeout for the socket's blocking operations (e.g., recvfrom).
-        sock.settimeout(timeout)
+def expand_sweep_targets(targets: str | List[str]) -> List[str]:
+    """
+    Expand a sweep target specification into a list of hosts.
 
-        # Create an ICMP Echo Request packet.
-        # icmp_type=8 and icmp_code=0 are standard for Echo Request.
-        # sequence_number is used to match Echo Requests with Replies.
-        packet: bytes = create_icmp_packet(
-            icmp_type=8, icmp_code=0, sequence_number=sequence_number
-        )
+    Args:
+    targets (str | List[str]): A CIDR block (e.g. "192.168.0.0/22"), a comma-separated string of hosts,
+    or a list of hosts. Entries of a list or string may themselves be CIDR blocks.
 
-        # Send the ICMP packet to the target host.
-        # The second argument of sendto is a tuple (host, port).
-        # For raw sockets, the port number is irrelevant, hence set to 1.
-        sock.sendto(packet, (host, 1))
+    Returns:
+    List[str]: The hosts to probe, in order, without duplicates.
+    """
+    if isinstance(targets, str):
+        targets = [target.strip() for target in targets.split(",")]
+
+    hosts: List[str] = []
+    for target in targets:
+        if not target:
+            continue
+        if "/" in target:
+            # Usable host addresses of the block (network and broadcast addresses are skipped)
+            hosts.extend(
+                str(addr) for addr in ipaddress.ip_network(target, strict=False).hosts()
+            )
+        else:
+            hosts.append(target)
 
-        # Record the current time to measure the round-trip time later.
-        start: float = time.time()
+    return list(dict.fromkeys(hosts))
 
-        try:
-            # Wait to receive data from the socket (up to 1024 bytes).
-            # This will be the ICMP Echo Reply if the target host is reachable.
-            data, addr = sock.recvfrom(1024)
 
-            # Record the time when the reply is received.
-            end: float = time.time()
+def ping_sweep(
+    targets: str | List[str],
+    timeout: float = 1,
+    count: int = 1,
+    burst_size: int = 64,
+    burst_interval: float = 0.01,
+) -> Dict[str, dict]:
+    """
+    Ping many hosts at once, fping-style, through the process-wide ICMP engine.
 
-            # Calculate the round-trip time in milliseconds.
-            total_ping_time = (end - start) * 1000
+    Echo Requests for every host are sent in paced bursts of burst_size packets, one burst every
+    burst_interval seconds, and replies are then gathered until a single deadline shared by all
+    probes. A sweep therefore takes roughly the time needed to send the probes plus one timeout,
+    rather than one timeout per host.
 
-            # Return the address of the replier and the total ping time.
-            return addr, total_ping_time
-        except socket.timeout:
-            # If no reply is received within the timeout period, return None for the ping time.
-            return None, None
+    Args:
+    targets (str | List[str]): Hosts to probe. See expand_sweep_targets for the accepted formats.
+    timeout (float): Seconds to wait for replies after the last probe is sent.
+    count (int): Number of Echo Requests to send to each host.
+    burst_size (int): Number of Echo Requests sent back to back before pausing.
+    burst_interval (float): Seconds to pause between bursts.
+
+    Returns:
+    Dict[str, dict]: For each host, a dict with the number of probes "sent" and "received", the packet
+    "loss" as a percentage, and the round-trip times in milliseconds of the answered probes as "rtts".
+    """
+    engine = get_icmp_engine()
+    hosts: List[str] = expand_sweep_targets(targets)
+    results: Dict[str, dict] = {
+        host: {"sent": 0, "received": 0, "loss": 100.0, "rtts": []} for host in hosts
+    }
+
+    # Send every probe in paced bursts so the local socket buffer and the network are not flooded
+    probes: List[IcmpProbe] = []
+    sent_in_burst: int = 0
+    for _ in range(count):
+        for host in hosts:
+            try:
+                # Labelled with the target as given, so its replies count towards that target's results
+                probe = engine.send(resolve_host(host))
+                probe.host = host
+                probes.append(probe)
+                results[host]["sent"] += 1
+            except OSError:
+                # Unresolvable or unroutable hosts count as lost probes
+                results[host]["sent"] += 1
+
+            sent_in_burst += 1
+            if sent_in_burst == burst_size:
+                sent_in_burst = 0
+                time.sleep(burst_interval)
+
+    # Gather replies until the shared deadline
+    deadline: float = time.perf_counter() + timeout
+    for probe in probes:
+        probe.event.wait(max(0.0, deadline - time.perf_counter()))
+        engine.cancel(probe)
+
+    return summarise_sweep(results, probes)
+
+
+def summarise_sweep(
+    results: Dict[str, dict], probes: List[IcmpProbe]
+) -> Dict[str, dict]:
+    """
+    Fill in the received counts, loss and RTTs of a sweep from its finished probes.
+
+    Args:
+    results (Dict[str, dict]): Per-host results as built by ping_sweep, with the "sent" counts filled in.
+    probes (List[IcmpProbe]): Every probe sent during the sweep.
+
+    Returns:
+    Dict[str, dict]: The same results dict, completed.
+    """
+    # Only Echo Replies from the host itself count as answers
+    for probe in probes:
+        if probe.rtt is not None and probe.icmp_type == IcmpEngine.ECHO_REPLY:
+            results[probe.host]["rtts"].append(probe.rtt)
+
+    # Summarise packet loss per host
+    for result in results.values():
+        result["received"] = len(result["rtts"])
+        if result["sent"]:
+            result["loss"] = (
+                100 * (result["sent"] - result["received"]) / result["sent"]
+            )
+
+    return results
+
+
+# Header row for traceroute results. Each column is formatted for alignment and width.
+TRACEROUTE_HEADER = f"{'Hop':>3} {'Address':<15} {'Min (ms)':>8}   {'Avg (ms)':>8}   {'Max (ms)':>8}   {'Count':>5}"
+
+
+def format_traceroute_hop(ttl: int, addr: Any, ping_times: List[float]) -> str:
+    """
+    Format one row of the traceroute results table.
+
+    Args:
+    ttl (int): The TTL (hop number) of the row.
+    addr (Any): The address of the replier, or None if no reply was received.
+    ping_times (List[float]): The round-trip times in milliseconds of the replies for this hop.
+
+    Returns:
+    str: The formatted row, with statistics if there were replies and asterisks otherwise.
+    """
+    # If there are valid ping responses, calculate and format the statistics.
+    if ping_times:
+        min_time = min(ping_times)  # Minimum ping time.
+        avg_time = sum(ping_times) / len(ping_times)  # Average ping time.
+        max_time = max(ping_times)  # Maximum ping time.
+        count = len(ping_times)  # Count of successful pings.
+
+        return f"{ttl:>3} {addr[0] if addr else '*':<15} {min_time:>8.2f}ms {avg_time:>8.2f}ms {max_time:>8.2f}ms {count:>5}"
+
+    # If no valid responses, return a row of asterisks and zero count.
+    return f"{ttl:>3} {'*':<15} {'*':>8}   {'*':>8}   {'*':>8}   {0:>5}"
 
 
 def traceroute(
-    host: str, max_hops: int = 30, pings_per_hop: int = 1, verbose: bool = False
+    host: str,
+    max_hops: int = 30,
+    pings_per_hop: int = 1,
+    verbose: bool = False,
+    parallel: bool = False,
 ) -> str:
     """
     Perform a traceroute to the specified host, with multiple pings per hop.
@@ -200,14 +884,19 @@ def traceroute(
     max_hops (int): Maximum number of hops to try before stopping.
     pings_per_hop (int): Number of pings to perform at each hop.
     verbose (bool): If True, print additional details during execution.
+    parallel (bool): If True, probe every hop at once with parallel_traceroute.
 
     Returns:
     str: The results of the traceroute, including statistics for each hop.
     """
+    if parallel:
+        return parallel_traceroute(host, max_hops, pings_per_hop, verbose)
+
     # Header row for the results. Each column is formatted for alignment and width.
-    results = [
-        f"{'Hop':>3} {'Address':<15} {'Min (ms)':>8}   {'Avg (ms)':>8}   {'Max (ms)':>8}   {'Count':>5}"
-    ]
+    results = [TRACEROUTE_HEADER]
+
+    # Resolve once so every ping goes to the same address and the destination hop can be recognised
+    destination: str = resolve_host(host)
 
     # Loop through each TTL (Time-To-Live) value from 1 to max_hops.
     for ttl in range(1, max_hops + 1):
@@ -222,66 +911,358 @@ def traceroute(
         for _ in range(pings_per_hop):
             # Ping the host with the current TTL and sequence number.
             # The sequence number is incremented with TTL for each ping.
-            addr, response = ping(host, ttl=ttl, sequence_number=ttl)
+            addr, response = ping(destination, ttl=ttl, sequence_number=ttl)
 
             # If a response is received (not None), append it to ping_times.
             if response is not None:
                 ping_times.append(response)
 
-        # If there are valid ping responses, calculate and format the statistics.
-        if ping_times:
-            min_time = min(ping_times)  # Minimum ping time.
-            avg_time = sum(ping_times) / len(ping_times)  # Average ping time.
-            max_time = max(ping_times)  # Maximum ping time.
-            count = len(ping_times)  # Count of successful pings.
-
-            # Append the formatted results for this TTL to the results list.
-            results.append(
-                f"{ttl:>3} {addr[0] if addr else '*':<15} {min_time:>8.2f}ms {avg_time:>8.2f}ms {max_time:>8.2f}ms {count:>5}"
-            )
-        else:
-            # If no valid responses, append a row of asterisks and zero count.
-            results.append(
-                f"{ttl:>3} {'*':<15} {'*':>8}   {'*':>8}   {'*':>8}   {0:>5}"
-            )
+        # Append the formatted results for this TTL to the results list.
+        results.append(format_traceroute_hop(ttl, addr, ping_times))
 
         # Print the last entry in the results if verbose mode is enabled.
         if verbose and results:
             print(f"\tResult: {results[-1]}")
 
         # If the address of the response matches the target host, stop the traceroute.
-        if addr and addr[0] == host:
+        if addr and addr[0] == destination:
             break
 
     # Join all results into a single string with newline separators and return.
     return "\n".join(results)
 
 
-def check_server_http(url: str) -> Tuple[bool, Optional[int]]:
+def parallel_traceroute(
+    host: str,
+    max_hops: int = 30,
+    pings_per_hop: int = 1,
+    verbose: bool = False,
+    timeout: float = 1,
+) -> str:
+    """
+    Perform a traceroute to the specified host by probing every hop at once.
+
+    The probes for all TTLs from 1 to max_hops, pings_per_hop of each, are sent through the process-wide ICMP
+    engine in one burst. The engine matches each Time Exceeded or Echo Reply to its probe, and so to its TTL,
+    by the identifier and sequence number quoted back in the reply, so the whole traceroute finishes after one
+    timeout window instead of one per hop.
+
+    Args:
+    host (str): The IP address or hostname of the target host.
+    max_hops (int): Maximum number of hops to probe.
+    pings_per_hop (int): Number of pings to send at each hop.
+    verbose (bool): If True, print additional details during execution.
+    timeout (float): Seconds to wait for replies after the burst is sent.
+
+    Returns:
+    str: The results of the traceroute in the same table format as traceroute().
+    """
+    engine = get_icmp_engine()
+
+    # Resolve once so every probe goes to the same address and the destination hop can be recognised
+    destination: str = resolve_host(host)
+
+    # Send every probe for every hop in one burst
+    if verbose:
+        print(f"pinging {host} with ttl 1 to {max_hops}, {pings_per_hop} per hop")
+    probes: List[IcmpProbe] = []
+    for ttl in range(1, max_hops + 1):
+        for _ in range(pings_per_hop):
+            probes.append(engine.send(destination, ttl))
+
+    # Gather replies until one shared deadline
+    deadline: float = time.perf_counter() + timeout
+    for probe in probes:
+        probe.event.wait(max(0.0, deadline - time.perf_counter()))
+        engine.cancel(probe)
+
+    return summarise_traceroute(probes, max_hops, destination, verbose)
+
+
+def summarise_traceroute(
+    probes: List[IcmpProbe], max_hops: int, destination: str, verbose: bool = False
+) -> str:
+    """
+    Build the traceroute results table from the finished probes of a parallel traceroute.
+
+    Args:
+    probes (List[IcmpProbe]): Every probe sent, for every TTL.
+    max_hops (int): The highest TTL probed.
+    destination (str): The resolved address of the target host.
+    verbose (bool): If True, print each row as it is built.
+
+    Returns:
+    str: The results of the traceroute in the same table format as traceroute().
+    """
+    # Group the answered probes by TTL
+    hops: Dict[int, Tuple[Any, List[float]]] = {
+        ttl: (None, []) for ttl in range(1, max_hops + 1)
+    }
+    for probe in probes:
+        if probe.rtt is not None:
+            addr, ping_times = hops[probe.ttl]
+            hops[probe.ttl] = (addr or probe.addr, ping_times + [probe.rtt])
+
+    # Build the table, stopping at the first hop answered by the destination itself
+    results = [TRACEROUTE_HEADER]
+    for ttl, (addr, ping_times) in hops.items():
+        results.append(format_traceroute_hop(ttl, addr, ping_times))
+        if verbose:
+            print(f"\tResult: {results[-1]}")
+        if addr and addr[0] == destination:
+            break
+
+    return "\n".join(results)
+
+
+# Seconds an HTTP or HTTPS check waits to connect and for each read, when its task doesn't set a timeout
+HTTP_TIMEOUT = 10
+
+# How an HTTP check fetches its URL: a GET of the whole response, a HEAD, or a GET closed once the headers are in
+HTTP_MODES = ("get", "head", "stream")
+
+# Largest body a streamed check still reads to the end, so that its connection can be kept alive and reused
+HTTP_DRAIN_LIMIT = 64 * 1024
+
+# Hosts the shared HTTP session keeps a connection pool for, and idle connections kept alive per host
+HTTP_POOL_HOSTS = 64
+HTTP_POOL_SIZE = 16
+
+# Phases of an HTTP check that are timed, in milliseconds, in the order they happen
+HTTP_PHASES = ("dns", "connect", "tls", "ttfb", "transfer")
+
+# Process-wide HTTP session, created on first use
+_http_session: Any = None
+_http_session_lock: threading.Lock = threading.Lock()
+
+# Timing of the HTTP check running on each thread, for the connections it opens to add to
+_http_timing: threading.local = threading.local()
+
+
+def new_http_timing() -> dict:
+    """
+    Start the timing of one HTTP check: milliseconds spent on each of HTTP_PHASES, and connections opened.
+
+    Name resolution, connecting and the TLS handshake are only timed for new connections, so they stay at zero
+    when a pooled connection is reused. ttfb is the wait from sending the request until the response headers
+    arrive, redirects included, and transfer is the time taken to read the final response's body.
+    """
+    timing: dict = dict.fromkeys(HTTP_PHASES, 0.0)
+    timing["connections"] = 0
+    return timing
+
+
+def add_http_phase(timing: dict, phase: str, start: float) -> float:
+    """Add the time since start (from time.monotonic) to a phase of a check's timing and return the time now"""
+    now: float = time.monotonic()
+    timing[phase] += (now - start) * 1000
+    return now
+
+
+def round_http_timing(timing: dict) -> dict:
+    """Round a check's phase times to the microsecond, as they are reported"""
+    for phase in HTTP_PHASES:
+        timing[phase] = round(timing[phase], 3)
+    return timing
+
+
+def finish_http_timing(
+    timing: dict, start: float, headers_at: float, done_at: float
+) -> dict:
+    """Fill in ttfb and transfer from when a check started, got its final headers and finished, and round"""
+    opened: float = timing["dns"] + timing["connect"] + timing["tls"]
+    timing["ttfb"] = max((headers_at - start) * 1000 - opened, 0.0)
+    timing["transfer"] = (done_at - headers_at) * 1000
+    return round_http_timing(timing)
+
+
+@functools.cache
+def timed_http_pool_classes() -> dict:
+    """
+    urllib3 connection pool classes, by scheme, whose new connections add their name resolution, connect and TLS
+    handshake times to the timing of the check running on their thread.
+    """
+    import urllib3
+    from urllib3.exceptions import ConnectTimeoutError, NameResolutionError
+    from urllib3.util.connection import allowed_gai_family
+
+    class TimedHTTPConnection(urllib3.connection.HTTPConnection):
+        def _new_conn(self) -> socket.socket:
+            timing: Optional[dict] = getattr(_http_timing, "current", None)
+            if timing is None:
+                return super()._new_conn()
+
+            # Resolve the name through the host cache first so it is timed on its own, then connect to each
+            # address in turn
+            start: float = time.monotonic()
+            try:
+                addresses: List[str] = resolve_addresses(
+                    self._dns_host, allowed_gai_family()
+                )
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+            finally:
+                resolved: float = add_http_phase(timing, "dns", start)
+
+            # Failing to connect to an address raises ConnectTimeoutError or its subclass NewConnectionError;
+            # the time spent trying is counted as connecting whether or not any address answers
+            dns_host: str = self._dns_host
+            try:
+                for i, address in enumerate(addresses):
+                    self._dns_host = address
+                    try:
+                        sock: socket.socket = super()._new_conn()
+                        break
+                    except ConnectTimeoutError:
+                        if i == len(addresses) - 1:
+                            raise
+            finally:
+                self._dns_host = dns_host
+                self.connected_at: float = add_http_phase(timing, "connect", resolved)
+
+            timing["connections"] += 1
+            return sock
+
+    class TimedHTTPSConnection(urllib3.connection.HTTPSConnection, TimedHTTPConnection):
+        def connect(self) -> None:
+            # A failed handshake is timed too, from when the TCP connection was made
+            try:
+                super().connect()
+            finally:
+                timing: Optional[dict] = getattr(_http_timing, "current", None)
+                if timing is not None and hasattr(self, "connected_at"):
+                    add_http_phase(timing, "tls", self.connected_at)
+
+    class TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+def get_http_session():
+    """
+    Return the process-wide requests session the HTTP and HTTPS checks share, creating it on first use.
+
+    Its connection pools keep connections to each host alive between checks, so a check only pays for name
+    resolution, the TCP handshake and the TLS handshake when no idle connection to its host is left. Cookies
+    are not kept between checks, so one check can't change what the next is served.
+    """
+    import http.cookiejar
+
+    import requests
+
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE
+            )
+            adapter.poolmanager.pool_classes_by_scheme = timed_http_pool_classes()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.cookies.set_policy(
+                http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+            )
+            _http_session = session
+        return _http_session
+
+
+def close_http_session() -> None:
+    """Close the process-wide HTTP session and its pooled connections if it has been created"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+def fetch_http_status(
+    url: str,
+    timeout: Optional[float] = None,
+    mode: str = "stream",
+    headers: Optional[dict] = None,
+    timing: Optional[dict] = None,
+) -> int:
+    """
+    Request url through the shared session and return the final status code, following redirects.
+
+    In "get" mode the whole body is downloaded, as a browser would. "head" sends a HEAD request instead, and
+    "stream" sends a GET but stops once the headers are in, reading the body only if it is small enough to
+    be worth keeping the connection alive for; a larger body is abandoned along with its connection.
+    The time spent in each phase is recorded in timing, from new_http_timing, if one is given.
+    """
+    if mode not in HTTP_MODES:
+        raise ValueError(f"Unknown HTTP check mode '{mode}'")
+    session = get_http_session()
+    timeout = timeout or HTTP_TIMEOUT
+    timing = new_http_timing() if timing is None else timing
+
+    _http_timing.current = timing
+    try:
+        start: float = time.monotonic()
+        if mode == "head":
+            response = session.head(
+                url, headers=headers, timeout=timeout, allow_redirects=True
+            )
+        else:
+            response = session.get(url, headers=headers, timeout=timeout, stream=True)
+        headers_at: float = time.monotonic()
+
+        # Closing hands the connection back to the pool if the body was read, and drops it otherwise
+        with response:
+            length: str = response.headers.get("Content-Length", "")
+            if mode == "get" or (
+                mode == "stream"
+                and length.isdigit()
+                and int(length) <= HTTP_DRAIN_LIMIT
+            ):
+                response.content
+        finish_http_timing(timing, start, headers_at, time.monotonic())
+        return response.status_code
+    except BaseException:
+        round_http_timing(timing)
+        raise
+    finally:
+        _http_timing.current = None
+
+
+def check_server_http(
+    url: str, timeout: Optional[float] = HTTP_TIMEOUT, mode: str = "stream"
+) -> Tuple[bool, Optional[int], dict]:
     """
     Check if an HTTP server is up by making a request to the provided URL.
 
     This function attempts to connect to a web server using the specified URL.
     It returns a tuple containing a boolean indicating whether the server is up,
-    and the HTTP status code returned by the server.
+    the HTTP status code returned by the server, and how long each phase of the request took.
 
     :param url: URL of the server (including http://)
-    :return: Tuple (True/False, status code)
+    :param timeout: Timeout for connecting and for each read in seconds. Default is HTTP_TIMEOUT.
+    :param mode: "get", "head" or "stream", as for fetch_http_status. Default is "stream".
+    :return: Tuple (True/False, status code, timing)
              True if server is up (status code < 400), False otherwise
+             timing holds the milliseconds spent in each phase of the request, as from new_http_timing
     """
+    import requests
+
+    timing: dict = new_http_timing()
     try:
-        # Making a GET request to the server
-        response: requests.Response = requests.get(url)
+        # Making the request to the server over a pooled connection
+        status_code: int = fetch_http_status(url, timeout, mode, timing=timing)
 
         # The HTTP status code is a number that indicates the outcome of the request.
         # Here, we consider status codes less than 400 as successful,
         # meaning the server is up and reachable.
         # Common successful status codes are 200 (OK), 301 (Moved Permanently), etc.
-        is_up: bool = response.status_code < 400
+        is_up: bool = status_code < 400
 
-        # Returning a tuple: (True/False, status code)
+        # Returning a tuple: (True/False, status code, timing)
         # True if the server is up, False if an exception occurs (see except block)
-        return is_up, response.status_code
+        return is_up, status_code, timing
 
     except requests.RequestException:
         # This block catches any exception that might occur during the request.
@@ -289,10 +1270,13 @@ def check_server_http(url: str) -> Tuple[bool, Optional[int]]:
         # If an exception occurs, we assume the server is down.
         # Returning False for the status, and None for the status code,
         # as we couldn't successfully connect to the server to get a status code.
-        return False, None
+        # The timing still shows how far the request got.
+        return False, None, timing
 
 
-def check_server_https(url: str, timeout: int = 5) -> Tuple[bool, Optional[int], str]:
+def check_server_https(
+    url: str, timeout: Optional[float] = 5, mode: str = "stream"
+) -> Tuple[bool, Optional[int], str, dict]:
     """
     Check if an HTTPS server is up by making a request to the provided URL.
 
@@ -302,36 +1286,364 @@ def check_server_https(url: str, timeout: int = 5) -> Tuple[bool, Optional[int],
 
     :param url: URL of the server (including https://)
     :param timeout: Timeout for the request in seconds. Default is 5 seconds.
-    :return: Tuple (True/False for server status, status code, description)
+    :param mode: "get", "head" or "stream", as for fetch_http_status. Default is "stream".
+    :return: Tuple (True/False for server status, status code, description, timing)
     """
+    import requests
+
+    timing: dict = new_http_timing()
     try:
         # Setting custom headers for the request. Here, 'User-Agent' is set to mimic a web browser.
         headers: dict = {"User-Agent": "Mozilla/5.0"}
 
-        # Making a GET request to the server with the specified URL and timeout.
+        # Making the request to the server over a pooled connection, with the specified timeout.
         # The timeout ensures that the request does not hang indefinitely.
-        response: requests.Response = requests.get(
-            url, headers=headers, timeout=timeout
-        )
+        status_code: int = fetch_http_status(url, timeout, mode, headers, timing)
 
         # Checking if the status code is less than 400. Status codes in the 200-399 range generally indicate success.
-        is_up: bool = response.status_code < 400
+        is_up: bool = status_code < 400
 
         # Returning a tuple: (server status, status code, descriptive message)
-        return is_up, response.status_code, "Server is up"
+        return is_up, status_code, "Server is up", timing
 
     except requests.ConnectionError:
         # This exception is raised for network-related errors, like DNS failure or refused connection.
-        return False, None, "Connection error"
+        return False, None, "Connection error", timing
 
     except requests.Timeout:
         # This exception is raised if the server does not send any data in the allotted time (specified by timeout).
-        return False, None, "Timeout occurred"
+        return False, None, "Timeout occurred", timing
 
     except requests.RequestException as e:
         # A catch-all exception for any error not covered by the specific exceptions above.
         # 'e' contains the details of the exception.
-        return False, None, f"Error during request: {e}"
+        return False, None, f"Error during request: {e}", timing
+
+
+# Seconds an NTP check waits for its replies
+NTP_TIMEOUT = 5
+
+NTP_PORT = 123
+
+# Seconds from the NTP era (1900) to the Unix epoch (1970)
+NTP_EPOCH_OFFSET = 2208988800
+
+# NTP packet without extensions: LI/VN/mode, stratum, poll, precision, root delay, root dispersion, reference id,
+# then the reference, originate, receive and transmit timestamps as seconds and fraction pairs
+NTP_PACKET = struct.Struct("!BBbb11I")
+
+# Offsets kept per server for its jitter, as in ntpd's clock filter
+NTP_JITTER_SAMPLES = 8
+
+# Receive errors that report an ICMP error for an earlier request rather than a broken socket
+NTP_TRANSIENT_ERRORS = frozenset(
+    (errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EHOSTDOWN)
+)
+
+
+def ntp_to_unix(seconds: int, fraction: int) -> float:
+    """Convert an NTP timestamp to Unix time"""
+    return seconds - NTP_EPOCH_OFFSET + fraction / 2**32
+
+
+def expand_ntp_servers(servers: str | List[str]) -> List[str]:
+    """The servers of an NTP task: a list, or a string of servers separated by commas"""
+    if isinstance(servers, str):
+        servers = servers.split(",")
+    return list(dict.fromkeys(server.strip() for server in servers if server.strip()))
+
+
+class NtpProbe:
+    """One NTP request in flight and, once answered, the measurements made from its reply"""
+
+    __slots__ = ("server", "address", "cookie", "sent", "event", "callback", "result")
+
+    def __init__(
+        self,
+        server: str,
+        address: str,
+        cookie: int,
+        callback: Optional[Callable] = None,
+    ):
+        self.server: str = server
+        self.address: str = address
+        self.cookie: int = cookie
+        self.sent: float = 0.0
+        self.event: threading.Event = threading.Event()
+        self.callback: Optional[Callable] = callback
+        self.result: Optional[dict] = None
+
+
+class NtpEngine:
+    """
+    Monitor-wide NTP client built around one long-lived UDP socket.
+
+    Every request, to any server, is sent from the same socket. Its transmit timestamp is a cookie unique among
+    the requests in flight: the current NTP second with random fraction bits, which a server copies back as the
+    originate timestamp of its reply. A single receiver thread matches each reply to its request by that cookie
+    and the address it came from, timestamps its arrival, and works out the clock offset and round-trip delay
+    from the four timestamps, so many servers can be probed at once and a reply can't be mistaken for another's.
+    The last NTP_JITTER_SAMPLES offsets of each server are kept between checks for a rolling jitter estimate.
+    """
+
+    MODE_CLIENT = 3
+    MODE_SERVER = 4
+    LEAP_UNSYNCHRONISED = 3
+
+    def __init__(self):
+        # Probes awaiting a reply, keyed by cookie
+        self._pending: Dict[int, NtpProbe] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        # Recent offsets in milliseconds, per server
+        self._offsets: Dict[str, deque] = {}
+
+        # Socket and receiver thread
+        self._socket: Optional[socket.socket] = None
+        self._receiver: Optional[threading.Thread] = None
+        self._closed: threading.Event = threading.Event()
+
+    def start(self) -> None:
+        """Open the UDP socket and start the receiver thread"""
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.settimeout(0.5)
+        self._receiver = threading.Thread(
+            target=self._receive, name="ntp-receiver", daemon=True
+        )
+        self._receiver.start()
+
+    def close(self) -> None:
+        """Stop the receiver thread, close the socket and release any waiting probes"""
+        self._closed.set()
+        if self._receiver:
+            self._receiver.join()
+        if self._socket:
+            self._socket.close()
+        self._release_pending()
+
+    def _release_pending(self) -> None:
+        """Wake every probe still waiting for a reply, which leaves it without a result"""
+        with self._lock:
+            for probe in self._pending.values():
+                probe.event.set()
+                if probe.callback:
+                    probe.callback(probe)
+            self._pending = {}
+
+    def send(
+        self, server: str, address: str, callback: Optional[Callable] = None
+    ) -> NtpProbe:
+        """
+        Send a client request to the server at address and return the probe that will receive its reply.
+
+        If a callback is given, it is called with the probe from the receiver thread once the reply arrives
+        (or the engine closes), which lets an event loop wait on the probe without blocking.
+        """
+        with self._lock:
+            # Pick a cookie that is not already in flight
+            while True:
+                cookie: int = (
+                    int(time.time()) + NTP_EPOCH_OFFSET
+                ) << 32 | random.getrandbits(32)
+                if cookie not in self._pending:
+                    break
+            probe = NtpProbe(server, address, cookie, callback)
+            self._pending[cookie] = probe
+
+        # Version 4 client request with everything but the transmit timestamp left zero
+        packet: bytes = NTP_PACKET.pack(
+            4 << 3 | self.MODE_CLIENT,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            cookie >> 32,
+            cookie & 0xFFFFFFFF,
+        )
+        try:
+            probe.sent = time.time()
+            self._socket.sendto(packet, (address, NTP_PORT))
+        except OSError:
+            self.cancel(probe)
+            raise
+        return probe
+
+    def cancel(self, probe: NtpProbe) -> None:
+        """Stop waiting for a reply to probe"""
+        with self._lock:
+            self._pending.pop(probe.cookie, None)
+
+    def query(
+        self, servers: List[str], timeout: float = NTP_TIMEOUT
+    ) -> Dict[str, dict]:
+        """Probe every server at once and block until all have replied or timeout seconds pass"""
+        failed: Dict[str, str] = {}
+        probes: List[NtpProbe] = []
+        for server in servers:
+            try:
+                probes.append(self.send(server, resolve_host(server)))
+            except OSError as e:
+                failed[server] = str(e)
+
+        deadline: float = time.monotonic() + timeout
+        for probe in probes:
+            probe.event.wait(max(0.0, deadline - time.monotonic()))
+            self.cancel(probe)
+        return self.summarise(servers, probes, failed)
+
+    def summarise(
+        self, servers: List[str], probes: List[NtpProbe], failed: Dict[str, str]
+    ) -> Dict[str, dict]:
+        """
+        Results of a batch of probes, per server: whether it is "up", its "time", clock "offset" and round-trip
+        "delay" in milliseconds, "stratum" and "jitter" (None until it has answered twice), or an "error".
+        """
+        results: Dict[str, dict] = {
+            server: {"up": False, "error": failed.get(server, "No reply received")}
+            for server in servers
+        }
+        for probe in probes:
+            if probe.result is not None:
+                results[probe.server] = probe.result
+        return results
+
+    def _receive(self) -> None:
+        """Read NTP replies from the shared socket and complete the probes they answer"""
+        while not self._closed.is_set():
+            try:
+                data, addr = self._socket.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                # ICMP errors for an earlier send surface here; only those leave the socket usable
+                if e.errno in NTP_TRANSIENT_ERRORS:
+                    continue
+                if not self._closed.is_set():
+                    print(f"NTP engine stopped receiving: {e}")
+                    self._closed.set()
+                    self._release_pending()
+                break
+            received: float = time.time()
+
+            if len(data) < NTP_PACKET.size:
+                continue
+            fields = NTP_PACKET.unpack_from(data)
+            with self._lock:
+                probe: Optional[NtpProbe] = self._pending.get(
+                    fields[9] << 32 | fields[10]
+                )
+                if (
+                    probe is None
+                    or addr[0] != probe.address
+                    or fields[0] & 0x7 != self.MODE_SERVER
+                ):
+                    continue
+                del self._pending[probe.cookie]
+                probe.result = self._measure(probe, fields, received)
+
+            probe.event.set()
+            if probe.callback:
+                probe.callback(probe)
+
+    def _measure(self, probe: NtpProbe, fields: tuple, received: float) -> dict:
+        """Work out the result of a probe from its reply; called holding the lock"""
+        leap, stratum, ref_id = fields[0] >> 6, fields[1], fields[6]
+
+        # A server that can't or won't serve time says so with stratum 0 (a kiss code) or leap indicator 3
+        if stratum == 0:
+            code: str = (
+                ref_id.to_bytes(4, "big").decode("ascii", "replace").strip("\x00")
+            )
+            return {"up": False, "stratum": stratum, "error": f"Kiss-o'-death {code}"}
+        if leap == self.LEAP_UNSYNCHRONISED:
+            return {
+                "up": False,
+                "stratum": stratum,
+                "error": "Server clock is not synchronised",
+            }
+
+        # Offset and delay from when the request was sent (t1), reached the server (t2), left it (t3) and the
+        # reply arrived (t4)
+        t1, t4 = probe.sent, received
+        t2, t3 = ntp_to_unix(fields[11], fields[12]), ntp_to_unix(
+            fields[13], fields[14]
+        )
+        offset: float = ((t2 - t1) + (t3 - t4)) / 2 * 1000
+        delay: float = ((t4 - t1) - (t3 - t2)) * 1000
+
+        # Jitter is the root mean square of the differences between successive offsets
+        offsets: deque = self._offsets.setdefault(
+            probe.server, deque(maxlen=NTP_JITTER_SAMPLES)
+        )
+        offsets.append(offset)
+        jitter: Optional[float] = None
+        if len(offsets) > 1:
+            samples: List[float] = list(offsets)
+            differences: List[float] = [b - a for a, b in zip(samples, samples[1:])]
+            jitter = round(
+                (sum(d * d for d in differences) / len(differences)) ** 0.5, 3
+            )
+
+        return {
+            "up": True,
+            "time": ctime(t3),
+            "offset": round(offset, 3),
+            "delay": round(delay, 3),
+            "stratum": stratum,
+            "jitter": jitter,
+        }
+
+
+_ntp_engine: Optional[NtpEngine] = None
+_ntp_engine_lock: threading.Lock = threading.Lock()
+
+
+def get_ntp_engine() -> NtpEngine:
+    """Return the process-wide NTP engine, starting it on first use"""
+    global _ntp_engine
+    with _ntp_engine_lock:
+        # Replace an engine whose receiver stopped on a socket error
+        if _ntp_engine is None or _ntp_engine._closed.is_set():
+            if _ntp_engine is not None:
+                _ntp_engine.close()
+            engine = NtpEngine()
+            engine.start()
+            _ntp_engine = engine
+        return _ntp_engine
+
+
+def close_ntp_engine() -> None:
+    """Close the process-wide NTP engine if it has been started"""
+    global _ntp_engine
+    with _ntp_engine_lock:
+        if _ntp_engine is not None:
+            _ntp_engine.close()
+            _ntp_engine = None
+
+
+def check_ntp_servers(
+    servers: str | List[str], timeout: float = NTP_TIMEOUT
+) -> Dict[str, dict]:
+    """
+    Probe several NTP servers at once through the process-wide NTP engine.
+
+    Args:
+    servers (str | List[str]): Hostnames or IP addresses of the servers, as a list or separated by commas.
+    timeout (float): Seconds to wait for the replies. Default is NTP_TIMEOUT.
+
+    Returns:
+    Dict[str, dict]: For each server, whether it is "up", its "time" as a string, the clock "offset" and
+    round-trip "delay" in milliseconds, its "stratum" and the rolling "jitter" of its offset, or an "error".
+    """
+    return get_ntp_engine().query(expand_ntp_servers(servers), timeout)
 
 
 def check_ntp_server(server: str) -> Tuple[bool, Optional[str]]:
@@ -346,20 +1658,193 @@ def check_ntp_server(server: str) -> Tuple[bool, Optional[str]]:
                                  (True if up, False if down) and the current time as a string
                                  if the server is up, or None if it's down.
     """
-    # Create an NTP client instance
-    client = ntplib.NTPClient()
+    result: dict = check_ntp_servers([server]).get(server.strip(), {"up": False})
+    return result["up"], result.get("time")
 
-    try:
-        # Request time from the NTP server
-        # 'version=3' specifies the NTP version to use for the request
-        response = client.request(server, version=3)
 
-        # If request is successful, return True and the server time
-        # 'ctime' converts the time in seconds since the epoch to a readable format
-        return True, ctime(response.tx_time)
-    except (ntplib.NTPException, gaierror):
-        # If an exception occurs (server is down or unreachable), return False and None
-        return False, None
+# Seconds a DNS check waits for the answers to its queries
+DNS_TIMEOUT = 5
+
+
+class DnsResolver:
+    """
+    Reusable resolver for the DNS checks of one nameserver.
+
+    The nameserver's address comes from the host cache rather than being looked up on every check.
+    A check sends the queries for all its record types at once from one UDP socket, each with its own message
+    id, and matches the replies to them by id and question as they arrive, so it takes one round trip however
+    many record types it asks for. A truncated reply is retried over TCP. The query building and reply
+    handling are shared with the asyncio checks, which only differ in how the datagrams are sent.
+    """
+
+    def __init__(self, server: str):
+        self.server: str = server
+
+    def address(self) -> str:
+        """The nameserver's IPv4 address, through the host cache; raises socket.gaierror"""
+        return resolve_host(self.server)
+
+    def make_queries(self, query: str, record_types: List[str]) -> list:
+        """One dns.message query per record type, with message ids that differ within the batch"""
+        import dns.message
+
+        requests: list = []
+        ids: set = set()
+        for record_type in record_types:
+            request = dns.message.make_query(query, record_type)
+            while request.id in ids:
+                request.id = random.randint(0, 0xFFFF)
+            ids.add(request.id)
+            requests.append(request)
+        return requests
+
+    @staticmethod
+    def match_reply(
+        requests: list, pending: Dict[int, int], data: bytes
+    ) -> Optional[Tuple[int, Any]]:
+        """(index of the query, parsed reply) for a datagram answering a pending query, or None for any other"""
+        import dns.exception
+        import dns.message
+
+        index: Optional[int] = (
+            pending.get(int.from_bytes(data[:2], "big")) if len(data) >= 2 else None
+        )
+        if index is None:
+            return None
+        try:
+            reply = dns.message.from_wire(data)
+        except dns.exception.DNSException:
+            return None
+        return (index, reply) if requests[index].is_response(reply) else None
+
+    def reply_results(self, reply: Any) -> Tuple[bool, Any]:
+        """(status, records or why there are none) from a reply, following CNAMEs as a resolver would"""
+        import dns.exception
+        import dns.rcode
+        import dns.resolver
+
+        rcode = reply.rcode()
+        if rcode == dns.rcode.NXDOMAIN:
+            return False, str(
+                dns.resolver.NXDOMAIN(qnames=[reply.question[0].name], responses={})
+            )
+        if rcode != dns.rcode.NOERROR:
+            return False, f"Server {self.server} answered {dns.rcode.to_text(rcode)}"
+        try:
+            answer = reply.resolve_chaining().answer
+        except dns.exception.DNSException as e:
+            return False, str(e)
+        if answer is None:
+            return False, str(dns.resolver.NoAnswer(response=reply))
+        return True, [str(rdata) for rdata in answer]
+
+    def query(
+        self, query: str, record_types: List[str], timeout: float = DNS_TIMEOUT
+    ) -> List[tuple]:
+        """
+        Query the nameserver for every record type at once.
+
+        :return: (record type, status, records or why there are none, latency in ms or None) per record type
+        """
+        import dns.exception
+        import dns.flags
+        import dns.query
+
+        try:
+            address: str = self.address()
+        except socket.gaierror as e:
+            return [(record_type, False, str(e), None) for record_type in record_types]
+
+        # Every query stays failed with a timeout until its reply arrives
+        requests: list = self.make_queries(query, record_types)
+        results: List[tuple] = [
+            (record_type, False, str(dns.exception.Timeout(timeout=timeout)), None)
+            for record_type in record_types
+        ]
+        pending: Dict[int, int] = {request.id: i for i, request in enumerate(requests)}
+        sent: List[float] = []
+        truncated: List[int] = []
+        deadline: float = time.monotonic() + timeout
+
+        # Connecting the socket leaves datagrams from anywhere else to the kernel to drop
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            try:
+                sock.connect((address, 53))
+                for request in requests:
+                    sock.send(request.to_wire())
+                    sent.append(time.monotonic())
+
+                while pending and (remaining := deadline - time.monotonic()) > 0:
+                    sock.settimeout(remaining)
+                    try:
+                        data: bytes = sock.recv(65535)
+                    except socket.timeout:
+                        break
+                    received: float = time.monotonic()
+                    match = self.match_reply(requests, pending, data)
+                    if match is None:
+                        continue
+                    index, reply = match
+                    del pending[reply.id]
+                    if reply.flags & dns.flags.TC:
+                        truncated.append(index)
+                        continue
+                    results[index] = (
+                        record_types[index],
+                        *self.reply_results(reply),
+                        (received - sent[index]) * 1000,
+                    )
+            except OSError as e:
+                # Sending failed, or the nameserver's host refused the datagrams
+                for index in pending.values():
+                    results[index] = (record_types[index], False, str(e), None)
+
+        # Replies too large for a datagram are fetched again over TCP
+        for index in truncated:
+            try:
+                reply = dns.query.tcp(
+                    requests[index],
+                    address,
+                    timeout=max(deadline - time.monotonic(), 0.1),
+                )
+                results[index] = (
+                    record_types[index],
+                    *self.reply_results(reply),
+                    (time.monotonic() - sent[index]) * 1000,
+                )
+            except (dns.exception.DNSException, OSError) as e:
+                results[index] = (record_types[index], False, str(e), None)
+
+        return results
+
+
+# Resolver of each nameserver checked, created on first use
+_dns_resolvers: Dict[str, DnsResolver] = {}
+_dns_resolvers_lock: threading.Lock = threading.Lock()
+
+
+def get_dns_resolver(server: str) -> DnsResolver:
+    """Return the process-wide resolver of a nameserver, creating it on first use"""
+    with _dns_resolvers_lock:
+        resolver: Optional[DnsResolver] = _dns_resolvers.get(server)
+        if resolver is None:
+            resolver = _dns_resolvers[server] = DnsResolver(server)
+        return resolver
+
+
+def check_dns_server_records(
+    server: str, query: str, record_types: List[str], timeout: float = DNS_TIMEOUT
+) -> List[tuple]:
+    """
+    Check if a DNS server is up by querying it for several record types of a domain at once.
+
+    :param server: DNS server name or IP address
+    :param query: Domain name to query
+    :param record_types: Types of DNS record (e.g., ['A', 'AAAA', 'MX'])
+    :param timeout: Seconds to wait for the answers. Default is DNS_TIMEOUT.
+    :return: List of (record type, status, query results, latency in ms or None), one per record type
+    """
+    return get_dns_resolver(server).query(query, record_types, timeout)
 
 
 def check_dns_server_status(server, query, record_type) -> (bool, str):
@@ -371,25 +1856,8 @@ def check_dns_server_status(server, query, record_type) -> (bool, str):
     :param record_type: Type of DNS record (e.g., 'A', 'AAAA', 'MX', 'CNAME')
     :return: Tuple (status, query_results)
     """
-    try:
-        # Set the DNS resolver to use the specified server
-        resolver = dns.resolver.Resolver()
-        resolver.nameservers = [socket.gethostbyname(server)]
-
-        # Perform a DNS query for the specified domain and record type
-        query_results = resolver.resolve(query, record_type)
-        results = [str(rdata) for rdata in query_results]
-
-        return True, results
-
-    except (
-        dns.exception.Timeout,
-        dns.resolver.NoNameservers,
-        dns.resolver.NoAnswer,
-        socket.gaierror,
-    ) as e:
-        # Return False if there's an exception (server down, query failed, or record type not found)
-        return False, str(e)
+    _, status, results, _ = check_dns_server_records(server, query, [record_type])[0]
+    return status, results
 
 
 def check_tcp_port(ip_address: str, port: int) -> (bool, str):
@@ -418,7 +1886,8 @@ def check_tcp_port(ip_address: str, port: int) -> (bool, str):
 
             # Attempt to connect to the specified IP address and port.
             # If the connection is successful, the port is open.
-            s.connect((ip_address, port))
+            # The address comes from the host cache, so the connect is all that is timed
+            s.connect((resolve_host(ip_address), port))
             return True, f"Port {port} on {ip_address} is open."
 
     except socket.timeout:
@@ -465,7 +1934,7 @@ def check_udp_port(ip_address: str, port: int, timeout: int = 3) -> (bool, str):
 
             # Send a dummy packet to the specified IP address and port.
             # As UDP is connectionless, this does not establish a connection but merely sends the packet.
-            s.sendto(b"", (ip_address, port))
+            s.sendto(b"", (resolve_host(ip_address), port))
 
             try:
                 # Try to receive data from the socket.
@@ -503,6 +1972,8 @@ def local_tcp_echo(ip_address: str, port: int) -> (bool, str):
     generated lorem ipsum sentences as echo request messages to the server. The server should send the sentences back
     in echo reply messages for easy verification that the server is working properly.
     """
+    import lorem
+
     # Create results list
     results = []
 
@@ -514,7 +1985,7 @@ def local_tcp_echo(ip_address: str, port: int) -> (bool, str):
 
             # Attempt to connect to the specified IP address and port.
             # If the connection is successful, the port is open.
-            s.connect((ip_address, port))
+            s.connect((resolve_host(ip_address), port))
             results.append(f"Port {port} on {ip_address} is open.")
 
             # Get a random lorem ipsum sentence
@@ -2,23 +2,27 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.validation import Validator
 
+from config_io import RECORD_TYPES, TASK_SCHEMAS
 
-def monitor_choice_prompt(prompt_msg: str, configs: dict):
+
+def monitor_choice_prompt(prompt_msg: str, store):
     """
     Prompt user for choice of available monitors
     :param prompt_msg: message to display for prompt
-    :param configs: dictionary with monitor_service configs
+    :param store: ConfigStore with monitor_service configs
     :return: user input from prompt
     """
-    # Load configs
-    monitor_choices = []
-    for config in configs.values():
-        monitor_choices.append(f"IP: {config['IP']}, Port: {config['Port']}")
+    # Load monitors, without their tasks, keyed by how they are shown
+    monitors = {
+        f"IP: {ip}, Port: {port}": monitor_id
+        for monitor_id, ip, port in store.monitors()
+    }
+    monitor_choices = list(monitors)
 
     # Initialize auto-completer and validator for prompt session
     completer: WordCompleter = WordCompleter(monitor_choices, ignore_case=True)
     validator = Validator.from_callable(
-        lambda text: text in monitor_choices,
+        lambda text: text in monitors,
         error_message=f"This is not a valid command!",
         move_cursor_to_end=True,
     )
@@ -28,13 +32,9 @@ def monitor_choice_prompt(prompt_msg: str, configs: dict):
 
     # Prompt and return the input
     choice = prompt.prompt(f"{prompt_msg}")
-    for monitor, config in configs.items():
-        if choice == f"IP: {config['IP']}, Port: {config['Port']}":
-            monitor_id = monitor
-            host = config["IP"]
-            port = config["Port"]
-            services = config["Services"]
-    return monitor_id, host, port, services
+    monitor_id = monitors[choice]
+    config = store.get(monitor_id)
+    return monitor_id, config["IP"], config["Port"], config["Services"]
 
 
 def service_prompt(prompt_msg):
@@ -43,19 +43,8 @@ def service_prompt(prompt_msg):
     :param prompt_msg: prompt message defined in main
     :return: None
     """
-    # Define available services
-    services = [
-        "Ping",
-        "Tracert",
-        "HTTP",
-        "HTTPS",
-        "NTP",
-        "DNS",
-        "TCP",
-        "UDP",
-        "Echo",
-        "",
-    ]
+    # Define available services, the same ones a config import accepts
+    services = [*TASK_SCHEMAS, ""]
 
     # Initialize auto-completer and validator for prompt session
     completer: WordCompleter = WordCompleter(services, ignore_case=True)
@@ -78,21 +67,8 @@ def record_type_prompt(prompt_msg):
     :param prompt_msg: prompt message defined in main
     :return: user's input
     """
-    # Define available record types
-    record_types = [
-        "A",
-        "MX",
-        "AAAA",
-        "CNAME",
-        "ANAME",
-        "NS",
-        "SOA",
-        "TXT",
-        "PTR",
-        "SRV",
-        "SPF",
-        "",
-    ]
+    # Define available record types, the same ones a config import accepts
+    record_types = [*RECORD_TYPES, ""]
 
     # Initialize auto-completer for prompt session
     completer: WordCompleter = WordCompleter(record_types, ignore_case=True)
@@ -0,0 +1,369 @@
+import json
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Version of the wire protocol, sent in every frame header
+PROTOCOL_VERSION = 4
+
+# Frame header: version (1 byte), frame type (1 byte), payload length (4 bytes), in network byte order
+FRAME_HEADER = struct.Struct("!BBI")
+
+# Seconds of silence on a connection before a heartbeat is sent; a second silent interval means it is dead
+HEARTBEAT_INTERVAL = 30
+
+# Largest payload accepted, to stop a corrupt length from allocating unbounded memory
+MAX_PAYLOAD_SIZE = 16 * 1024 * 1024
+
+# Seconds a connection's writer waits after the first queued frame so frames queued meanwhile share one write
+FLUSH_DEADLINE = 0.002
+
+# Most buffers handed to one vectored write, kept under the usual IOV_MAX of 1024
+MAX_WRITE_BUFFERS = 512
+
+# Sequence number in front of the packed result in a RESULT payload
+RESULT_SEQUENCE = struct.Struct("!Q")
+
+
+class FrameType(IntEnum):
+    """Types of frames exchanged between the manager and a monitor"""
+
+    SET_ID = 1
+    START = 2
+    QUIT = 3
+    CONFIG = 4
+    RESULT = 5
+    ACK = 6
+    HEARTBEAT = 7
+    CURSOR = 8
+    DRAIN = 9
+    READY = 10
+    UPDATE = 11
+
+
+# Frames whose payload is already binary and is sent as is rather than JSON encoded
+BINARY_FRAME_TYPES = frozenset({FrameType.RESULT})
+
+
+class ProtocolError(ConnectionError):
+    """Raised when a peer sends a frame that can't be parsed, so callers can treat it like a broken connection"""
+
+
+def encode_payload(frame_type: FrameType, payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON, or as is for binary frames; None encodes to an empty payload"""
+    if payload is None:
+        return b""
+    if frame_type in BINARY_FRAME_TYPES:
+        return bytes(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def decode_payload(frame_type: FrameType, data: bytes) -> Any:
+    """Decode a payload encoded by encode_payload"""
+    if frame_type in BINARY_FRAME_TYPES:
+        return data
+    if not data:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise ProtocolError(f"Malformed frame payload: {e}")
+
+
+def encode_result(seq: int, result: bytes) -> bytes:
+    """Prefix a packed result with its sequence number to form a RESULT payload"""
+    return RESULT_SEQUENCE.pack(seq) + result
+
+
+def decode_result(payload: bytes) -> Tuple[int, bytes]:
+    """Split a RESULT payload into its sequence number and packed result"""
+    if len(payload) < RESULT_SEQUENCE.size:
+        raise ProtocolError("RESULT frame too short for a sequence number")
+    return RESULT_SEQUENCE.unpack_from(payload)[0], payload[RESULT_SEQUENCE.size :]
+
+
+def encode_frame(frame_type: FrameType, payload: Any = None) -> bytes:
+    """Encode one frame: the header followed by the encoded payload"""
+    data: bytes = encode_payload(frame_type, payload)
+    return FRAME_HEADER.pack(PROTOCOL_VERSION, frame_type, len(data)) + data
+
+
+def decode_header(header: bytes) -> Tuple[FrameType, int]:
+    """Validate a frame header and return its frame type and payload length"""
+    version, frame_type, length = FRAME_HEADER.unpack(header)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if length > MAX_PAYLOAD_SIZE:
+        raise ProtocolError(f"Frame payload of {length} bytes is too large")
+    try:
+        return FrameType(frame_type), length
+    except ValueError:
+        raise ProtocolError(f"Unknown frame type {frame_type}")
+
+
+def send_frame(sock: socket.socket, frame_type: FrameType, payload: Any = None) -> None:
+    """Send one frame over a socket"""
+    sock.sendall(encode_frame(frame_type, payload))
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Receive exactly size bytes, returning fewer only if the peer closes the connection"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Tuple[FrameType, Any]]:
+    """
+    Receive one frame from a socket.
+
+    Returns the frame type and decoded payload, or None if the peer closed the connection between frames.
+    Raises ProtocolError if the connection closes part way through a frame or the frame is invalid.
+    """
+    header: bytes = recv_exactly(sock, FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise ProtocolError("Connection closed part way through a frame header")
+
+    frame_type, length = decode_header(header)
+    data: bytes = recv_exactly(sock, length)
+    if len(data) < length:
+        raise ProtocolError("Connection closed part way through a frame payload")
+
+    return frame_type, decode_payload(frame_type, data)
+
+
+class FrameReader:
+    """
+    Incremental frame parser for data that arrives in arbitrary chunks.
+
+    Bytes are appended with feed() and every complete frame is returned; a partial frame stays buffered
+    until the rest of it arrives. Each byte is examined once, so nothing is rescanned.
+    """
+
+    def __init__(self):
+        self._buffer: bytearray = bytearray()
+        self._header: Optional[Tuple[FrameType, int]] = None
+
+    def feed(self, data: bytes) -> List[Tuple[FrameType, Any]]:
+        """Add received bytes and return the frames completed by them"""
+        self._buffer += data
+        frames: List[Tuple[FrameType, Any]] = []
+        offset: int = 0
+
+        while True:
+            # Parse the next header once enough bytes have arrived
+            if self._header is None:
+                if len(self._buffer) - offset < FRAME_HEADER.size:
+                    break
+                self._header = decode_header(
+                    self._buffer[offset : offset + FRAME_HEADER.size]
+                )
+                offset += FRAME_HEADER.size
+
+            # Then wait for the whole payload
+            frame_type, length = self._header
+            if len(self._buffer) - offset < length:
+                break
+            frames.append(
+                (
+                    frame_type,
+                    decode_payload(
+                        frame_type, bytes(self._buffer[offset : offset + length])
+                    ),
+                )
+            )
+            offset += length
+            self._header = None
+
+        # Drop the consumed bytes in one go
+        del self._buffer[:offset]
+        return frames
+
+
+class FrameWriter:
+    """
+    Single writer for everything sent over one connection.
+
+    Any thread can queue frames with send() or already encoded bytes with write(); a dedicated writer thread
+    drains the queue, waiting up to flush_deadline after the first frame so that frames queued by other threads
+    meanwhile go out together in one vectored write (sendmsg), in queue order and never interleaved. Once a
+    write fails the writer closes and queued frames are discarded, so callers must be able to recover them.
+    Queue depth, flushes and bytes per flush are exposed through metrics().
+
+    Bulk data, such as a backlog, is given as a drain: an iterator of bounded chunks of encoded frames. Queued
+    frames always go first; a chunk is only pulled to fill the rest of a write, and only once the socket is
+    writable, so the drain moves at the pace the peer reads and never holds up fresh frames for long.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        flush_deadline: float = FLUSH_DEADLINE,
+        max_buffers: int = MAX_WRITE_BUFFERS,
+    ):
+        self._socket: socket.socket = sock
+        self._flush_deadline: float = flush_deadline
+        self._max_buffers: int = max_buffers
+
+        # Outbound queue of encoded frames
+        self._queue: deque = deque()
+        self._condition: threading.Condition = threading.Condition()
+        self._closed: bool = False
+        self._stopping: bool = False
+
+        # Lower priority bulk data, pulled a chunk at a time
+        self._drain: Optional[Iterator[bytes]] = None
+
+        # Metrics
+        self._max_depth: int = 0
+        self._flushes: int = 0
+        self._frames: int = 0
+        self._bytes: int = 0
+        self._syscalls: int = 0
+        self._last_flush_bytes: int = 0
+
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name="frame-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        """Whether a write has failed or the writer has been closed"""
+        return self._closed
+
+    @property
+    def depth(self) -> int:
+        """Number of buffers waiting to be written"""
+        return len(self._queue)
+
+    def send(self, frame_type: FrameType, payload: Any = None) -> bool:
+        """Queue one frame, returning False if the writer is closed"""
+        return self.write(encode_frame(frame_type, payload))
+
+    def write(self, data: bytes) -> bool:
+        """Queue already encoded frames, returning False if the writer is closed"""
+        with self._condition:
+            if self._closed or self._stopping:
+                return False
+            self._queue.append(data)
+            self._max_depth = max(self._max_depth, len(self._queue))
+            self._condition.notify()
+            return True
+
+    def set_drain(self, drain: Iterator[bytes]) -> None:
+        """Send the chunks of a drain whenever nothing queued is waiting"""
+        with self._condition:
+            self._drain = drain
+            self._condition.notify()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write whatever is queued, abandoning any drain, then stop the writer thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._closed = True
+
+    def metrics(self) -> dict:
+        """Queue depth and write statistics of the connection"""
+        return {
+            "depth": len(self._queue),
+            "max_depth": self._max_depth,
+            "draining": self._drain is not None,
+            "frames": self._frames,
+            "flushes": self._flushes,
+            "syscalls": self._syscalls,
+            "bytes": self._bytes,
+            "last_flush_bytes": self._last_flush_bytes,
+            "bytes_per_flush": self._bytes / self._flushes if self._flushes else 0.0,
+        }
+
+    def _run(self) -> None:
+        """Drain the queue, coalescing whatever is ready into one write per flush"""
+        while True:
+            with self._condition:
+                while not self._queue and (self._drain is None or self._stopping):
+                    if self._stopping:
+                        return
+                    self._condition.wait()
+                queued: bool = bool(self._queue)
+
+            # Give other threads until the flush deadline to add to this write
+            if queued and len(self._queue) < self._max_buffers and not self._stopping:
+                time.sleep(self._flush_deadline)
+
+            with self._condition:
+                batch: List[bytes] = [
+                    self._queue.popleft()
+                    for _ in range(min(len(self._queue), self._max_buffers))
+                ]
+                drain = None if self._stopping else self._drain
+
+            # Top up the write with the next drain chunk, but only if the peer is keeping up
+            if (
+                drain is not None
+                and len(batch) < self._max_buffers
+                and self._writable()
+            ):
+                chunk: Optional[bytes] = next(drain, None)
+                if chunk is None:
+                    with self._condition:
+                        if self._drain is drain:
+                            self._drain = None
+                else:
+                    batch.append(chunk)
+            if not batch:
+                continue
+
+            try:
+                self._write(batch)
+            except OSError:
+                with self._condition:
+                    self._closed = True
+                    self._queue.clear()
+                return
+
+            self._flushes += 1
+            self._frames += len(batch)
+            self._last_flush_bytes = sum(len(data) for data in batch)
+            self._bytes += self._last_flush_bytes
+
+    def _writable(self) -> bool:
+        """Wait up to the flush deadline for the socket to have room for more data"""
+        try:
+            return bool(select.select([], [self._socket], [], self._flush_deadline)[1])
+        except (OSError, ValueError):
+            # Let the next write report the broken socket
+            return True
+
+    def _write(self, buffers: List[bytes]) -> None:
+        """Write every buffer, with vectored writes where the platform has them"""
+        if not hasattr(self._socket, "sendmsg"):
+            self._syscalls += 1
+            self._socket.sendall(b"".join(buffers))
+            return
+
+        views = [memoryview(data) for data in buffers]
+        while views:
+            sent: int = self._socket.sendmsg(views)
+            self._syscalls += 1
+
+            # Skip past what was written, which may end part way through a buffer
+            while views and sent >= len(views[0]):
+                sent -= len(views[0])
+                views.pop(0)
+            if views and sent:
+                views[0] = views[0][sent:]
@@ -0,0 +1,292 @@
+import json
+import math
+import shutil
+import struct
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+# Fixed-size part of a packed result: timestamp, latency (NaN if none), lateness, status,
+# and the lengths of the monitor id, task, target and detail that follow it
+RESULT_HEADER = struct.Struct("!ddf?HHHI")
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """
+    Structured outcome of one service check.
+
+    Checks fill in the task, target, status, latency and check-specific detail fields; the monitor adds its id
+    and how late the run started before sending the record to the manager, which renders it for display.
+    """
+
+    task: str
+    target: str
+    status: bool
+    latency: Optional[float] = None  # Milliseconds
+    detail: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+    monitor_id: str = ""
+    lateness: float = 0.0  # Milliseconds after the run was due that it started
+
+
+def make_result(task, target, status, latency=None, **detail) -> CheckResult:
+    """Build a check result, timestamped now, with any extra keyword arguments as its detail"""
+    return CheckResult(task, str(target), bool(status), latency, detail)
+
+
+def pack_result(result: CheckResult) -> bytes:
+    """Pack a check result into its compact binary wire form"""
+    monitor_id: bytes = result.monitor_id.encode("utf-8")
+    task: bytes = result.task.encode("utf-8")
+    target: bytes = result.target.encode("utf-8")
+    detail: bytes = json.dumps(result.detail, separators=(",", ":")).encode("utf-8")
+
+    return (
+        RESULT_HEADER.pack(
+            result.timestamp,
+            math.nan if result.latency is None else result.latency,
+            result.lateness,
+            result.status,
+            len(monitor_id),
+            len(task),
+            len(target),
+            len(detail),
+        )
+        + monitor_id
+        + task
+        + target
+        + detail
+    )
+
+
+def unpack_result(data: bytes) -> CheckResult:
+    """Unpack a check result from the form produced by pack_result"""
+    (
+        timestamp,
+        latency,
+        lateness,
+        status,
+        monitor_id_length,
+        task_length,
+        target_length,
+        detail_length,
+    ) = RESULT_HEADER.unpack_from(data)
+
+    # The variable-length fields follow the header back to back
+    view = memoryview(data)
+    offset: int = RESULT_HEADER.size
+    fields = []
+    for length in (monitor_id_length, task_length, target_length, detail_length):
+        fields.append(bytes(view[offset : offset + length]).decode("utf-8"))
+        offset += length
+    monitor_id, task, target, detail = fields
+
+    return CheckResult(
+        task,
+        target,
+        status,
+        None if math.isnan(latency) else latency,
+        json.loads(detail),
+        timestamp,
+        monitor_id,
+        lateness,
+    )
+
+
+def render_text(result: CheckResult) -> str:
+    """Render a check result as the timestamped, bannered text message shown by the manager"""
+    # Init msg
+    msg = ""
+
+    # Header
+    columns, lines = shutil.get_terminal_size()
+    msg += f"\n[{datetime.fromtimestamp(result.timestamp).strftime('%Y-%m-%d %H:%M:%S')}][Monitor: {result.monitor_id}] {result.task} Service Check (started {result.lateness:.0f} ms late) \n"
+    msg += "=" * columns + "\n"
+
+    # Body
+    renderer = RENDERERS.get(result.task)
+    msg += renderer(result.detail) if renderer else f"{result.detail}"
+
+    return msg
+
+
+def render_ping(detail):
+    """Render the results message of a ping test"""
+    msg = ""
+
+    # Ping Test
+    msg += "Ping Test:\n"
+    if detail["addr"] and detail["time"]:
+        msg += f"{detail['host']} (ping): {detail['addr']} - {detail['time']:.2f} ms\n"
+    else:
+        msg += f"{detail['host']} (ping): Request timed out or no reply received\n"
+
+    return msg
+
+
+def render_tracert(detail):
+    """Render the results message of a traceroute test"""
+    msg = ""
+
+    # Traceroute Test
+    msg += "\nTraceroute Test:\n"
+    msg += f"{detail['host']} (traceroute):\n"
+    msg += detail["table"]
+
+    return msg
+
+
+def render_http_timing(detail):
+    """Render the per-phase timing of an http or https test, or nothing for results that have none"""
+    timing = detail.get("timing")
+    if not timing:
+        return ""
+    return (
+        f"\nTiming: DNS {timing['dns']:.1f} ms, Connect {timing['connect']:.1f} ms, TLS {timing['tls']:.1f} ms, "
+        f"TTFB {timing['ttfb']:.1f} ms, Transfer {timing['transfer']:.1f} ms "
+        f"({timing['connections']} new connection{'' if timing['connections'] == 1 else 's'})"
+    )
+
+
+def render_http(detail):
+    """Render the results message of an http test"""
+    msg = ""
+
+    # HTTP Request
+    msg += f"Sending HTTP Request to {detail['url']} ... \n"
+    msg += f"HTTP URL: {detail['url']}, HTTP server status: {detail['up']}, Status Code: {detail['code'] if detail['code'] is not None else 'N/A'}"
+    msg += render_http_timing(detail)
+
+    return msg
+
+
+def render_https(detail):
+    """Render the results message of an https test"""
+    msg = ""
+
+    # HTTP Request
+    msg += f"Sending HTTPS Request to {detail['url']} ... \n"
+    msg += f"HTTPS URL: {detail['url']}, HTTPS server status: {detail['up']}, Status Code: {detail['code'] if detail['code'] is not None else 'N/A'}, Description: {detail['description']}"
+    msg += render_http_timing(detail)
+
+    return msg
+
+
+def render_ntp(detail):
+    """Render the results message of an ntp test"""
+    msg = ""
+
+    # NTP Test
+    msg += f"Testing Status of NTP Server {detail['server']} ... \n"
+
+    # Results from monitors that predate per-server measurements only have the status and time
+    if "servers" not in detail:
+        msg += (
+            f"{detail['server']} is up. Time: {detail['time']}"
+            if detail["up"]
+            else f"{detail['server']} is down."
+        )
+        return msg
+
+    lines = []
+    for server, result in detail["servers"].items():
+        if result["up"]:
+            jitter = (
+                f"{result['jitter']:.3f} ms" if result["jitter"] is not None else "N/A"
+            )
+            lines.append(
+                f"{server} is up. Time: {result['time']}, Offset: {result['offset']:.3f} ms, "
+                f"Delay: {result['delay']:.3f} ms, Stratum: {result['stratum']}, Jitter: {jitter}"
+            )
+        else:
+            lines.append(f"{server} is down. {result['error']}")
+    msg += "\n".join(lines)
+
+    return msg
+
+
+def render_dns(detail):
+    """Render the results message of a dns test"""
+    msg = ""
+
+    # DNS Test
+    msg += f"Querying DNS Server {detail['server']} with Server {detail['query']} ... "
+    for (
+        dns_record_type,
+        dns_server_status,
+        dns_query_results,
+        *dns_query_latency,
+    ) in detail["records"]:
+        msg += f"\nDNS Server: {detail['server']}, Status: {dns_server_status}, {dns_record_type} Records Results: {dns_query_results}"
+        # Results from monitors that predate per-query latency have none
+        if dns_query_latency and dns_query_latency[0] is not None:
+            msg += f", Latency: {dns_query_latency[0]:.2f} ms"
+
+    return msg
+
+
+def render_tcp(detail):
+    """Render the results message of a tcp test"""
+    msg = ""
+
+    # TCP test
+    msg += f"Testing TCP to Server {detail['server']} at Port {detail['port']} ... \n"
+    msg += f"Server: {detail['server']}, TCP Port: {detail['port']}, TCP Port Status: {detail['open']}, Description: {detail['description']}"
+
+    return msg
+
+
+def render_udp(detail):
+    """Render the results message of a udp test"""
+    msg = ""
+
+    # UDP test
+    msg += f"Testing UDP to Server {detail['server']} at Port {detail['port']} ... \n"
+    msg += f"Server: {detail['server']}, UDP Port: {detail['port']}, UDP Port Status: {detail['open']}, Description: {detail['description']}"
+
+    return msg
+
+
+def render_echo(detail):
+    """Render the results message of an echo test"""
+    msg = ""
+
+    # TCP test
+    msg += f"Testing TCP to Local Server {detail['server']} at Port {detail['port']} ... \n"
+    msg += f"Server: {detail['server']}, TCP Port: {detail['port']}, TCP Port Status: {detail['open']}, Description: {detail['description']}"
+
+    return msg
+
+
+def render_sweep(detail):
+    """Render the results message of a ping sweep test"""
+    msg = ""
+
+    # Ping Sweep Test
+    msg += f"Ping Sweep Test of {detail['targets']}:\n"
+    msg += f"{'Host':<15} {'Sent':>5} {'Recv':>5} {'Loss':>6}   {'Min (ms)':>8}   {'Avg (ms)':>8}   {'Max (ms)':>8}"
+    for host, result in detail["hosts"].items():
+        rtts = result["rtts"]
+        if rtts:
+            msg += f"\n{host:<15} {result['sent']:>5} {result['received']:>5} {result['loss']:>5.1f}% {min(rtts):>8.2f}ms {sum(rtts) / len(rtts):>8.2f}ms {max(rtts):>8.2f}ms"
+        else:
+            msg += f"\n{host:<15} {result['sent']:>5} {0:>5} {result['loss']:>5.1f}% {'*':>8}   {'*':>8}   {'*':>8}"
+
+    return msg
+
+
+# Text renderer for the detail of each task type
+RENDERERS = {
+    "Ping": render_ping,
+    "Tracert": render_tracert,
+    "HTTP": render_http,
+    "HTTPS": render_https,
+    "NTP": render_ntp,
+    "DNS": render_dns,
+    "TCP": render_tcp,
+    "UDP": render_udp,
+    "Echo": render_echo,
+    "Sweep": render_sweep,
+}
@@ -0,0 +1,188 @@
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Optional
+
+# Fractional part of the golden ratio, used to spread tasks sharing a frequency across their interval
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class ScheduledCheck:
+    """A check registered with the scheduler, with its fixed-rate timing state"""
+
+    __slots__ = (
+        "callback",
+        "frequency",
+        "next_run",
+        "running",
+        "cancelled",
+        "runs",
+        "skipped",
+        "future",
+    )
+
+    def __init__(self, callback: Callable, frequency: float, first_run: float):
+        self.callback: Callable = callback
+        self.frequency: float = frequency
+        self.next_run: float = first_run
+        self.running: bool = False
+        self.cancelled: bool = False
+        self.runs: int = 0
+        self.skipped: int = 0
+        self.future: Optional[concurrent.futures.Future] = None
+
+
+class CheckScheduler:
+    """
+    Central fixed-rate scheduler for every task of a monitor.
+
+    One timer thread keeps the registered checks in a heap ordered by their next run time and hands each
+    due check to a submit function, by default a bounded thread pool. Runs are scheduled at a fixed rate,
+    so each run is due exactly one frequency after the previous run was due, however long the check took.
+    The callback is passed the monotonic time the run was due, from which it can report how late it started.
+    A run that comes due while the previous one is still in flight is skipped and counted rather than queued.
+    Checks sharing a frequency are spread across the interval by golden-ratio phase offsets so they do not
+    all fire in the same second.
+    """
+
+    def __init__(self, max_workers: int = 16, submit: Optional[Callable] = None):
+        # Heap of (next_run, tiebreaker, check)
+        self._heap: list = []
+        self._counter = itertools.count()
+        self._condition: threading.Condition = threading.Condition()
+
+        # Number of checks ever added per frequency, for spreading phases
+        self._frequency_counts: dict = {}
+
+        # Workers the due checks are dispatched into
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if submit is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="check-worker"
+            )
+            submit = self._executor.submit
+        self._submit: Callable = submit
+
+        # Timer thread
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: bool = False
+
+    def start(self) -> None:
+        """Start the timer thread"""
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="check-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the timer thread and wait for in-flight checks to finish"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def add(
+        self, callback: Callable, frequency: float, delay: float = 0
+    ) -> ScheduledCheck:
+        """
+        Register a check to run every frequency seconds.
+
+        The first run is due after delay seconds plus the check's phase offset within its interval.
+        """
+        with self._condition:
+            count: int = self._frequency_counts.get(frequency, 0)
+            self._frequency_counts[frequency] = count + 1
+            phase: float = (count * GOLDEN_RATIO_FRACTION % 1) * frequency
+
+            check = ScheduledCheck(
+                callback, frequency, time.monotonic() + delay + phase
+            )
+            heapq.heappush(self._heap, (check.next_run, next(self._counter), check))
+            self._condition.notify()
+        return check
+
+    def remove(self, check: ScheduledCheck, wait: bool = True) -> None:
+        """Unregister a check, optionally waiting for a run in flight to finish"""
+        check.cancelled = True
+        if wait and check.future:
+            concurrent.futures.wait([check.future])
+
+    def set_frequency(self, check: ScheduledCheck, frequency: float) -> None:
+        """Change how often a check runs, keeping its phase: the next run becomes due one new interval after the last"""
+        with self._condition:
+            check.next_run += frequency - check.frequency
+            check.frequency = frequency
+            heapq.heappush(self._heap, (check.next_run, next(self._counter), check))
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Pop due checks off the heap, reschedule them at a fixed rate and dispatch them"""
+        while True:
+            with self._condition:
+                # Sleep until the earliest check is due, or something changes
+                while not self._stopped:
+                    if self._heap and self._heap[0][0] <= time.monotonic():
+                        break
+                    timeout = (
+                        self._heap[0][0] - time.monotonic() if self._heap else None
+                    )
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+
+                next_run, _, check = heapq.heappop(self._heap)
+
+                # Skip removed checks and entries left behind by a frequency change
+                if check.cancelled or next_run != check.next_run:
+                    continue
+
+                # Fixed rate: the next run is due one interval after this one was due,
+                # skipping whole intervals if the scheduler itself fell behind
+                due: float = check.next_run
+                check.next_run += check.frequency
+                now: float = time.monotonic()
+                if check.next_run <= now:
+                    missed = int((now - check.next_run) // check.frequency) + 1
+                    check.next_run += missed * check.frequency
+                    check.skipped += missed
+                heapq.heappush(self._heap, (check.next_run, next(self._counter), check))
+
+                # Don't overlap runs of the same check
+                if check.running:
+                    check.skipped += 1
+                    continue
+                check.running = True
+
+            self._dispatch(check, due)
+
+    def _dispatch(self, check: ScheduledCheck, due: float) -> None:
+        """Hand a due check to the workers"""
+        check.runs += 1
+        try:
+            check.future = self._submit(check.callback, due)
+        except RuntimeError:
+            # The workers have been shut down
+            check.running = False
+            return
+        check.future.add_done_callback(lambda future: self._finished(check, future))
+
+    @staticmethod
+    def _finished(check: ScheduledCheck, future: concurrent.futures.Future) -> None:
+        """Mark a check as no longer running and log any exception it raised, which would otherwise be lost"""
+        check.running = False
+        if future.cancelled():
+            return
+        error: Optional[BaseException] = future.exception()
+        if error is not None:
+            print(
+                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}][Scheduler] - check run {check.runs} raised {type(error).__name__}: {error}"
+            )
+            traceback.print_exception(type(error), error, error.__traceback__)
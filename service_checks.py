@@ -1,7 +1,23 @@
 from network_tests import *
-
-
-def run_service_check(task, params):
+from async_network_tests import *
+from results import CheckResult, make_result
+
+# Task types a monitor can run
+SERVICE_TASKS = (
+    "Ping",
+    "Tracert",
+    "HTTP",
+    "HTTPS",
+    "NTP",
+    "DNS",
+    "TCP",
+    "UDP",
+    "Echo",
+    "Sweep",
+)
+
+
+def run_service_check(task, params) -> CheckResult:
     """Passes the params to the necessary service check and performs it"""
     if task == "Ping":
         return ping_service_check(*params)
@@ -21,123 +37,304 @@ def run_service_check(task, params):
         return udp_service_check(*params)
     elif task == "Echo":
         return echo_service_check(*params)
+    elif task == "Sweep":
+        return sweep_service_check(*params)
+
+
+async def run_service_check_async(task, params) -> CheckResult:
+    """Passes the params to the necessary asyncio service check and performs it"""
+    if task == "Ping":
+        return await ping_service_check_async(*params)
+    elif task == "Tracert":
+        return await tracert_service_check_async(*params)
+    elif task == "HTTP":
+        return await http_service_check_async(*params)
+    elif task == "HTTPS":
+        return await https_service_check_async(*params)
+    elif task == "NTP":
+        return await ntp_service_check_async(*params)
+    elif task == "DNS":
+        return await dns_service_check_async(*params)
+    elif task == "TCP":
+        return await tcp_service_check_async(*params)
+    elif task == "UDP":
+        return await udp_service_check_async(*params)
+    elif task == "Echo":
+        return await echo_service_check_async(*params)
+    elif task == "Sweep":
+        return await sweep_service_check_async(*params)
+
+
+def timed(check, *args):
+    """Run a check and return its results along with how long it took in milliseconds, less any time spent
+    resolving host names"""
+    token = resolving_time.set([0.0])
+    try:
+        start = time.perf_counter()
+        results = check(*args)
+        return results, (time.perf_counter() - start - resolving_time.get()[0]) * 1000
+    finally:
+        resolving_time.reset(token)
+
+
+async def timed_async(check, *args):
+    """Await a check and return its results along with how long it took in milliseconds, less any time spent
+    resolving host names"""
+    token = resolving_time.set([0.0])
+    try:
+        start = time.perf_counter()
+        results = await check(*args)
+        return results, (time.perf_counter() - start - resolving_time.get()[0]) * 1000
+    finally:
+        resolving_time.reset(token)
 
 
 def ping_service_check(host, ttl, timeout, sequence_number):
-    """Perform ping test and return results message"""
-    msg = ""
+    """Perform ping test and return its result"""
+    return ping_result(host, *ping(host, ttl, timeout, sequence_number))
+
 
-    # Ping Test
-    msg += "Ping Test:\n"
-    ping_addr, ping_time = ping(host, ttl, timeout, sequence_number)
-    if ping_addr and ping_time:
-        msg += f"{host} (ping): {ping_addr[0]} - {ping_time:.2f} ms\n"
-    else:
-        msg += f"{host} (ping): Request timed out or no reply received\n"
+async def ping_service_check_async(host, ttl, timeout, sequence_number):
+    """Perform ping test on the event loop and return its result"""
+    return ping_result(host, *await async_ping(host, ttl, timeout, sequence_number))
 
-    return msg
 
+def ping_result(host, ping_addr, ping_time):
+    """Build the result record of a ping test"""
+    return make_result(
+        "Ping",
+        host,
+        bool(ping_addr and ping_time),
+        ping_time,
+        host=host,
+        addr=ping_addr[0] if ping_addr else None,
+        time=ping_time,
+    )
 
-def tracert_service_check(host, max_hops, pings_per_hop, verbose):
-    """Perform traceroute test and return results message"""
-    msg = ""
 
-    # Traceroute Test
-    msg += "\nTraceroute Test:\n"
-    msg += f"{host} (traceroute):\n"
-    msg += traceroute(host, max_hops, pings_per_hop, verbose)
+def tracert_service_check(host, max_hops, pings_per_hop, verbose, parallel=False):
+    """Perform traceroute test and return its result"""
+    return tracert_result(
+        host, *timed(traceroute, host, max_hops, pings_per_hop, verbose, parallel)
+    )
 
-    return msg
 
+async def tracert_service_check_async(
+    host, max_hops, pings_per_hop, verbose, parallel=False
+):
+    """Perform traceroute test on the event loop and return its result"""
+    return tracert_result(
+        host,
+        *await timed_async(
+            async_traceroute, host, max_hops, pings_per_hop, verbose, parallel
+        ),
+    )
 
-def http_service_check(url):
-    """Perform http test and return results message"""
-    msg = ""
 
-    # HTTP Request
-    msg += f"Sending HTTP Request to {url} ... \n"
-    http_server_status, http_server_response_code = check_server_http(url)
-    msg += f"HTTP URL: {url}, HTTP server status: {http_server_status}, Status Code: {http_server_response_code if http_server_response_code is not None else 'N/A'}"
+def tracert_result(host, table, latency):
+    """Build the result record of a traceroute test"""
+    return make_result("Tracert", host, True, latency, host=host, table=table)
 
-    return msg
 
+def http_service_check(url, timeout=HTTP_TIMEOUT, mode="stream"):
+    """Perform http test and return its result"""
+    return http_result(url, *timed(check_server_http, url, timeout, mode))
 
-def https_service_check(url, timeout):
-    """Perform https test and return results message"""
-    msg = ""
 
-    # HTTP Request
-    msg += f"Sending HTTPS Request to {url} ... \n"
-    https_server_status, https_server_response_code, description = check_server_https(
-        url, timeout
+async def http_service_check_async(url, timeout=HTTP_TIMEOUT, mode="stream"):
+    """Perform http test on the event loop and return its result"""
+    return http_result(
+        url, *await timed_async(async_check_server_http, url, timeout, mode)
     )
-    msg += f"HTTPS URL: {url}, HTTPS server status: {https_server_status}, Status Code: {https_server_response_code if https_server_response_code is not None else 'N/A'}, Description: {description}"
 
-    return msg
 
+def http_result(url, results, latency):
+    """Build the result record of an http test"""
+    http_server_status, http_server_response_code, timing = results
+    return make_result(
+        "HTTP",
+        url,
+        http_server_status,
+        latency,
+        url=url,
+        up=http_server_status,
+        code=http_server_response_code,
+        timing=timing,
+    )
+
+
+def https_service_check(url, timeout, mode="stream"):
+    """Perform https test and return its result"""
+    return https_result(url, *timed(check_server_https, url, timeout, mode))
 
-def ntp_service_check(server):
-    """Perform ntp test and return results message"""
-    msg = ""
 
-    # NTP Test
-    msg += f"Testing Status of NTP Server {server} ... \n"
-    ntp_server_status, ntp_server_time = check_ntp_server(server)
-    msg += (
-        f"{server} is up. Time: {ntp_server_time}"
-        if ntp_server_status
-        else f"{server} is down."
+async def https_service_check_async(url, timeout, mode="stream"):
+    """Perform https test on the event loop and return its result"""
+    return https_result(
+        url, *await timed_async(async_check_server_https, url, timeout, mode)
     )
 
-    return msg
+
+def https_result(url, results, latency):
+    """Build the result record of an https test"""
+    https_server_status, https_server_response_code, description, timing = results
+    return make_result(
+        "HTTPS",
+        url,
+        https_server_status,
+        latency,
+        url=url,
+        up=https_server_status,
+        code=https_server_response_code,
+        description=description,
+        timing=timing,
+    )
+
+
+def ntp_service_check(server):
+    """Perform ntp test, probing every server it lists at once, and return its result"""
+    return ntp_result(server, *timed(check_ntp_servers, server))
+
+
+async def ntp_service_check_async(server):
+    """Perform ntp test on the event loop, probing every server it lists at once, and return its result"""
+    return ntp_result(server, *await timed_async(async_check_ntp_servers, server))
+
+
+def ntp_result(server, servers, latency):
+    """Build the result record of an ntp test from the results of each of its servers"""
+    ntp_server_status = bool(servers) and all(
+        result["up"] for result in servers.values()
+    )
+    ntp_server_time = next(
+        (result["time"] for result in servers.values() if result["up"]), None
+    )
+    return make_result(
+        "NTP",
+        server,
+        ntp_server_status,
+        latency,
+        server=server,
+        up=ntp_server_status,
+        time=ntp_server_time,
+        servers=servers,
+    )
 
 
 def dns_service_check(server, query, record_types):
-    """Perform dns test and return results message"""
-    msg = ""
+    """Perform dns test, querying all record types at once, and return its result"""
+    return dns_result(
+        server, query, *timed(check_dns_server_records, server, query, record_types)
+    )
+
+
+async def dns_service_check_async(server, query, record_types):
+    """Perform dns test on the event loop, querying all record types at once, and return its result"""
+    return dns_result(
+        server,
+        query,
+        *await timed_async(async_check_dns_server_records, server, query, record_types),
+    )
 
-    # DNS Test
-    msg += f"Querying DNS Server {server} with Server {query} ... "
-    for dns_record_type in record_types:
-        dns_server_status, dns_query_results = check_dns_server_status(
-            server, query, dns_record_type
-        )
-        msg += f"\nDNS Server: {server}, Status: {dns_server_status}, {dns_record_type} Records Results: {dns_query_results}"
 
-    return msg
+def dns_result(server, query, records, latency):
+    """Build the result record of a dns test from (record type, status, query results, latency) tuples"""
+    return make_result(
+        "DNS",
+        server,
+        all(status for _, status, _, _ in records),
+        latency,
+        server=server,
+        query=query,
+        records=records,
+    )
 
 
 def tcp_service_check(ip_address, port):
-    """Perform tcp test and return results message"""
-    msg = ""
+    """Perform tcp test and return its result"""
+    return port_result(
+        "TCP", ip_address, port, *timed(check_tcp_port, ip_address, port)
+    )
 
-    # TCP test
-    msg += f"Testing TCP to Server {ip_address} at Port {port} ... \n"
-    tcp_port_status, tcp_port_description = check_tcp_port(ip_address, port)
-    msg += f"Server: {ip_address}, TCP Port: {port}, TCP Port Status: {tcp_port_status}, Description: {tcp_port_description}"
 
-    return msg
+async def tcp_service_check_async(ip_address, port):
+    """Perform tcp test on the event loop and return its result"""
+    return port_result(
+        "TCP",
+        ip_address,
+        port,
+        *await timed_async(async_check_tcp_port, ip_address, port),
+    )
 
 
 def udp_service_check(ip_address, port, timeout):
-    """Perform udp test and return results message"""
-    msg = ""
+    """Perform udp test and return its result"""
+    return port_result(
+        "UDP", ip_address, port, *timed(check_udp_port, ip_address, port, timeout)
+    )
 
-    # TCP test
-    msg += f"Testing UDP to Server {ip_address} at Port {port} ... \n"
-    udp_port_status, udp_port_description = check_udp_port(ip_address, port, timeout)
-    msg += f"Server: {ip_address}, UDP Port: {port}, UDP Port Status: {udp_port_status}, Description: {udp_port_description}"
 
-    return msg
+async def udp_service_check_async(ip_address, port, timeout):
+    """Perform udp test on the event loop and return its result"""
+    return port_result(
+        "UDP",
+        ip_address,
+        port,
+        *await timed_async(async_check_udp_port, ip_address, port, timeout),
+    )
 
 
 def echo_service_check(ip_address, port):
-    """Perform echo test and return results message"""
-    msg = ""
+    """Perform echo test and return its result"""
+    return port_result(
+        "Echo", ip_address, port, *timed(local_tcp_echo, ip_address, port)
+    )
+
+
+async def echo_service_check_async(ip_address, port):
+    """Perform echo test on the event loop and return its result"""
+    return port_result(
+        "Echo",
+        ip_address,
+        port,
+        *await timed_async(async_local_tcp_echo, ip_address, port),
+    )
+
+
+def port_result(task, ip_address, port, results, latency):
+    """Build the result record of a tcp, udp or echo test"""
+    status, description = results
+    return make_result(
+        task,
+        f"{ip_address}:{port}",
+        status,
+        latency,
+        server=ip_address,
+        port=port,
+        open=status,
+        description=description,
+    )
 
-    # TCP test
-    msg += f"Testing TCP to Local Server {ip_address} at Port {port} ... \n"
-    status, description = local_tcp_echo(ip_address, port)
-    msg += f"Server: {ip_address}, TCP Port: {port}, TCP Port Status: {status}, Description: {description}"
 
-    return msg
+def sweep_service_check(targets, timeout, count):
+    """Perform ping sweep test and return its result"""
+    return sweep_result(targets, *timed(ping_sweep, targets, timeout, count))
+
+
+async def sweep_service_check_async(targets, timeout, count):
+    """Perform ping sweep test on the event loop and return its result"""
+    return sweep_result(
+        targets, *await timed_async(async_ping_sweep, targets, timeout, count)
+    )
+
+
+def sweep_result(targets, hosts, latency):
+    """Build the result record of a ping sweep test"""
+    return make_result(
+        "Sweep",
+        targets,
+        any(host["received"] for host in hosts.values()),
+        latency,
+        targets=targets,
+        hosts=hosts,
+    )
@@ -0,0 +1,67 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import network_tests
+from network_tests import HostCache
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Host names resolved by a stand-in getaddrinfo, which fails for names listed in lookups.failing"""
+
+    class Lookups(list):
+        pass
+
+    names = Lookups()
+    names.failing = set()
+
+    def getaddrinfo(host, *args, **kwargs):
+        names.append(host)
+        if host in names.failing:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return names
+
+
+def wait_for_prefetches():
+    """Wait until no background refresh is running"""
+    deadline = time.monotonic() + 5
+    while any(thread.name == "host-prefetch" for thread in threading.enumerate()):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_refresh_is_not_retried_on_every_hit(lookups):
+    cache = HostCache(ttl=0.4, negative_ttl=10)
+    assert cache.resolve("a.test") == ["192.0.2.1"]
+
+    # Past the prefetch point, the next hit refreshes the name in the background, and that lookup fails
+    time.sleep(0.4 * network_tests.HOST_CACHE_PREFETCH + 0.02)
+    lookups.failing.add("a.test")
+    for _ in range(20):
+        assert cache.resolve("a.test") == ["192.0.2.1"]
+        wait_for_prefetches()
+
+    assert lookups == ["a.test", "a.test"]
+    assert cache.stats()["prefetches"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_the_cap(lookups, monkeypatch):
+    monkeypatch.setattr(network_tests, "HOST_CACHE_SIZE", 3)
+    cache = HostCache()
+    for name in ("a.test", "b.test", "c.test"):
+        cache.resolve(name)
+
+    # Using a.test makes b.test the least recently used
+    cache.resolve("a.test")
+    cache.resolve("d.test")
+
+    assert cache.stats()["entries"] == 3
+    assert cache.cached("b.test") is None
+    assert cache.cached("a.test") == ["192.0.2.1"]
+    assert cache.cached("c.test") == ["192.0.2.1"]
@@ -0,0 +1,51 @@
+import os
+import random
+
+import pytest
+
+import network_tests
+from network_tests import (
+    IcmpPacketBuilder,
+    calculate_icmp_checksum,
+    create_icmp_packet,
+    fast_icmp_checksum,
+)
+
+# Identifiers and sequence numbers around the byte and word boundaries, where carries fold back in
+BOUNDARY_VALUES = [0, 1, 0x00FF, 0x0100, 0x7FFF, 0x8000, 0xFF00, 0xFFFE, 0xFFFF]
+
+
+@pytest.mark.parametrize("icmp_id", BOUNDARY_VALUES + [0x1234, 0xBEEF])
+@pytest.mark.parametrize("data_size", [0, 56, 192, 1500])
+def test_built_packets_checksum_to_zero(icmp_id, data_size):
+    builder = IcmpPacketBuilder(icmp_id, data_size)
+
+    # Count up through the wrap from 0xFFFF back to 0, as the ICMP engine allocates them
+    sequence_numbers = BOUNDARY_VALUES + [(0xFFF0 + i) & 0xFFFF for i in range(32)]
+    sequence_numbers += random.Random(icmp_id).sample(range(0x10000), 200)
+
+    for sequence_number in sequence_numbers:
+        packet = builder.build(sequence_number)
+        assert calculate_icmp_checksum(packet) == 0, sequence_number
+        assert fast_icmp_checksum(packet) == 0, sequence_number
+
+
+@pytest.mark.parametrize("icmp_id", [0, 0x1234, 0xFFFF])
+def test_built_packets_match_create_icmp_packet(icmp_id, monkeypatch):
+    # Both pick one payload character at random, so make it the same one
+    monkeypatch.setattr(network_tests.random, "choice", lambda choices: "x")
+    builder = IcmpPacketBuilder(icmp_id)
+
+    for sequence_number in [0, 1, 0x1234, 0xFFFE, 0xFFFF]:
+        assert builder.build(sequence_number) == create_icmp_packet(
+            sequence_number=sequence_number, icmp_id=icmp_id
+        )
+
+
+@pytest.mark.parametrize("size", [0, 2, 64, 1023, 1024, 4096])
+def test_fast_checksum_matches_reference(size):
+    data = os.urandom(size)
+
+    # The reference checksum needs whole 16-bit words, so pad odd data the way the fast one does
+    padded = data + b"\x00" * (size % 2)
+    assert fast_icmp_checksum(data) == calculate_icmp_checksum(padded)
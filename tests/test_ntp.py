@@ -0,0 +1,252 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+import network_tests
+from async_network_tests import async_check_ntp_servers
+from network_tests import (
+    NTP_EPOCH_OFFSET,
+    NTP_PACKET,
+    NtpEngine,
+    check_ntp_servers,
+    close_ntp_engine,
+    get_host_cache,
+)
+from service_checks import timed, timed_async
+
+SERVER = "127.0.0.1"
+
+
+def ntp_timestamp(unix_time: float) -> tuple:
+    """Seconds and fraction of the NTP timestamp for a Unix time"""
+    ntp_time: float = unix_time + NTP_EPOCH_OFFSET
+    seconds = int(ntp_time)
+    return seconds, int((ntp_time - seconds) * 2**32)
+
+
+class NtpResponder:
+    """
+    Stand-in NTP server on a localhost UDP port, answering each request as it is currently configured.
+
+    Its clock runs offsets[n] seconds ahead for the nth reply, cycling through them. Half of delay is spent
+    before the request is timestamped and half after the reply is, as if on the network, and hold between the
+    two, as server processing a client must leave out of the round trip. A decoy is a reply sent first whose
+    originate timestamp doesn't match the request, with stratum 15 and a clock a hundred seconds out.
+    """
+
+    def __init__(self):
+        self.offsets: list = [0.0]
+        self.stratum: int = 2
+        self.leap: int = 0
+        self.kiss: str | None = None
+        self.delay: float = 0.0
+        self.hold: float = 0.0
+        self.decoy: bool = False
+        self.answer: bool = True
+        self.replies: int = 0
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((SERVER, 0))
+        self._socket.settimeout(0.1)
+        self.port: int = self._socket.getsockname()[1]
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        self._socket.close()
+
+    def _serve(self):
+        while not self._closed.is_set():
+            try:
+                data, addr = self._socket.recvfrom(512)
+            except socket.timeout:
+                continue
+            request = NTP_PACKET.unpack_from(data)
+            originate = request[13], request[14]
+
+            time.sleep(self.delay / 2)
+            offset: float = self.offsets[self.replies % len(self.offsets)]
+            received: float = time.time() + offset
+            time.sleep(self.hold)
+            transmitted: float = time.time() + offset
+            time.sleep(self.delay / 2)
+
+            if self.decoy:
+                self._reply(
+                    addr,
+                    15,
+                    (originate[0], originate[1] ^ 1),
+                    received + 100,
+                    transmitted + 100,
+                )
+            if self.answer:
+                self._reply(addr, self.stratum, originate, received, transmitted)
+            self.replies += 1
+
+    def _reply(
+        self, addr, stratum: int, originate: tuple, received: float, transmitted: float
+    ):
+        ref_id: int = int.from_bytes(
+            (self.kiss or "GPS").encode().ljust(4, b"\x00"), "big"
+        )
+        packet: bytes = NTP_PACKET.pack(
+            self.leap << 6 | 4 << 3 | NtpEngine.MODE_SERVER,
+            0 if self.kiss else stratum,
+            6,
+            -20,
+            0,
+            0,
+            ref_id,
+            *ntp_timestamp(transmitted - 10),
+            *originate,
+            *ntp_timestamp(received),
+            *ntp_timestamp(transmitted),
+        )
+        self._socket.sendto(packet, addr)
+
+
+@pytest.fixture
+def responder(monkeypatch):
+    """A stand-in NTP server, which the engine sends its requests to"""
+    server = NtpResponder()
+    monkeypatch.setattr(network_tests, "NTP_PORT", server.port)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def engine():
+    """An NTP engine of the test's own, so offsets kept for jitter don't leak between tests"""
+    ntp_engine = NtpEngine()
+    ntp_engine.start()
+    yield ntp_engine
+    ntp_engine.close()
+
+
+def test_offset_delay_and_stratum(responder, engine):
+    responder.offsets = [0.25]
+    responder.delay = 0.04
+    responder.hold = 0.03
+    responder.stratum = 3
+
+    result = engine.query([SERVER], timeout=2)[SERVER]
+
+    assert result["up"] is True
+    assert result["offset"] == pytest.approx(250, abs=5)
+    # The server's hold time is left out of the round trip
+    assert 40 <= result["delay"] < 60
+    assert result["stratum"] == 3
+    assert result["jitter"] is None
+    assert result["time"]
+
+
+def test_jitter_is_rms_of_successive_offset_differences(responder, engine):
+    responder.offsets = [0.0, 0.01]
+
+    results = [engine.query([SERVER], timeout=2)[SERVER] for _ in range(4)]
+
+    assert all(result["up"] for result in results)
+    assert results[0]["jitter"] is None
+    assert results[-1]["jitter"] == pytest.approx(10, abs=2)
+
+
+def test_kiss_o_death(responder, engine):
+    responder.kiss = "RATE"
+
+    result = engine.query([SERVER], timeout=2)[SERVER]
+
+    assert result == {"up": False, "stratum": 0, "error": "Kiss-o'-death RATE"}
+
+
+def test_unsynchronised_server(responder, engine):
+    responder.leap = NtpEngine.LEAP_UNSYNCHRONISED
+
+    result = engine.query([SERVER], timeout=2)[SERVER]
+
+    assert result["up"] is False
+    assert result["error"] == "Server clock is not synchronised"
+
+
+def test_reply_with_mismatched_originate_is_dropped(responder, engine):
+    responder.decoy = True
+
+    result = engine.query([SERVER], timeout=2)[SERVER]
+
+    # The decoy arrives first, but only the reply carrying the request's timestamp is measured
+    assert result["up"] is True
+    assert result["stratum"] == 2
+    assert abs(result["offset"]) < 50
+
+
+def test_only_mismatched_replies_is_no_reply(responder, engine):
+    responder.decoy = True
+    responder.answer = False
+
+    result = engine.query([SERVER], timeout=0.5)[SERVER]
+
+    assert responder.replies == 1
+    assert result == {"up": False, "error": "No reply received"}
+
+
+def test_refused_request_keeps_receiving(responder, engine, monkeypatch):
+    # With nothing listening on the port, the request comes back as an ICMP port unreachable
+    responder.close()
+    assert engine.query([SERVER], timeout=0.5)[SERVER]["up"] is False
+    assert engine._receiver.is_alive()
+
+    replacement = NtpResponder()
+    monkeypatch.setattr(network_tests, "NTP_PORT", replacement.port)
+    try:
+        assert engine.query([SERVER], timeout=2)[SERVER]["up"] is True
+    finally:
+        replacement.close()
+
+
+def test_broken_socket_stops_the_receiver(engine):
+    engine._socket.close()
+
+    engine._receiver.join(2)
+    assert not engine._receiver.is_alive()
+
+
+@pytest.fixture
+def slow_resolver(monkeypatch):
+    """Host names that each take 100 ms to resolve, to 127.0.0.1"""
+    lookups = []
+
+    def getaddrinfo(host, *args, **kwargs):
+        lookups.append(host)
+        time.sleep(0.1)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (SERVER, 0))]
+
+    get_host_cache().clear()
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    yield lookups
+    get_host_cache().clear()
+    close_ntp_engine()
+
+
+NAMES = "ntp-1.test, ntp-2.test, ntp-3.test, ntp-4.test"
+
+
+def test_resolution_is_left_out_of_latency(responder, slow_resolver):
+    results, latency = timed(check_ntp_servers, NAMES, 2)
+
+    assert len(slow_resolver) == 4
+    assert all(result["up"] for result in results.values())
+    assert 0 <= latency < 100
+
+
+def test_concurrent_resolution_is_left_out_of_latency_once(responder, slow_resolver):
+    results, latency = asyncio.run(timed_async(async_check_ntp_servers, NAMES, 2))
+
+    # The four lookups overlap, so only their shared wall time may be taken off
+    assert len(slow_resolver) == 4
+    assert all(result["up"] for result in results.values())
+    assert 0 <= latency < 100
@@ -0,0 +1,144 @@
+import copy
+import socket
+import threading
+import time
+
+import pytest
+
+import manager
+import monitor
+from protocol import FrameType
+
+# Seconds between runs of the test's check
+INTERVAL = 2
+
+
+def free_port() -> int:
+    """A TCP port on localhost nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_listener(port: int, timeout: float = 5) -> None:
+    """Block until something accepts connections on a localhost port"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@pytest.fixture
+def target():
+    """A localhost TCP port for the check to connect to"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        yield sock.getsockname()[1]
+
+
+@pytest.fixture
+def handshake_times(monkeypatch):
+    """Monotonic times the manager sent READY and received its first RESULT, recorded as they happen"""
+    times = {}
+    first_result = threading.Event()
+    send_command = manager.ControlClient.send_command
+    handle_result = manager.ControlClient.handle_result
+
+    def record_send_command(self, command, payload=None):
+        if command == FrameType.READY:
+            times.setdefault("ready", time.monotonic())
+        return send_command(self, command, payload)
+
+    def record_handle_result(self, payload):
+        times.setdefault("result", time.monotonic())
+        first_result.set()
+        return handle_result(self, payload)
+
+    monkeypatch.setattr(manager.ControlClient, "send_command", record_send_command)
+    monkeypatch.setattr(manager.ControlClient, "handle_result", record_handle_result)
+    return times, first_result
+
+
+@pytest.fixture
+def start_monitor(tmp_path, monkeypatch):
+    """Start a monitor with a given check engine on a free localhost port, stopping it after the test"""
+    # The monitor keeps its write-ahead log and backlog under the working directory
+    monkeypatch.chdir(tmp_path)
+    services = []
+
+    def start(engine: str = "threaded", tasks: dict | None = None):
+        port = free_port()
+        service = monitor.Monitor("127.0.0.1", port, engine)
+        services.append(service)
+        if tasks:
+            # As configured by an earlier manager session
+            service.configure_tasks(copy.deepcopy(tasks))
+            service.start_tasks()
+        threading.Thread(target=service.start, daemon=True).start()
+        wait_for_listener(port)
+        return service, port
+
+    yield start
+    for service in services:
+        service.stop_tasks()
+        service._scheduler.stop()
+        if service._check_loop:
+            service._check_loop.stop()
+        service._delivery.close()
+        service._socket.close()
+
+
+def tcp_task(port: int, frequency: int = INTERVAL) -> dict:
+    """Config of a TCP check of a localhost port"""
+    return {"type": "TCP", "server": "127.0.0.1", "port": port, "frequency": frequency}
+
+
+@pytest.mark.parametrize("engine", ["threaded", "asyncio"])
+def test_first_result_within_one_interval_of_ready(
+    engine, target, handshake_times, start_monitor
+):
+    times, first_result = handshake_times
+    _, port = start_monitor(engine)
+
+    fleet = manager.ClientFleet()
+    try:
+        fleet.add("monitor", "127.0.0.1", port, {"tcp-test": tcp_task(target)})
+        assert first_result.wait(10), "no RESULT frame arrived"
+    finally:
+        fleet.stop()
+
+    assert "ready" in times
+    assert 0 <= times["result"] - times["ready"] <= INTERVAL
+
+
+def test_reconnecting_manager_updates_running_tasks(target, start_monitor):
+    # The monitor already runs tasks when this manager first connects, e.g. after a manager restart
+    service, port = start_monitor(
+        tasks={"tcp-kept": tcp_task(target), "tcp-changed": tcp_task(target)}
+    )
+
+    fleet = manager.ClientFleet()
+    try:
+        fleet.add(
+            "monitor",
+            "127.0.0.1",
+            port,
+            {"tcp-kept": tcp_task(target), "tcp-changed": tcp_task(target, 30)},
+        )
+
+        # The manager diffs its config against the tasks the monitor reports and sends just the change
+        client = fleet._clients["monitor"]
+        expected = {"tcp-kept": tcp_task(target), "tcp-changed": tcp_task(target, 30)}
+        deadline = time.monotonic() + 10
+        while client._applied != expected:
+            assert time.monotonic() < deadline, "the running task was never updated"
+            time.sleep(0.05)
+        assert service.running_config() == expected
+    finally:
+        fleet.stop()
@@ -0,0 +1,242 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+# Header in front of each logged result: sequence number, when it was logged (epoch seconds),
+# payload length and CRC32 of the payload
+WAL_RECORD = struct.Struct("!QdII")
+
+# File in the log directory holding the highest sequence number the manager has acknowledged
+CURSOR_FILE = "cursor"
+
+
+class WalSegment:
+    """Index entry for one append-only log segment file"""
+
+    __slots__ = ("path", "first_seq", "last_seq", "size", "records", "last_timestamp")
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.first_seq: int = 0
+        self.last_seq: int = 0
+        self.size: int = 0
+        self.records: int = 0
+        self.last_timestamp: float = 0.0
+
+
+class WriteAheadLog:
+    """
+    Durable, sequence-numbered log of every result a monitor produces, kept until the manager acknowledges it.
+
+    Each result is appended to the active segment file under the next sequence number before it is sent, and the
+    file is fsynced at most every sync_interval seconds. The manager acknowledges results by cursor (the highest
+    sequence number it has processed); the cursor is persisted and segments wholly at or below it are deleted.
+    On startup the log recovers its segments, discarding any torn record at the tail, so results that were never
+    acknowledged survive a monitor restart and can be replayed from the cursor. To stay bounded while the manager
+    is away, whole segments are dropped oldest first once the log exceeds max_bytes or, if max_age is set, once
+    their newest record is older than max_age seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 4 * 1024 * 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        sync_interval: float = 1.0,
+    ):
+        self._directory: str = directory
+        self._segment_size: int = segment_size
+        self._max_bytes: int = max_bytes
+        self._max_age: Optional[float] = max_age
+        self._sync_interval: float = sync_interval
+
+        # Segment index, oldest first; the last segment is the one appended to
+        self._segments: List[WalSegment] = []
+        self._fd: Optional[int] = None
+        self._last_sync: float = 0.0
+
+        # Sequence numbers
+        self._cursor: int = 0
+        self._next_seq: int = 1
+
+        # Counters
+        self.dropped: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    @property
+    def cursor(self) -> int:
+        """Highest sequence number acknowledged by the manager"""
+        return self._cursor
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended result will get"""
+        return self._next_seq
+
+    def append(self, data: bytes) -> int:
+        """Log a result and return its sequence number"""
+        with self._lock:
+            seq: int = self._next_seq
+            self._next_seq += 1
+            now: float = time.time()
+            record: bytes = (
+                WAL_RECORD.pack(seq, now, len(data), zlib.crc32(data)) + data
+            )
+
+            # Roll over to a new segment once the active one is full
+            segment = self._segments[-1] if self._segments else None
+            if segment is None or (
+                segment.records and segment.size + len(record) > self._segment_size
+            ):
+                segment = self._open_segment(seq)
+
+            os.write(self._fd, record)
+            if not segment.records:
+                segment.first_seq = seq
+            segment.last_seq = seq
+            segment.size += len(record)
+            segment.records += 1
+            segment.last_timestamp = now
+
+            # Group commit: fsync at most once per sync interval
+            if now - self._last_sync >= self._sync_interval:
+                os.fsync(self._fd)
+                self._last_sync = now
+
+            self._enforce_retention(now)
+            return seq
+
+    def ack(self, cursor: int) -> None:
+        """Record that the manager has processed every result up to cursor and delete what is no longer needed"""
+        with self._lock:
+            if cursor <= self._cursor:
+                return
+            self._cursor = min(cursor, self._next_seq - 1)
+
+            # Persist the cursor atomically
+            path: str = os.path.join(self._directory, CURSOR_FILE)
+            with open(f"{path}.tmp", "w") as file:
+                file.write(str(self._cursor))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(f"{path}.tmp", path)
+
+            # Delete segments that are wholly acknowledged, except the active one
+            while (
+                len(self._segments) > 1 and self._segments[0].last_seq <= self._cursor
+            ):
+                os.remove(self._segments.pop(0).path)
+
+    def replay(
+        self, after: int, before: Optional[int] = None
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Yield (sequence number, result) for every logged result with after < seq < before, in order"""
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+            segments = [
+                segment
+                for segment in self._segments
+                if segment.records
+                and segment.last_seq > after
+                and (before is None or segment.first_seq < before)
+            ]
+
+        for segment in segments:
+            for seq, _, data in self._read_segment(segment.path):
+                if before is not None and seq >= before:
+                    return
+                if seq > after:
+                    yield seq, data
+
+    def close(self) -> None:
+        """Flush and close the active segment"""
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    def _open_segment(self, first_seq: int) -> WalSegment:
+        """Close the active segment and start a new one named after its first sequence number"""
+        if self._fd is not None:
+            os.fsync(self._fd)
+            os.close(self._fd)
+        segment = WalSegment(os.path.join(self._directory, f"{first_seq:020d}.wal"))
+        self._fd = os.open(segment.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._segments.append(segment)
+        return segment
+
+    def _enforce_retention(self, now: float) -> None:
+        """Drop whole segments, oldest first, until the log is within its size and age limits"""
+        while len(self._segments) > 1 and (
+            sum(segment.size for segment in self._segments) > self._max_bytes
+            or (
+                self._max_age is not None
+                and self._segments[0].last_timestamp < now - self._max_age
+            )
+        ):
+            segment = self._segments.pop(0)
+            os.remove(segment.path)
+            self.dropped += segment.records
+
+    def _read_segment(self, path: str) -> Iterator[Tuple[int, float, bytes]]:
+        """Yield (sequence number, timestamp, result) for each intact record of a segment file"""
+        try:
+            with open(path, "rb") as file:
+                data: bytes = file.read()
+        except FileNotFoundError:
+            # Dropped by retention or acknowledged since it was listed
+            return
+        offset: int = 0
+        while offset + WAL_RECORD.size <= len(data):
+            seq, timestamp, length, crc = WAL_RECORD.unpack_from(data, offset)
+            start: int = offset + WAL_RECORD.size
+            payload: bytes = data[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                # Torn or corrupt tail left by a crash
+                return
+            yield seq, timestamp, payload
+            offset = start + length
+
+    def _recover(self) -> None:
+        """Rebuild the segment index, cursor and next sequence number from the log directory"""
+        cursor_path: str = os.path.join(self._directory, CURSOR_FILE)
+        if os.path.exists(cursor_path):
+            with open(cursor_path) as file:
+                self._cursor = int(file.read().strip() or 0)
+        self._next_seq = self._cursor + 1
+
+        for name in sorted(os.listdir(self._directory)):
+            if not name.endswith(".wal"):
+                continue
+            segment = WalSegment(os.path.join(self._directory, name))
+            for seq, timestamp, data in self._read_segment(segment.path):
+                if not segment.records:
+                    segment.first_seq = seq
+                segment.last_seq = seq
+                segment.size += WAL_RECORD.size + len(data)
+                segment.records += 1
+                segment.last_timestamp = timestamp
+
+            # Cut off a torn tail so new records append after the last intact one
+            with open(segment.path, "r+b") as file:
+                file.truncate(segment.size)
+
+            if segment.records and segment.last_seq > self._cursor:
+                self._segments.append(segment)
+                self._next_seq = max(self._next_seq, segment.last_seq + 1)
+            else:
+                os.remove(segment.path)
+
+        # Keep appending to the newest recovered segment
+        if self._segments:
+            self._fd = os.open(self._segments[-1].path, os.O_WRONLY | os.O_APPEND)